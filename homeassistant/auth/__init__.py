@@ -3,12 +3,17 @@ import asyncio
 from collections import OrderedDict
 from datetime import timedelta
 import logging
+import time
 from typing import Any, Dict, List, Optional, Tuple, cast
 
 import jwt
 
 from homeassistant import data_entry_flow
-from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
+from homeassistant.auth.const import (
+    ACCESS_TOKEN_CACHE_SIZE,
+    ACCESS_TOKEN_CACHE_TTL,
+    ACCESS_TOKEN_EXPIRATION,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.util import dt as dt_util
 
@@ -146,6 +151,10 @@ class AuthManager:
         self._providers = providers
         self._mfa_modules = mfa_modules
         self.login_flow = AuthManagerFlowManager(hass, self)
+        # Validated access tokens with their refresh token and expiry
+        self._access_token_cache: "OrderedDict[str, Tuple[models.RefreshToken, float]]" = (
+            OrderedDict()
+        )
 
     @property
     def auth_providers(self) -> List[AuthProvider]:
@@ -279,6 +288,7 @@ class AuthManager:
             await asyncio.wait(tasks)
 
         await self._store.async_remove_user(user)
+        self._async_forget_access_tokens(user.id)
 
         self.hass.bus.async_fire(EVENT_USER_REMOVED, {"user_id": user.id})
 
@@ -305,6 +315,7 @@ class AuthManager:
         if user.is_owner:
             raise ValueError("Unable to deactivate the owner")
         await self._store.async_deactivate_user(user)
+        self._async_forget_access_tokens(user.id)
 
     async def async_remove_credentials(self, credentials: models.Credentials) -> None:
         """Remove credentials."""
@@ -429,6 +440,7 @@ class AuthManager:
     ) -> None:
         """Delete a refresh token."""
         await self._store.async_remove_refresh_token(refresh_token)
+        self._async_forget_access_tokens(refresh_token.user.id, refresh_token.id)
 
     @callback
     def async_create_access_token(
@@ -452,6 +464,19 @@ class AuthManager:
         self, token: str
     ) -> Optional[models.RefreshToken]:
         """Return refresh token if an access token is valid."""
+        cached = self._access_token_cache.get(token)
+        if cached is not None:
+            refresh_token, valid_until = cached
+            if (
+                time.time() < valid_until
+                and refresh_token.user.is_active
+                and await self.async_get_refresh_token(refresh_token.id)
+                is refresh_token
+            ):
+                self._access_token_cache.move_to_end(token)
+                return refresh_token
+            self._access_token_cache.pop(token, None)
+
         try:
             unverif_claims = jwt.decode(token, verify=False)
         except jwt.InvalidTokenError:
@@ -469,15 +494,39 @@ class AuthManager:
             issuer = refresh_token.id
 
         try:
-            jwt.decode(token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"])
+            claims = jwt.decode(
+                token, jwt_key, leeway=10, issuer=issuer, algorithms=["HS256"]
+            )
         except jwt.InvalidTokenError:
             return None
 
         if refresh_token is None or not refresh_token.user.is_active:
             return None
 
+        self._access_token_cache[token] = (
+            refresh_token,
+            min(
+                time.time() + ACCESS_TOKEN_CACHE_TTL.total_seconds(),
+                claims.get("exp", 0),
+            ),
+        )
+        if len(self._access_token_cache) > ACCESS_TOKEN_CACHE_SIZE:
+            self._access_token_cache.popitem(last=False)
+
         return refresh_token
 
+    @callback
+    def _async_forget_access_tokens(
+        self, user_id: str, refresh_token_id: Optional[str] = None
+    ) -> None:
+        """Drop the validated access tokens of a user or of one refresh token."""
+        for token, (refresh_token, _) in list(self._access_token_cache.items()):
+            if refresh_token.user.id == user_id and refresh_token_id in (
+                None,
+                refresh_token.id,
+            ):
+                del self._access_token_cache[token]
+
     @callback
     def _async_get_auth_provider(
         self, credentials: models.Credentials
@@ -2,6 +2,9 @@
 from datetime import timedelta
 
 ACCESS_TOKEN_EXPIRATION = timedelta(minutes=30)
+# Validated access tokens are trusted without decoding them again for a while
+ACCESS_TOKEN_CACHE_TTL = timedelta(minutes=1)
+ACCESS_TOKEN_CACHE_SIZE = 256
 MFA_SESSION_EXPIRATION = timedelta(minutes=5)
 
 GROUP_ID_ADMIN = "system-admin"
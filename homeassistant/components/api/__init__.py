@@ -12,6 +12,7 @@ from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.bootstrap import DATA_LOGGING
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
+    CONTENT_TYPE_JSON,
     EVENT_HOMEASSISTANT_STOP,
     EVENT_TIME_CHANGED,
     HTTP_BAD_REQUEST,
@@ -229,7 +230,12 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            body = f"[{', '.join(state.as_json() for state in states)}]"
+        except (ValueError, TypeError):
+            # Let the view log the bad data
+            return self.json(states)
+        return _json_response(body)
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -246,9 +252,14 @@ class APIEntityStateView(HomeAssistantView):
             raise Unauthorized(entity_id=entity_id)
 
         state = request.app["hass"].states.get(entity_id)
-        if state:
+        if not state:
+            return self.json_message("Entity not found.", HTTP_NOT_FOUND)
+        try:
+            body = state.as_json()
+        except (ValueError, TypeError):
+            # Let the view log the bad data
             return self.json(state)
-        return self.json_message("Entity not found.", HTTP_NOT_FOUND)
+        return _json_response(body)
 
     async def post(self, request, entity_id):
         """Update state of entity."""
@@ -443,3 +454,13 @@ def async_events_json(hass):
         {"event": key, "listener_count": value}
         for key, value in hass.bus.async_listeners().items()
     ]
+
+
+def _json_response(body: str) -> web.Response:
+    """Return a response of json that is already serialized.
+
+    The json of the states is cached on the states.
+    """
+    response = web.Response(body=body.encode("UTF-8"), content_type=CONTENT_TYPE_JSON)
+    response.enable_compression()
+    return response
@@ -34,6 +34,8 @@ from homeassistant.helpers import condition, extract_domain_configs, template
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.reference_index import async_get_reference_index
+from homeassistant.helpers.reload import async_reload_changed_entities
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.script import (
     ATTR_CUR,
@@ -127,16 +129,7 @@ def is_on(hass, entity_id):
 @callback
 def automations_with_entity(hass: HomeAssistant, entity_id: str) -> List[str]:
     """Return all automations that reference the entity."""
-    if DOMAIN not in hass.data:
-        return []
-
-    component = hass.data[DOMAIN]
-
-    return [
-        automation_entity.entity_id
-        for automation_entity in component.entities
-        if entity_id in automation_entity.referenced_entities
-    ]
+    return async_get_reference_index(hass, DOMAIN).async_referencing_entity(entity_id)
 
 
 @callback
@@ -158,16 +151,7 @@ def entities_in_automation(hass: HomeAssistant, entity_id: str) -> List[str]:
 @callback
 def automations_with_device(hass: HomeAssistant, device_id: str) -> List[str]:
     """Return all automations that reference the device."""
-    if DOMAIN not in hass.data:
-        return []
-
-    component = hass.data[DOMAIN]
-
-    return [
-        automation_entity.entity_id
-        for automation_entity in component.entities
-        if device_id in automation_entity.referenced_devices
-    ]
+    return async_get_reference_index(hass, DOMAIN).async_referencing_device(device_id)
 
 
 @callback
@@ -217,8 +201,8 @@ async def async_setup(hass, config):
     )
 
     async def reload_service_handler(service_call):
-        """Remove all automations and load new ones from config."""
-        conf = await component.async_prepare_reload()
+        """Reload the automations whose config changed."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         await _async_process_config(hass, conf, component)
@@ -334,6 +318,10 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         """Startup with initial state or previous state."""
         await super().async_added_to_hass()
 
+        async_get_reference_index(self.hass, DOMAIN).async_add(
+            self.entity_id, self.referenced_entities, self.referenced_devices
+        )
+
         self._logger = logging.getLogger(
             f"{__name__}.{split_entity_id(self.entity_id)[1]}"
         )
@@ -432,6 +420,7 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
     async def async_will_remove_from_hass(self):
         """Remove listeners when removing automation from Home Assistant."""
         await super().async_will_remove_from_hass()
+        async_get_reference_index(self.hass, DOMAIN).async_remove(self.entity_id)
         await self.async_disable()
 
     async def async_enable(self):
@@ -509,56 +498,61 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
 async def _async_process_config(hass, config, component):
     """Process config and add automations.
 
+    The automations whose config did not change since the last time are kept.
+
     This method is a coroutine.
     """
-    entities = []
+    automation_configs = []
 
     for config_key in extract_domain_configs(config, DOMAIN):
         conf = config[config_key]
 
         for list_no, config_block in enumerate(conf):
-            automation_id = config_block.get(CONF_ID)
             name = config_block.get(CONF_ALIAS) or f"{config_key} {list_no}"
+            automation_configs.append((name, config_block))
+
+    async def async_create_automation(automation_config):
+        """Create an automation entity from its config."""
+        name, config_block = automation_config
+        automation_id = config_block.get(CONF_ID)
+        initial_state = config_block.get(CONF_INITIAL_STATE)
+
+        action_script = Script(
+            hass,
+            config_block[CONF_ACTION],
+            name,
+            DOMAIN,
+            running_description="automation actions",
+            script_mode=config_block[CONF_MODE],
+            max_runs=config_block[CONF_MAX],
+            max_exceeded=config_block[CONF_MAX_EXCEEDED],
+            logger=_LOGGER,
+            # We don't pass variables here
+            # Automation will already render them to use them in the condition
+            # and so will pass them on to the script.
+        )
 
-            initial_state = config_block.get(CONF_INITIAL_STATE)
-
-            action_script = Script(
-                hass,
-                config_block[CONF_ACTION],
-                name,
-                DOMAIN,
-                running_description="automation actions",
-                script_mode=config_block[CONF_MODE],
-                max_runs=config_block[CONF_MAX],
-                max_exceeded=config_block[CONF_MAX_EXCEEDED],
-                logger=_LOGGER,
-                # We don't pass variables here
-                # Automation will already render them to use them in the condition
-                # and so will pass them on to the script.
-            )
-
-            if CONF_CONDITION in config_block:
-                cond_func = await _async_process_if(hass, config, config_block)
-
-                if cond_func is None:
-                    continue
-            else:
-                cond_func = None
-
-            entity = AutomationEntity(
-                automation_id,
-                name,
-                config_block[CONF_TRIGGER],
-                cond_func,
-                action_script,
-                initial_state,
-                config_block.get(CONF_VARIABLES),
-            )
+        if CONF_CONDITION in config_block:
+            cond_func = await _async_process_if(hass, config, config_block)
 
-            entities.append(entity)
+            if cond_func is None:
+                return None
+        else:
+            cond_func = None
+
+        return AutomationEntity(
+            automation_id,
+            name,
+            config_block[CONF_TRIGGER],
+            cond_func,
+            action_script,
+            initial_state,
+            config_block.get(CONF_VARIABLES),
+        )
 
-    if entities:
-        await component.async_add_entities(entities)
+    await async_reload_changed_entities(
+        component, automation_configs, async_create_automation
+    )
 
 
 async def _async_process_if(hass, config, p_config):
@@ -2,12 +2,14 @@
 import asyncio
 import base64
 import collections
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from datetime import timedelta
 import hashlib
 import logging
 import os
 from random import SystemRandom
+import time
+from typing import Dict
 
 from aiohttp import web
 import async_timeout
@@ -126,6 +128,96 @@ class Image:
     content: bytes = attr.ib()
 
 
+class CameraFrameBroadcaster:
+    """Fetch the frames of a camera once for all of its viewers.
+
+    The still streams of a camera share a single fetch loop, which runs at the
+    shortest interval requested and hands every stream the latest frame. While
+    it runs, the other requests are served that frame until it is stale.
+    Concurrent requests always share the fetch in progress.
+    """
+
+    def __init__(self, camera: "Camera") -> None:
+        """Initialize the broadcaster."""
+        self._camera = camera
+        self._frame = None
+        self._frame_time = 0.0
+        self._fetch = None
+        self._pump = None
+        self._subscribers: Dict[asyncio.Queue, float] = {}
+
+    async def async_get_frame(self):
+        """Return the latest frame, fetching a new one when it is stale."""
+        if (
+            self._frame is not None
+            and self._subscribers
+            and time.monotonic() - self._frame_time < self._interval
+        ):
+            return self._frame
+
+        if self._fetch is None:
+            self._fetch = self._camera.hass.async_create_task(self._async_fetch())
+        # A viewer that gives up does not cancel the fetch of the others
+        return await asyncio.shield(self._fetch)
+
+    @contextmanager
+    def subscribe(self, interval: float):
+        """Subscribe to the frames, yield the coroutine returning the next one.
+
+        Only the latest frame is kept for a viewer, frames that a slow viewer
+        did not take in time are dropped. A falsy frame ends the stream.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers[queue] = interval
+        if self._pump is None:
+            self._pump = self._camera.hass.loop.create_task(self._async_pump())
+        try:
+            yield queue.get
+        finally:
+            del self._subscribers[queue]
+            if not self._subscribers and self._pump is not None:
+                self._pump.cancel()
+                self._pump = None
+
+    @property
+    def _interval(self) -> float:
+        """Return the shortest interval of the subscribers."""
+        return min(self._subscribers.values())
+
+    async def _async_fetch(self):
+        """Fetch a frame from the camera."""
+        try:
+            frame = await self._camera.async_camera_image()
+        finally:
+            self._fetch = None
+        if frame:
+            self._frame = frame
+            self._frame_time = time.monotonic()
+        return frame
+
+    async def _async_pump(self):
+        """Fetch the frames and hand them to the subscribers."""
+        while True:
+            try:
+                frame = await self.async_get_frame()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error fetching a frame of %s", self._camera.entity_id
+                )
+                frame = None
+
+            for queue in self._subscribers:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(frame)
+
+            if not frame:
+                self._pump = None
+                return
+
+            await asyncio.sleep(self._interval)
+
+
 @bind_hass
 async def async_request_stream(hass, entity_id, fmt):
     """Request a stream for a camera entity."""
@@ -156,7 +248,7 @@ async def async_get_image(hass, entity_id, timeout=10):
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         async with async_timeout.timeout(timeout):
-            image = await camera.async_camera_image()
+            image = await camera.frame_broadcaster.async_get_frame()
 
             if image:
                 return Image(camera.content_type, image)
@@ -333,6 +425,7 @@ class Camera(Entity):
         self.stream_options = {}
         self.content_type = DEFAULT_CONTENT_TYPE
         self.access_tokens: collections.deque = collections.deque([], 2)
+        self.frame_broadcaster = CameraFrameBroadcaster(self)
         self.async_update_token()
 
     @property
@@ -389,9 +482,10 @@ class Camera(Entity):
 
     async def handle_async_still_stream(self, request, interval):
         """Generate an HTTP MJPEG stream from camera images."""
-        return await async_get_still_stream(
-            request, self.async_camera_image, self.content_type, interval
-        )
+        with self.frame_broadcaster.subscribe(interval) as next_frame:
+            return await async_get_still_stream(
+                request, next_frame, self.content_type, interval
+            )
 
     async def handle_async_mjpeg_stream(self, request):
         """Serve an HTTP MJPEG stream from the camera.
@@ -516,7 +610,7 @@ class CameraImageView(CameraView):
         """Serve camera image."""
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             async with async_timeout.timeout(10):
-                image = await camera.async_camera_image()
+                image = await camera.frame_broadcaster.async_get_frame()
 
             if image:
                 return web.Response(body=image, content_type=camera.content_type)
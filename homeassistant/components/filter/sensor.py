@@ -11,6 +11,7 @@ from typing import Optional
 import voluptuous as vol
 
 from homeassistant.components import history
+from homeassistant.components.history.recent import async_get_recent_history
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
     ATTR_ENTITY_ID,
@@ -243,36 +244,55 @@ class SensorFilter(Entity):
                 ):
                     largest_window_time = filt.window_size
 
-            # Retrieve the largest window_size of each type
-            if largest_window_items > 0:
-                filter_history = await self.hass.async_add_job(
-                    partial(
-                        history.get_last_state_changes,
-                        self.hass,
-                        largest_window_items,
-                        entity_id=self._entity,
-                    )
+            # Read the largest windows from the recent history, seeded
+            # once for all the sensors of the entity
+            recent = async_get_recent_history(self.hass)
+            untrack = None
+            if largest_window_items > 0 or largest_window_time > timedelta(seconds=0):
+                untrack = await recent.async_track(
+                    self._entity,
+                    max_age=largest_window_time or None,
+                    max_items=largest_window_items or None,
                 )
-                if self._entity in filter_history:
-                    history_list.extend(filter_history[self._entity])
-            if largest_window_time > timedelta(seconds=0):
-                start = dt_util.utcnow() - largest_window_time
-                filter_history = await self.hass.async_add_job(
-                    partial(
-                        history.state_changes_during_period,
-                        self.hass,
-                        start,
-                        entity_id=self._entity,
+
+            try:
+                # Retrieve the largest window_size of each type
+                if largest_window_items > 0:
+                    states = recent.async_get_last_states(
+                        self._entity, largest_window_items, changes_only=True
                     )
-                )
-                if self._entity in filter_history:
+                    if states is None:
+                        filter_history = await self.hass.async_add_job(
+                            partial(
+                                history.get_last_state_changes,
+                                self.hass,
+                                largest_window_items,
+                                entity_id=self._entity,
+                            )
+                        )
+                        states = filter_history.get(self._entity, [])
+                    history_list.extend(states)
+                if largest_window_time > timedelta(seconds=0):
+                    start = dt_util.utcnow() - largest_window_time
+                    states = recent.async_state_changes_during_period(
+                        self._entity, start
+                    )
+                    if states is None:
+                        filter_history = await self.hass.async_add_job(
+                            partial(
+                                history.state_changes_during_period,
+                                self.hass,
+                                start,
+                                entity_id=self._entity,
+                            )
+                        )
+                        states = filter_history.get(self._entity, [])
                     history_list.extend(
-                        [
-                            state
-                            for state in filter_history[self._entity]
-                            if state not in history_list
-                        ]
+                        [state for state in states if state not in history_list]
                     )
+            finally:
+                if untrack is not None:
+                    untrack()
 
             # Sort the window states
             history_list = sorted(history_list, key=lambda s: s.last_updated)
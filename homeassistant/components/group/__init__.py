@@ -436,6 +436,8 @@ class Group(Entity):
         self._set_tracked(entity_ids)
         self._on_off = None
         self._assumed = None
+        self._num_on = 0
+        self._num_assumed = 0
         self._on_states = None
         self.user_defined = user_defined
         self.mode = any
@@ -669,6 +671,8 @@ class Group(Entity):
         """Reset tracked state."""
         self._on_off = {}
         self._assumed = {}
+        self._num_on = 0
+        self._num_assumed = 0
         self._on_states = set()
 
         for entity_id in self.trackable:
@@ -683,7 +687,9 @@ class Group(Entity):
         domain = new_state.domain
         state = new_state.state
         registry = self.hass.data[REG_KEY]
-        self._assumed[entity_id] = new_state.attributes.get(ATTR_ASSUMED_STATE)
+        assumed = bool(new_state.attributes.get(ATTR_ASSUMED_STATE))
+        self._num_assumed += assumed - self._assumed.get(entity_id, False)
+        self._assumed[entity_id] = assumed
 
         if domain not in registry.on_states_by_domain:
             # Handle the group of a group case
@@ -691,12 +697,23 @@ class Group(Entity):
                 self._on_states.add(state)
             elif state in registry.off_on_mapping:
                 self._on_states.add(registry.off_on_mapping[state])
-            self._on_off[entity_id] = state in registry.on_off_mapping
+            is_on = state in registry.on_off_mapping
         else:
             entity_on_state = registry.on_states_by_domain[domain]
             if domain in self.hass.data[REG_KEY].on_states_by_domain:
                 self._on_states.update(entity_on_state)
-            self._on_off[entity_id] = state in entity_on_state
+            is_on = state in entity_on_state
+
+        # Keep count of the members that are on, so the group state
+        # is updated without going over all the members
+        self._num_on += is_on - self._on_off.get(entity_id, False)
+        self._on_off[entity_id] = is_on
+
+    def _mode_of(self, num_true, num_members):
+        """Apply the mode of the group to the members counted as true."""
+        if self.mode is all:
+            return num_true == num_members
+        return num_true > 0
 
     @callback
     def _async_update_group_state(self, tr_state=None):
@@ -719,7 +736,7 @@ class Group(Entity):
             or self._assumed_state
             and not tr_state.attributes.get(ATTR_ASSUMED_STATE)
         ):
-            self._assumed_state = self.mode(self._assumed.values())
+            self._assumed_state = self._mode_of(self._num_assumed, len(self._assumed))
 
         elif tr_state.attributes.get(ATTR_ASSUMED_STATE):
             self._assumed_state = True
@@ -739,7 +756,7 @@ class Group(Entity):
         # on state, we use STATE_ON/STATE_OFF
         else:
             on_state = STATE_ON
-        group_is_on = self.mode(self._on_off.values())
+        group_is_on = self._mode_of(self._num_on, len(self._on_off))
         if group_is_on:
             self._state = on_state
         else:
@@ -1,20 +1,29 @@
 """Provide pre-made queries on top of the recorder component."""
+import asyncio
 from collections import defaultdict
 from datetime import timedelta
-from itertools import groupby
+from functools import partial
+from itertools import chain, groupby
 import json
 import logging
+import math
+import threading
 import time
 from typing import Optional, cast
 
 from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
 from sqlalchemy import and_, bindparam, func, not_, or_
 from sqlalchemy.ext import baked
 import voluptuous as vol
 
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.recorder import statistics
 from homeassistant.components.recorder.models import (
+    STATE_ATTRIBUTES,
+    STATE_ATTRIBUTES_JOIN,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -25,6 +34,7 @@ from homeassistant.const import (
     CONF_ENTITIES,
     CONF_EXCLUDE,
     CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
     HTTP_BAD_REQUEST,
 )
 from homeassistant.core import Context, State, split_entity_id
@@ -33,6 +43,7 @@ from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
 )
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -45,6 +56,15 @@ CONF_ORDER = "use_include_order"
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
 
+# States read from the database at a time and serialized
+# per chunk when the history of all entities is streamed
+STREAM_CHUNK_STATES = 1000
+# Chunks waiting to be written before the database reads pause
+STREAM_QUEUE_SIZE = 8
+
+# Stay below the default limit of bound variables of SQLite
+MAX_STATE_IDS_PER_QUERY = 998
+
 GLOB_TO_SQL_CHARS = {
     42: "%",  # *
     46: "_",  # .
@@ -78,7 +98,7 @@ QUERY_STATES = [
     States.domain,
     States.entity_id,
     States.state,
-    States.attributes,
+    STATE_ATTRIBUTES.label("attributes"),
     States.last_changed,
     States.last_updated,
 ]
@@ -86,6 +106,20 @@ QUERY_STATES = [
 HISTORY_BAKERY = "history_bakery"
 
 
+def _query_states(session):
+    """Query the states with their attributes joined in."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, STATE_ATTRIBUTES_JOIN
+    )
+
+
+def _query_state_points(session):
+    """Query the values of the states without their attributes."""
+    return session.query(
+        States.state_id, States.entity_id, States.state, States.last_updated
+    )
+
+
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
     with session_scope(hass=hass) as session:
@@ -102,6 +136,7 @@ def _get_significant_states(
     include_start_time_state=True,
     significant_changes_only=True,
     minimal_response=False,
+    max_points=None,
 ):
     """
     Return states changes during UTC period start_time - end_time.
@@ -109,13 +144,65 @@ def _get_significant_states(
     Significant states are all states where there is a state change,
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
+
+    With max_points the states of each entity are downsampled to
+    at most max_points states.
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    if max_points:
+        states = _downsampled_states(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            significant_changes_only,
+            max_points,
+        )
+    else:
+        states = execute(
+            _significant_states_query(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                filters,
+                significant_changes_only,
+            )
+        )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
     )
 
+
+def _significant_states_query(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+    query=_query_states,
+):
+    """Return the query of the significant states ordered by entity_id."""
+    baked_query = hass.data[HISTORY_BAKERY](query)
+
     if significant_changes_only:
         baked_query += lambda q: q.filter(
             (
@@ -141,34 +228,122 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
+    return baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
     )
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
 
-    return _sorted_states_to_json(
+def _downsampled_states(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+    max_points,
+):
+    """Return the significant states downsampled to max_points per entity.
+
+    The period is split in buckets of equal duration. Only the values of
+    the states are read to pick the states to keep in each bucket, then
+    the picked states are read with their attributes.
+    """
+    if end_time is None:
+        end_time = dt_util.utcnow()
+    # Each bucket keeps up to two states, a single point keeps the last one
+    keep_extremes = max_points >= 2
+    buckets = max_points // 2 if keep_extremes else 1
+    bucket_duration = max((end_time - start_time) / buckets, timedelta(microseconds=1))
+
+    points = _significant_states_query(
         hass,
         session,
-        states,
         start_time,
+        end_time,
         entity_ids,
         filters,
-        include_start_time_state,
-        minimal_response,
+        significant_changes_only,
+        _query_state_points,
+    ).with_post_criteria(lambda q: q.yield_per(STREAM_CHUNK_STATES))
+
+    state_ids = []
+    for _, group in groupby(points, lambda point: point.entity_id):
+        state_ids.extend(
+            _bucket_state_ids(group, start_time, bucket_duration, keep_extremes)
+        )
+
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
+    baked_query += lambda q: q.filter(
+        States.state_id.in_(bindparam("state_ids", expanding=True))
     )
+    baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
+
+    # The state ids are ordered like the states
+    # so the batches keep the states in order
+    states = []
+    for idx in range(0, len(state_ids), MAX_STATE_IDS_PER_QUERY):
+        states.extend(
+            execute(
+                baked_query(session).params(
+                    state_ids=state_ids[idx : idx + MAX_STATE_IDS_PER_QUERY]
+                )
+            )
+        )
+    return states
+
+
+def _bucket_state_ids(points, start_time, bucket_duration, keep_extremes=True):
+    """Yield the ids of the states to keep from the points of an entity.
+
+    Each bucket keeps the states with the lowest and the highest value,
+    or its last state when none of its states is numeric or when the
+    extremes are not kept.
+    """
+    bucket = lowest = highest = last = None
+    for point in points:
+        point_bucket = (process_timestamp(point.last_updated) - start_time) // (
+            bucket_duration
+        )
+        if point_bucket != bucket:
+            if bucket is not None:
+                yield from _bucket_picks(lowest, highest, last)
+            bucket = point_bucket
+            lowest = highest = None
+
+        last = point
+        if not keep_extremes:
+            continue
+        try:
+            value = float(point.state)
+        except (TypeError, ValueError):
+            continue
+        if not math.isfinite(value):
+            continue
+        if lowest is None or value < lowest[0]:
+            lowest = (value, point)
+        if highest is None or value > highest[0]:
+            highest = (value, point)
+
+    if bucket is not None:
+        yield from _bucket_picks(lowest, highest, last)
+
+
+def _bucket_picks(lowest, highest, last):
+    """Yield the ids of the states picked in a bucket in time order."""
+    if lowest is None:
+        yield last.state_id
+        return
+
+    picks = sorted({lowest[1], highest[1]}, key=lambda point: point.last_updated)
+    for point in picks:
+        yield point.state_id
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -181,7 +356,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -202,13 +379,13 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](_query_states)
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -269,7 +446,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = _query_states(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -317,9 +494,7 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](_query_states)
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -362,65 +537,87 @@ def _sorted_states_to_json(
             result[ent_id] = []
 
     # Get the states at the start time
-    timer_start = time.perf_counter()
     if include_start_time_state:
-        run = recorder.run_information_from_instance(hass, start_time)
-        for state in _get_states_with_session(
-            hass, session, start_time, entity_ids, run=run, filters=filters
+        for state in _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
         ):
-            state.last_changed = start_time
-            state.last_updated = start_time
             result[state.entity_id].append(state)
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
-
-    # Called in a tight loop so cache the function
-    # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
-
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
+        result[ent_id] = list(
+            _entity_states(ent_id, result[ent_id], group, minimal_response)
+        )
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _get_start_time_states(hass, session, start_time, entity_ids, filters):
+    """Return the states at the start time as synthetic first data points."""
+    timer_start = time.perf_counter()
+    run = recorder.run_information_from_instance(hass, start_time)
+    states = _get_states_with_session(
+        hass, session, start_time, entity_ids, run=run, filters=filters
+    )
+    for state in states:
+        state.last_changed = start_time
+        state.last_updated = start_time
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("getting %d first datapoints took %fs", len(states), elapsed)
 
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(LazyState(next(group)))
+    return states
 
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
 
+def _entity_states(ent_id, initial_states, group, minimal_response):
+    """Yield the states of an entity from its first states and its rows."""
+    domain = split_entity_id(ent_id)[0]
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        yield from initial_states
         for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
-
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
-            )
-            prev_state = db_state
+            yield LazyState(db_state)
+        return
+
+    # With minimal response we only provide a native
+    # State for the first and last response. All the states
+    # in-between only provide the "state" and the
+    # "last_changed".
+    if initial_states:
+        yield from initial_states
+        prev_state = initial_states[-1]
+    else:
+        prev_state = LazyState(next(group))
+        yield prev_state
 
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state)
+    # Called in a tight loop so cache the function
+    # here
+    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+    # The last minimal state is held back so it can
+    # be replaced with a full state
+    minimal_state = None
+    for db_state in group:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
+
+        if minimal_state is not None:
+            yield minimal_state
+        minimal_state = {
+            STATE_KEY: db_state.state,
+            LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
+                db_state.last_changed
+            ),
+        }
+        prev_state = db_state
+
+    if minimal_state is not None:
+        # There was at least one state change
+        # so the last state is a full state
+        yield LazyState(prev_state)
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -500,8 +697,31 @@ class HistoryPeriodView(HomeAssistantView):
 
         minimal_response = "minimal_response" in request.query
 
+        max_points = request.query.get("max_points")
+        if max_points is not None:
+            try:
+                max_points = int(max_points)
+            except ValueError:
+                max_points = 0
+            if max_points < 1:
+                return self.json_message("Invalid max_points", HTTP_BAD_REQUEST)
+
         hass = request.app["hass"]
 
+        if entity_ids is None and not (self.filters and self.use_include_order):
+            # Without an order to respect the history of all entities
+            # is streamed while it is read, ordered by entity_id
+            return await self._stream_significant_states_json(
+                request,
+                hass,
+                start_time,
+                end_time,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                max_points,
+            )
+
         return cast(
             web.Response,
             await hass.async_add_executor_job(
@@ -513,6 +733,7 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                max_points,
             ),
         )
 
@@ -525,6 +746,7 @@ class HistoryPeriodView(HomeAssistantView):
         include_start_time_state,
         significant_changes_only,
         minimal_response,
+        max_points,
     ):
         """Fetch significant stats from the database as json."""
         timer_start = time.perf_counter()
@@ -540,8 +762,20 @@ class HistoryPeriodView(HomeAssistantView):
                 include_start_time_state,
                 significant_changes_only,
                 minimal_response,
+                max_points,
+            )
+            stats = _get_statistics_before_oldest_state(
+                session, start_time, end_time, entity_ids, self.filters
             )
 
+        if stats:
+            # Keep the order of the result and add the entities with only statistics
+            result = {
+                entity_id: _statistics_states(hass, entity_id, stats.get(entity_id, ()))
+                + result.get(entity_id, [])
+                for entity_id in {**result, **stats}
+            }
+
         result = list(result.values())
         if _LOGGER.isEnabledFor(logging.DEBUG):
             elapsed = time.perf_counter() - timer_start
@@ -562,6 +796,181 @@ class HistoryPeriodView(HomeAssistantView):
 
         return self.json(result)
 
+    async def _stream_significant_states_json(self, request, hass, *args):
+        """Stream the significant states as json while they are read."""
+        response = web.StreamResponse(headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_compression()
+        await response.prepare(request)
+
+        queue = asyncio.Queue(STREAM_QUEUE_SIZE)
+        cancel = threading.Event()
+
+        def put(chunk):
+            """Wait until the chunk is queued for the event loop."""
+            asyncio.run_coroutine_threadsafe(queue.put(chunk), hass.loop).result()
+
+        def produce():
+            """Read the states and queue the chunks, None marks the end."""
+            try:
+                for chunk in self._significant_states_json_chunks(hass, *args):
+                    if cancel.is_set():
+                        return
+                    put(chunk)
+            finally:
+                if not cancel.is_set():
+                    put(None)
+
+        producer = hass.async_add_executor_job(produce)
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                await response.write(chunk)
+        finally:
+            # Unblock the producer if the client went away
+            cancel.set()
+            while not queue.empty():
+                queue.get_nowait()
+            await producer
+
+        await response.write_eof()
+        return response
+
+    def _significant_states_json_chunks(
+        self,
+        hass,
+        start_time,
+        end_time,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        max_points,
+    ):
+        """Yield the significant states of all entities as json chunks.
+
+        Only the states of one entity and the first states of the
+        period are kept in memory while the states are read.
+        """
+        timer_start = time.perf_counter()
+        count = 0
+
+        with session_scope(hass=hass) as session:
+            initial_states = {}
+            if include_start_time_state:
+                for state in _get_start_time_states(
+                    hass, session, start_time, None, self.filters
+                ):
+                    initial_states[state.entity_id] = state
+            stats = _get_statistics_before_oldest_state(
+                session, start_time, end_time, None, self.filters
+            )
+            if max_points:
+                states = _downsampled_states(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    None,
+                    self.filters,
+                    significant_changes_only,
+                    max_points,
+                )
+            else:
+                states = _significant_states_query(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    None,
+                    self.filters,
+                    significant_changes_only,
+                ).with_post_criteria(lambda q: q.yield_per(STREAM_CHUNK_STATES))
+
+            separator = b"["
+            for ent_id, group in groupby(states, lambda state: state.entity_id):
+                initial = initial_states.pop(ent_id, None)
+                entity_states = chain(
+                    _statistics_states(hass, ent_id, stats.pop(ent_id, ())),
+                    _entity_states(
+                        ent_id,
+                        [] if initial is None else [initial],
+                        group,
+                        minimal_response,
+                    ),
+                )
+                for chunk, chunk_count in _json_list_chunks(entity_states):
+                    yield separator + chunk
+                    separator = b""
+                    count += chunk_count
+                separator = b", "
+
+            # The entities that did not change during the period
+            for ent_id in {**initial_states, **stats}:
+                entity_states = _statistics_states(hass, ent_id, stats.get(ent_id, ()))
+                if ent_id in initial_states:
+                    entity_states.append(initial_states[ent_id])
+                for chunk, chunk_count in _json_list_chunks(entity_states):
+                    yield separator + chunk
+                    separator = b""
+                    count += chunk_count
+                separator = b", "
+
+        yield b"[]" if separator == b"[" else b"]"
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Streamed %d states in %fs", count, elapsed)
+
+
+def _json_list_chunks(items):
+    """Yield a json list of items in chunks with the number of items in each."""
+    dumps = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+    chunk = []
+    separator = "["
+    for item in items:
+        chunk.append(dumps(item))
+        if len(chunk) == STREAM_CHUNK_STATES:
+            yield (separator + ", ".join(chunk)).encode("UTF-8"), len(chunk)
+            separator = ", "
+            chunk = []
+    yield (separator + ", ".join(chunk) + "]").encode("UTF-8"), len(chunk)
+
+
+def _get_statistics_before_oldest_state(
+    session, start_time, end_time, entity_ids, filters
+):
+    """Return the hourly statistics for the period before the oldest state kept."""
+    oldest_state_time = session.query(func.min(States.last_updated)).scalar()
+    if oldest_state_time is not None:
+        oldest_state_time = process_timestamp(oldest_state_time)
+        if start_time >= oldest_state_time:
+            return {}
+        end_time = min(end_time, oldest_state_time)
+
+    return statistics.statistics_during_period_with_session(
+        session, start_time, end_time, entity_ids, filters
+    )
+
+
+def _statistics_states(hass, entity_id, stats):
+    """Return the hourly statistics of an entity as states."""
+    current_state = hass.states.get(entity_id)
+    attributes = current_state.attributes if current_state else {}
+    states = []
+    for stat in stats:
+        start = process_timestamp(stat.start)
+        states.append(
+            State(
+                entity_id,
+                str(stat.mean),
+                attributes,
+                last_changed=start,
+                last_updated=start,
+            )
+        )
+    return states
+
 
 def sqlalchemy_filter_from_include_exclude_conf(conf):
     """Build a sql filter from config."""
@@ -593,12 +1002,12 @@ class Filters:
         self.included_domains = []
         self.included_entity_globs = []
 
-    def apply(self, query):
+    def apply(self, query, model=States):
         """Apply the entity filter."""
         if not self.has_config:
             return query
 
-        return query.filter(self.entity_filter())
+        return query.filter(self.entity_filter(model))
 
     @property
     def has_config(self):
@@ -625,23 +1034,26 @@ class Filters:
 
         baked_query += lambda q: q.filter(self.entity_filter())
 
-    def entity_filter(self):
-        """Generate the entity filter query."""
+    def entity_filter(self, model=States):
+        """Generate the entity filter query.
+
+        The model needs the domain and entity_id columns of States.
+        """
         includes = []
         if self.included_domains:
-            includes.append(States.domain.in_(self.included_domains))
+            includes.append(model.domain.in_(self.included_domains))
         if self.included_entities:
-            includes.append(States.entity_id.in_(self.included_entities))
+            includes.append(model.entity_id.in_(self.included_entities))
         for glob in self.included_entity_globs:
-            includes.append(_glob_to_like(glob))
+            includes.append(_glob_to_like(glob, model))
 
         excludes = []
         if self.excluded_domains:
-            excludes.append(States.domain.in_(self.excluded_domains))
+            excludes.append(model.domain.in_(self.excluded_domains))
         if self.excluded_entities:
-            excludes.append(States.entity_id.in_(self.excluded_entities))
+            excludes.append(model.entity_id.in_(self.excluded_entities))
         for glob in self.excluded_entity_globs:
-            excludes.append(_glob_to_like(glob))
+            excludes.append(_glob_to_like(glob, model))
 
         if not includes and not excludes:
             return None
@@ -655,9 +1067,9 @@ class Filters:
         return or_(*includes) & not_(or_(*excludes))
 
 
-def _glob_to_like(glob_str):
+def _glob_to_like(glob_str, model=States):
     """Translate glob to sql."""
-    return States.entity_id.like(glob_str.translate(GLOB_TO_SQL_CHARS))
+    return model.entity_id.like(glob_str.translate(GLOB_TO_SQL_CHARS))
 
 
 class LazyState(State):
@@ -0,0 +1,317 @@
+"""Recent states of entities, kept in memory for the history consumers."""
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+import logging
+from typing import Deque, Dict, List, Optional, Tuple
+
+from homeassistant.components.recorder.models import States
+from homeassistant.components.recorder.util import execute, session_scope
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+import homeassistant.util.dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_RECENT_HISTORY = "history_recent"
+
+# Upper bound of the states kept for an entity
+MAX_STATES_PER_ENTITY = 2048
+
+# The recent states are complete since the beginning of the recorded history
+BEGINNING = datetime.min.replace(tzinfo=dt_util.UTC)
+
+
+@callback
+def async_get_recent_history(hass: HomeAssistant) -> "RecentHistory":
+    """Return the recent history of the entities, creating it when needed."""
+    recent = hass.data.get(DATA_RECENT_HISTORY)
+    if recent is None:
+        recent = hass.data[DATA_RECENT_HISTORY] = RecentHistory(hass)
+    return recent
+
+
+class _EntityHistory:
+    """The recent states of an entity.
+
+    Every state update since complete_since is kept, the first state is the
+    state of the entity at complete_since.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the recent states."""
+        self.states: Deque[State] = deque()
+        self.complete_since = dt_util.utcnow()
+        self.windows: List[Tuple[Optional[timedelta], Optional[int]]] = []
+        self.seed: Optional[asyncio.Future] = None
+        self.unsub_state_changed: Optional[CALLBACK_TYPE] = None
+
+    def covers(self, max_age: Optional[timedelta], max_items: Optional[int]) -> bool:
+        """Return if the states cover a window."""
+        if max_age is not None and dt_util.utcnow() - max_age < self.complete_since:
+            return False
+        return (
+            max_items is None
+            or len(self.states) >= max_items
+            or self.complete_since == BEGINNING
+        )
+
+    def evict(self, now: datetime) -> None:
+        """Drop the states no window needs anymore."""
+        ages = [max_age for max_age, _ in self.windows if max_age is not None]
+        cutoff = now - max(ages) if ages else None
+        max_items = max((items or 0 for _, items in self.windows), default=0)
+        states = self.states
+
+        while len(states) > 1 and (
+            len(states) > MAX_STATES_PER_ENTITY
+            or (
+                (cutoff is None or states[1].last_updated <= cutoff)
+                and len(states) > max_items
+            )
+        ):
+            states.popleft()
+            self.complete_since = states[0].last_updated
+
+
+class RecentHistory:
+    """Keep the recent states of the tracked entities.
+
+    The states are recorded from the state changes of each tracked entity and
+    seeded once from the recorder, so the sensors reading the history of the
+    same entity share a single database query.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the recent history."""
+        self.hass = hass
+        self._entities: Dict[str, _EntityHistory] = {}
+
+    async def async_track(
+        self,
+        entity_id: str,
+        max_age: Optional[timedelta] = None,
+        max_items: Optional[int] = None,
+    ) -> CALLBACK_TYPE:
+        """Keep the states of an entity over max_age or the last max_items.
+
+        Returns a callback to stop tracking the entity.
+        """
+        entity_id = entity_id.lower()
+        entity = self._entities.get(entity_id)
+        if entity is None:
+            entity = self._entities[entity_id] = _EntityHistory()
+            entity.unsub_state_changed = async_track_state_change_event(
+                self.hass, [entity_id], self._async_state_changed
+            )
+
+        window = (max_age, max_items)
+        entity.windows.append(window)
+
+        @callback
+        def async_untrack() -> None:
+            """Stop tracking the entity."""
+            entity.windows.remove(window)
+            if entity.windows or self._entities.get(entity_id) is not entity:
+                return
+            del self._entities[entity_id]
+            if entity.unsub_state_changed is not None:
+                entity.unsub_state_changed()
+                entity.unsub_state_changed = None
+
+        if "recorder" not in self.hass.config.components:
+            return async_untrack
+
+        try:
+            # Entities tracked together share the seed of their states
+            while entity.seed is not None:
+                await asyncio.shield(entity.seed)
+            if not entity.covers(max_age, max_items):
+                entity.seed = self.hass.async_create_task(
+                    self._async_seed(entity_id, entity, max_age, max_items)
+                )
+                await asyncio.shield(entity.seed)
+        except BaseException:
+            async_untrack()
+            raise
+
+        return async_untrack
+
+    @callback
+    def async_state_changes_during_period(
+        self,
+        entity_id: str,
+        start_time: datetime,
+        end_time: Optional[datetime] = None,
+    ) -> Optional[List[State]]:
+        """Return the state changes of an entity like the recorded history.
+
+        The list starts with the state at start_time, like the one of
+        history.state_changes_during_period. Returns None when the states are
+        not kept since start_time.
+        """
+        entity = self._entities.get(entity_id.lower())
+        if entity is None or start_time < entity.complete_since:
+            return None
+
+        initial_state = None
+        changes = []
+        for state in entity.states:
+            if end_time is not None and state.last_updated >= end_time:
+                break
+            if state.last_updated < start_time:
+                initial_state = state
+            elif (
+                state.last_updated > start_time
+                and state.last_changed == state.last_updated
+            ):
+                changes.append(state)
+
+        if initial_state is None:
+            return changes
+
+        return [
+            State(
+                initial_state.entity_id,
+                initial_state.state,
+                initial_state.attributes,
+                start_time,
+                start_time,
+                initial_state.context,
+                validate_entity_id=False,
+            ),
+            *changes,
+        ]
+
+    @callback
+    def async_get_last_states(
+        self,
+        entity_id: str,
+        number_of_states: Optional[int] = None,
+        start_time: Optional[datetime] = None,
+        changes_only: bool = False,
+    ) -> Optional[List[State]]:
+        """Return the last states of an entity updated since start_time.
+
+        Returns None when some of these states are not kept.
+        """
+        entity = self._entities.get(entity_id.lower())
+        if entity is None:
+            return None
+
+        states = [
+            state
+            for state in entity.states
+            if (start_time is None or state.last_updated >= start_time)
+            and (not changes_only or state.last_changed == state.last_updated)
+        ]
+
+        if number_of_states is not None and len(states) >= number_of_states:
+            return states[len(states) - number_of_states :]
+
+        if (start_time or BEGINNING) < entity.complete_since:
+            return None
+
+        return states
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Record the new state of a tracked entity."""
+        entity = self._entities.get(event.data["entity_id"])
+        new_state = event.data.get("new_state")
+        if entity is None or new_state is None:
+            return
+
+        entity.states.append(new_state)
+        entity.evict(new_state.last_updated)
+
+    async def _async_seed(
+        self,
+        entity_id: str,
+        entity: _EntityHistory,
+        max_age: Optional[timedelta],
+        max_items: Optional[int],
+    ) -> None:
+        """Seed the states of an entity from the recorder."""
+        start_time = dt_util.utcnow() - max_age if max_age is not None else None
+        try:
+            states, complete_since = await self.hass.async_add_executor_job(
+                _get_recorded_states, self.hass, entity_id, start_time, max_items
+            )
+        finally:
+            entity.seed = None
+
+        # The states updated while seeding are already recorded in memory
+        newest = states[-1].last_updated if states else None
+        states.extend(
+            state
+            for state in entity.states
+            if newest is None or state.last_updated > newest
+        )
+
+        # The current state may not be committed by the recorder yet
+        current = self.hass.states.get(entity_id)
+        if current is not None and (
+            not states or current.last_updated > states[-1].last_updated
+        ):
+            states.append(current)
+
+        entity.states = deque(states)
+        entity.complete_since = min(complete_since, entity.complete_since)
+        _LOGGER.debug(
+            "Seeded %d states of %s since %s", len(states), entity_id, complete_since
+        )
+        entity.evict(dt_util.utcnow())
+
+
+def _get_recorded_states(
+    hass: HomeAssistant,
+    entity_id: str,
+    start_time: Optional[datetime],
+    number_of_states: Optional[int],
+) -> Tuple[List[State], datetime]:
+    """Return the recorded states since start_time or the last ones.
+
+    The states since start_time start with the state at start_time. Also
+    returns the time since which the states are complete.
+    """
+    with session_scope(hass=hass) as session:
+        query = (
+            session.query(States)
+            .filter(States.entity_id == entity_id)
+            .order_by(States.last_updated.desc())
+        )
+
+        states: List[State] = []
+        complete = True
+        if start_time is not None:
+            states = execute(
+                query.filter(States.last_updated >= start_time).limit(
+                    MAX_STATES_PER_ENTITY
+                ),
+                to_native=True,
+                validate_entity_ids=False,
+            )
+            if len(states) == MAX_STATES_PER_ENTITY:
+                complete = False
+            else:
+                before = execute(
+                    query.filter(States.last_updated < start_time).limit(1),
+                    to_native=True,
+                    validate_entity_ids=False,
+                )
+                states.extend(before)
+                complete = not before
+
+        if number_of_states is not None and len(states) < number_of_states:
+            states = execute(
+                query.limit(number_of_states),
+                to_native=True,
+                validate_entity_ids=False,
+            )
+            complete = len(states) < number_of_states
+
+    states.reverse()
+    if complete or not states:
+        return states, BEGINNING
+    return states, states[0].last_updated
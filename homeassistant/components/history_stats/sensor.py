@@ -6,6 +6,7 @@ import math
 import voluptuous as vol
 
 from homeassistant.components import history
+from homeassistant.components.history.recent import async_get_recent_history
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
     CONF_ENTITY_ID,
@@ -22,6 +23,7 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.reload import setup_reload_service
+from homeassistant.util.async_ import run_callback_threadsafe
 import homeassistant.util.dt as dt_util
 
 from . import DOMAIN, PLATFORMS
@@ -46,6 +48,9 @@ UNITS = {
 }
 ICON = "mdi:chart-line"
 
+# Shortest period of the recent history kept for the sensor
+MIN_HISTORY_AGE = datetime.timedelta(hours=1)
+
 ATTR_VALUE = "value"
 
 
@@ -123,12 +128,18 @@ class HistoryStatsSensor(Entity):
         self.value = None
         self.count = None
 
+        self._history_age = None
+        self._untrack_history = None
+
     async def async_added_to_hass(self):
         """Create listeners when the entity is added."""
 
         @callback
         def start_refresh(*args):
             """Register state tracking."""
+            self.hass.async_create_task(
+                self._async_track_history(self._duration or MIN_HISTORY_AGE)
+            )
 
             @callback
             def force_refresh(*args):
@@ -149,6 +160,23 @@ class HistoryStatsSensor(Entity):
         # Delay first refresh to keep startup fast
         self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, start_refresh)
 
+    async def async_will_remove_from_hass(self):
+        """Stop keeping the recent history of the entity."""
+        if self._untrack_history is not None:
+            self._untrack_history()
+            self._untrack_history = None
+        self._history_age = None
+
+    async def _async_track_history(self, max_age):
+        """Keep the recent history of the entity over max_age in memory."""
+        untrack = await async_get_recent_history(self.hass).async_track(
+            self._entity_id, max_age=max_age
+        )
+        if self._untrack_history is not None:
+            self._untrack_history()
+        self._untrack_history = untrack
+        self._history_age = max_age
+
     @property
     def name(self):
         """Return the name of the sensor."""
@@ -226,22 +254,24 @@ class HistoryStatsSensor(Entity):
             return
 
         # Get history between start and end
-        history_list = history.state_changes_during_period(
-            self.hass, start, end, str(self._entity_id)
-        )
+        states = self._recent_state_changes(start, end)
+        if states is None:
+            history_list = history.state_changes_during_period(
+                self.hass, start, end, str(self._entity_id)
+            )
+            states = history_list.get(self._entity_id)
 
-        if self._entity_id not in history_list.keys():
+        if not states:
             return
 
-        # Get the first state
-        last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = last_state is not None and last_state == self._entity_state
+        # The first state is the state at start
+        last_state = False
         last_time = start_timestamp
         elapsed = 0
         count = 0
 
         # Make calculations
-        for item in history_list.get(self._entity_id):
+        for item in states:
             current_state = item.state == self._entity_state
             current_time = item.last_changed.timestamp()
 
@@ -264,6 +294,28 @@ class HistoryStatsSensor(Entity):
         # Save counter
         self.count = count
 
+    def _recent_state_changes(self, start, end):
+        """Return the state changes kept in memory, None if they are not kept."""
+        if self._history_age is None:
+            return None
+
+        states = run_callback_threadsafe(
+            self.hass.loop,
+            async_get_recent_history(self.hass).async_state_changes_during_period,
+            self._entity_id,
+            start,
+            end,
+        ).result()
+
+        history_age = dt_util.utcnow() - start
+        if states is None and history_age > self._history_age:
+            # Keep a longer history for the next periods
+            self.hass.add_job(
+                self._async_track_history, max(history_age, 2 * self._history_age)
+            )
+
+        return states
+
     def update_period(self):
         """Parse the templates and store a datetime tuple in _period."""
         start = None
@@ -27,6 +27,7 @@ from homeassistant.helpers import (
     config_validation as cv,
     entity_platform,
 )
+from homeassistant.helpers.reference_index import async_get_reference_index
 from homeassistant.helpers.state import async_reproduce_state
 from homeassistant.loader import async_get_integration
 
@@ -120,16 +121,9 @@ _LOGGER = logging.getLogger(__name__)
 @callback
 def scenes_with_entity(hass: HomeAssistant, entity_id: str) -> List[str]:
     """Return all scenes that reference the entity."""
-    if DATA_PLATFORM not in hass.data:
-        return []
-
-    platform = hass.data[DATA_PLATFORM]
-
-    return [
-        scene_entity.entity_id
-        for scene_entity in platform.entities.values()
-        if entity_id in scene_entity.scene_config.states
-    ]
+    return async_get_reference_index(hass, SCENE_DOMAIN).async_referencing_entity(
+        entity_id
+    )
 
 
 @callback
@@ -306,6 +300,16 @@ class HomeAssistantScene(Scene):
             attributes[CONF_ID] = unique_id
         return attributes
 
+    async def async_added_to_hass(self) -> None:
+        """Index the entities of the scene."""
+        async_get_reference_index(self.hass, SCENE_DOMAIN).async_add(
+            self.entity_id, self.scene_config.states
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop the entities of the scene from the index."""
+        async_get_reference_index(self.hass, SCENE_DOMAIN).async_remove(self.entity_id)
+
     async def async_activate(self, **kwargs: Any) -> None:
         """Activate scene. Try to get entities into requested state."""
         await async_reproduce_state(
@@ -14,7 +14,10 @@ from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
+    STATE_ATTRIBUTES,
+    STATE_ATTRIBUTES_JOIN,
     Events,
+    StateAttributes,
     States,
     process_timestamp_to_utc_isoformat,
 )
@@ -489,7 +492,7 @@ def _generate_events_query(session):
         States.state,
         States.entity_id,
         States.domain,
-        States.attributes,
+        STATE_ATTRIBUTES.label("attributes"),
     )
 
 
@@ -508,6 +511,7 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
         _generate_events_query(session)
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(StateAttributes, STATE_ATTRIBUTES_JOIN)
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
         .filter((States.last_updated > start_day) & (States.last_updated < end_day))
@@ -522,6 +526,7 @@ def _apply_events_types_and_states_filter(hass, query, old_state):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(StateAttributes, STATE_ATTRIBUTES_JOIN)
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
             | _missing_state_matcher(old_state)
@@ -551,7 +556,7 @@ def _continuous_entity_matcher():
     #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(STATE_ATTRIBUTES.contains(UNIT_OF_MEASUREMENT_JSON)),
     )
 
 
@@ -2,14 +2,15 @@
 import asyncio
 from functools import partial, wraps
 import inspect
-from itertools import groupby
+from itertools import chain, count, groupby
 import json
 import logging
 from operator import attrgetter
 import os
 import ssl
+import threading
 import time
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import attr
 import certifi
@@ -493,6 +494,7 @@ async def async_setup(hass: HomeAssistantType, config: ConfigType) -> bool:
     websocket_api.async_register_command(hass, websocket_subscribe)
     websocket_api.async_register_command(hass, websocket_remove_device)
     websocket_api.async_register_command(hass, websocket_mqtt_info)
+    websocket_api.async_register_command(hass, websocket_message_stats)
 
     if conf is None:
         # If we have a config entry, setup is done by that config entry.
@@ -630,12 +632,121 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     callback: MessageCallbackType = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str = attr.ib(default="utf-8")
 
 
+@attr.s(slots=True)
+class MessageBatchStats:
+    """Statistics of the batches of messages handed to the event loop.
+
+    The latency is the time the oldest message of a batch waited
+    between its reception and the handling of the batch.
+    """
+
+    batches: int = attr.ib(default=0)
+    messages: int = attr.ib(default=0)
+    max_batch_size: int = attr.ib(default=0)
+    total_latency: float = attr.ib(default=0.0)
+    max_latency: float = attr.ib(default=0.0)
+
+    def record_batch(self, size: int, latency: float) -> None:
+        """Record a batch of messages."""
+        self.batches += 1
+        self.messages += size
+        self.max_batch_size = max(self.max_batch_size, size)
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def as_dict(self) -> dict:
+        """Return the statistics as a dictionary."""
+        return {
+            "batches": self.batches,
+            "messages": self.messages,
+            "mean_batch_size": self.messages / self.batches if self.batches else 0,
+            "max_batch_size": self.max_batch_size,
+            "mean_latency": self.total_latency / self.batches if self.batches else 0,
+            "max_latency": self.max_latency,
+        }
+
+
+class SubscriptionMatcher:
+    """Find the subscriptions matching a topic.
+
+    Topic filters without wildcards are looked up directly, the others
+    share a trie of topic levels so a topic is matched in O(topic depth)
+    whatever the number of subscriptions.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the subscription matcher."""
+        # pylint: disable=import-outside-toplevel
+        from paho.mqtt.matcher import MQTTMatcher
+
+        self._exact: Dict[str, List[Tuple[int, Subscription]]] = {}
+        self._wildcards = MQTTMatcher()
+        # Matching subscriptions are returned in the order they were added
+        self._sequence = count()
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription."""
+        topic = subscription.topic
+        entry = (next(self._sequence), subscription)
+        if not _is_wildcard(topic):
+            self._exact.setdefault(topic, []).append(entry)
+            return
+
+        try:
+            self._wildcards[topic].append(entry)
+        except KeyError:
+            self._wildcards[topic] = [entry]
+
+    def remove(self, subscription: Subscription) -> bool:
+        """Remove a subscription.
+
+        Returns True if other subscriptions remain on its topic.
+        """
+        topic = subscription.topic
+        if _is_wildcard(topic):
+            entries = self._wildcards[topic]
+        else:
+            entries = self._exact[topic]
+
+        for idx, (_, other) in enumerate(entries):
+            if other is subscription:
+                del entries[idx]
+                break
+
+        if entries:
+            return True
+
+        if _is_wildcard(topic):
+            del self._wildcards[topic]
+        else:
+            del self._exact[topic]
+        return False
+
+    def match(self, topic: str) -> List[Subscription]:
+        """Return the subscriptions matching a topic."""
+        matches = list(self._wildcards.iter_match(topic))
+        exact = self._exact.get(topic)
+        if exact:
+            matches.append(exact)
+
+        if len(matches) == 1:
+            return [subscription for _, subscription in matches[0]]
+
+        return [
+            subscription for _, subscription in sorted(chain.from_iterable(matches))
+        ]
+
+
+def _is_wildcard(topic: str) -> bool:
+    """Return if a topic filter contains wildcards."""
+    return "+" in topic or "#" in topic
+
+
 class MQTT:
     """Home Assistant MQTT client."""
 
@@ -654,6 +765,11 @@ class MQTT:
         self.config_entry = config_entry
         self.conf = conf
         self.subscriptions: List[Subscription] = []
+        self._matcher = SubscriptionMatcher()
+        self._pending_messages: List[Tuple[Any, float]] = []
+        self._pending_messages_lock = threading.Lock()
+        self._pending_messages_scheduled = False
+        self.message_stats = MessageBatchStats()
         self.connected = False
         self._ha_started = asyncio.Event()
         self._last_subscribe = time.time()
@@ -839,10 +955,9 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), msg_callback, qos, encoding
-        )
+        subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        self._matcher.add(subscription)
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -856,7 +971,7 @@ class MQTT:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            if self._matcher.remove(subscription):
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
@@ -942,28 +1057,62 @@ class MQTT:
             self.hass.loop.create_task(publish_birth_message(birth_message))
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
+
+        The messages are handed to the event loop in batches,
+        waking up the loop once per batch instead of per message.
+        """
+        with self._pending_messages_lock:
+            self._pending_messages.append((msg, time.monotonic()))
+            if self._pending_messages_scheduled:
+                return
+            self._pending_messages_scheduled = True
+
+        self.hass.loop.call_soon_threadsafe(self._async_handle_pending_messages)
+
+    @callback
+    def _async_handle_pending_messages(self) -> None:
+        """Handle the messages received since the previous batch."""
+        with self._pending_messages_lock:
+            messages = self._pending_messages
+            self._pending_messages = []
+            self._pending_messages_scheduled = False
+
+        self.message_stats.record_batch(
+            len(messages), time.monotonic() - messages[0][1]
+        )
+
+        timestamp = dt_util.utcnow()
+        for msg, _ in messages:
+            self._mqtt_handle_message(msg, timestamp)
 
     @callback
-    def _mqtt_handle_message(self, msg) -> None:
+    def _mqtt_handle_message(self, msg, timestamp=None) -> None:
         _LOGGER.debug(
             "Received message on %s%s: %s",
             msg.topic,
             " (retained)" if msg.retain else "",
             msg.payload,
         )
-        timestamp = dt_util.utcnow()
-
-        for subscription in self.subscriptions:
-            if not subscription.matcher(msg.topic):
-                continue
+        if timestamp is None:
+            timestamp = dt_util.utcnow()
 
+        # Decode and parse the payload once per encoding
+        payloads: Dict[str, Optional[str]] = {}
+        json_caches: Dict[Optional[str], Dict[str, Any]] = {}
+        for subscription in self._matcher.match(msg.topic):
             payload: SubscribePayloadType = msg.payload
             if subscription.encoding is not None:
-                try:
-                    payload = msg.payload.decode(subscription.encoding)
-                except (AttributeError, UnicodeDecodeError):
+                if subscription.encoding not in payloads:
+                    try:
+                        payloads[subscription.encoding] = msg.payload.decode(
+                            subscription.encoding
+                        )
+                    except (AttributeError, UnicodeDecodeError):
+                        payloads[subscription.encoding] = None
+
+                payload = payloads[subscription.encoding]
+                if payload is None:
                     _LOGGER.warning(
                         "Can't decode payload %s on %s with encoding %s (for %s)",
                         msg.payload,
@@ -973,17 +1122,28 @@ class MQTT:
                     )
                     continue
 
-            self.hass.async_run_job(
-                subscription.callback,
-                Message(
+            # Callbacks run inline, a failing subscriber must not drop
+            # the message for the other subscribers or the rest of the batch
+            try:
+                self.hass.async_run_job(
+                    subscription.callback,
+                    Message(
+                        msg.topic,
+                        payload,
+                        msg.qos,
+                        msg.retain,
+                        subscription.topic,
+                        timestamp,
+                        json_caches.setdefault(subscription.encoding, {}),
+                    ),
+                )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Exception in %s when handling msg on '%s': '%s'",
+                    subscription.callback,
                     msg.topic,
-                    payload,
-                    msg.qos,
-                    msg.retain,
-                    subscription.topic,
-                    timestamp,
-                ),
-            )
+                    msg.payload,
+                )
 
     def _mqtt_on_callback(self, _mqttc, _userdata, mid, _granted_qos=None) -> None:
         """Publish / Subscribe / Unsubscribe callback."""
@@ -1053,16 +1213,6 @@ def _raise_on_error(result_code: int) -> None:
         )
 
 
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
@@ -1094,10 +1244,14 @@ class MqttAttributes(Entity):
             try:
                 payload = msg.payload
                 if attr_tpl is not None:
-                    payload = attr_tpl.async_render_with_possible_json_value(payload)
-                json_dict = json.loads(payload)
+                    payload = attr_tpl.async_render_with_possible_json_value(
+                        payload, variables=msg.template_variables
+                    )
+                    json_dict = json.loads(payload)
+                else:
+                    json_dict = msg.json
                 if isinstance(json_dict, dict):
-                    self._attributes = json_dict
+                    self._attributes = dict(json_dict)
                     self.async_write_ha_state()
                 else:
                     _LOGGER.warning("JSON result was not a dictionary")
@@ -1405,6 +1559,20 @@ async def websocket_mqtt_info(hass, connection, msg):
     connection.send_result(msg["id"], mqtt_info)
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "mqtt/message_stats"})
+@callback
+def websocket_message_stats(hass, connection, msg):
+    """Get the statistics of the messages received from the broker."""
+    if DATA_MQTT not in hass.data:
+        connection.send_error(
+            msg["id"], websocket_api.const.ERR_NOT_FOUND, "MQTT is not set up"
+        )
+        return
+
+    connection.send_result(msg["id"], hass.data[DATA_MQTT].message_stats.as_dict())
+
+
 @websocket_api.websocket_command(
     {vol.Required("type"): "mqtt/device/remove", vol.Required("device_id"): str}
 )
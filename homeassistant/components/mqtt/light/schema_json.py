@@ -243,7 +243,7 @@ class MqttLightJson(
         @log_messages(self.hass, self.entity_id)
         def state_received(msg):
             """Handle new MQTT messages."""
-            values = json.loads(msg.payload)
+            values = msg.json
 
             if values["state"] == "ON":
                 self._state = True
@@ -225,7 +225,9 @@ class MqttLightTemplate(
             """Handle new MQTT messages."""
             state = self._templates[
                 CONF_STATE_TEMPLATE
-            ].async_render_with_possible_json_value(msg.payload)
+            ].async_render_with_possible_json_value(
+                msg.payload, variables=msg.template_variables
+            )
             if state == STATE_ON:
                 self._state = True
             elif state == STATE_OFF:
@@ -238,7 +240,9 @@ class MqttLightTemplate(
                     self._brightness = int(
                         self._templates[
                             CONF_BRIGHTNESS_TEMPLATE
-                        ].async_render_with_possible_json_value(msg.payload)
+                        ].async_render_with_possible_json_value(
+                            msg.payload, variables=msg.template_variables
+                        )
                     )
                 except ValueError:
                     _LOGGER.warning("Invalid brightness value received")
@@ -248,7 +252,9 @@ class MqttLightTemplate(
                     self._color_temp = int(
                         self._templates[
                             CONF_COLOR_TEMP_TEMPLATE
-                        ].async_render_with_possible_json_value(msg.payload)
+                        ].async_render_with_possible_json_value(
+                            msg.payload, variables=msg.template_variables
+                        )
                     )
                 except ValueError:
                     _LOGGER.warning("Invalid color temperature value received")
@@ -258,17 +264,23 @@ class MqttLightTemplate(
                     red = int(
                         self._templates[
                             CONF_RED_TEMPLATE
-                        ].async_render_with_possible_json_value(msg.payload)
+                        ].async_render_with_possible_json_value(
+                            msg.payload, variables=msg.template_variables
+                        )
                     )
                     green = int(
                         self._templates[
                             CONF_GREEN_TEMPLATE
-                        ].async_render_with_possible_json_value(msg.payload)
+                        ].async_render_with_possible_json_value(
+                            msg.payload, variables=msg.template_variables
+                        )
                     )
                     blue = int(
                         self._templates[
                             CONF_BLUE_TEMPLATE
-                        ].async_render_with_possible_json_value(msg.payload)
+                        ].async_render_with_possible_json_value(
+                            msg.payload, variables=msg.template_variables
+                        )
                     )
                     self._hs = color_util.color_RGB_to_hs(red, green, blue)
                 except ValueError:
@@ -279,7 +291,9 @@ class MqttLightTemplate(
                     self._white_value = int(
                         self._templates[
                             CONF_WHITE_VALUE_TEMPLATE
-                        ].async_render_with_possible_json_value(msg.payload)
+                        ].async_render_with_possible_json_value(
+                            msg.payload, variables=msg.template_variables
+                        )
                     )
                 except ValueError:
                     _LOGGER.warning("Invalid white value received")
@@ -287,7 +301,9 @@ class MqttLightTemplate(
             if self._templates[CONF_EFFECT_TEMPLATE] is not None:
                 effect = self._templates[
                     CONF_EFFECT_TEMPLATE
-                ].async_render_with_possible_json_value(msg.payload)
+                ].async_render_with_possible_json_value(
+                    msg.payload, variables=msg.template_variables
+                )
 
                 if effect in self._config.get(CONF_EFFECT_LIST):
                     self._effect = effect
@@ -1,11 +1,14 @@
 """Modesl used by multiple MQTT modules."""
 import datetime as dt
-from typing import Callable, Optional, Union
+import json
+from typing import Any, Callable, Dict, Optional, Union
 
 import attr
 
 PublishPayloadType = Union[str, bytes, int, float, None]
 
+_INVALID_JSON = object()
+
 
 @attr.s(slots=True, frozen=True)
 class Message:
@@ -17,6 +20,35 @@ class Message:
     retain: bool = attr.ib()
     subscribed_topic: Optional[str] = attr.ib(default=None)
     timestamp: Optional[dt.datetime] = attr.ib(default=None)
+    # Shared by the messages handed to each subscription of a received message
+    _json_cache: Dict[str, Any] = attr.ib(factory=dict, eq=False, repr=False)
+
+    @property
+    def json(self) -> Any:
+        """Return the payload parsed as JSON.
+
+        The payload is parsed once for all the subscriptions receiving
+        the message, so the result must not be modified.
+        Raises ValueError if the payload is not valid JSON.
+        """
+        if "json" not in self._json_cache:
+            try:
+                self._json_cache["json"] = json.loads(self.payload)
+            except (ValueError, TypeError):
+                self._json_cache["json"] = _INVALID_JSON
+
+        value = self._json_cache["json"]
+        if value is _INVALID_JSON:
+            raise ValueError(f"Payload is not valid JSON: {self.payload!r}")
+        return value
+
+    @property
+    def template_variables(self) -> Dict[str, Any]:
+        """Return the value_json template variable of a JSON payload."""
+        try:
+            return {"value_json": self.json}
+        except ValueError:
+            return {}
 
 
 MessageCallbackType = Callable[[Message], None]
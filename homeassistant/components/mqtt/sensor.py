@@ -180,7 +180,7 @@ class MqttSensor(
             template = self._config.get(CONF_VALUE_TEMPLATE)
             if template is not None:
                 payload = template.async_render_with_possible_json_value(
-                    payload, self._state
+                    payload, self._state, msg.template_variables
                 )
             self._state = payload
             self.async_write_ha_state()
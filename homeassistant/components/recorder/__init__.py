@@ -1,15 +1,15 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import queue
 import threading
 import time
 from typing import Any, Callable, List, Optional
 
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
+from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 import voluptuous as vol
@@ -31,12 +31,16 @@ from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER,
     convert_include_exclude_filter,
 )
+from homeassistant.helpers.event import (
+    async_track_time_interval,
+    async_track_utc_time_change,
+)
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
-from . import migration, purge
+from . import migration, purge, statistics
 from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .models import Base, Events, RecorderRuns, StateAttributes, States
 from .util import session_scope, validate_or_move_away_sqlite_database
 
 _LOGGER = logging.getLogger(__name__)
@@ -59,6 +63,10 @@ DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 KEEPALIVE_TIME = 30
+# Number of recently written attributes to remember the row of
+STATE_ATTRIBUTES_CACHE_SIZE = 2048
+# Number of attributes hashes looked up with one query
+STATE_ATTRIBUTES_HASHES_PER_QUERY = 998
 
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
@@ -194,12 +202,22 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 
 PurgeTask = namedtuple("PurgeTask", ["keep_days", "repack"])
+RepackTask = namedtuple("RepackTask", ["tables"])
+StatisticsTask = namedtuple("StatisticsTask", ["start", "entity_ids"])
 
 
 class WaitTask:
     """An object to insert into the recorder queue to tell it set the _queue_watch event."""
 
 
+class CommitTask:
+    """An object to insert into the recorder queue to commit the event session."""
+
+
+class KeepAliveTask:
+    """An object to insert into the recorder queue to keep the connection alive."""
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -237,10 +255,19 @@ class Recorder(threading.Thread):
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
 
-        self._timechanges_seen = 0
-        self._keepalive_count = 0
-        self._old_states = {}
-        self._pending_expunge = []
+        self._commit_listener = None
+        self._keep_alive_listener = None
+        self._statistics_listener = None
+        self._old_state_ids = {}
+        self._pending_events = []
+        self._pending_states = []
+        self._pending_state_attributes = []
+        self._state_attributes_ids: OrderedDict = OrderedDict()
+        # State rows waiting for the id of attributes missing from the cache
+        self._pending_attributes_rows = {}
+        self._next_event_id = 1
+        self._next_state_id = 1
+        self._next_attributes_id = 1
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
@@ -300,6 +327,7 @@ class Recorder(threading.Thread):
         @callback
         def register():
             """Post connection initialize."""
+            self._async_setup_periodic_tasks()
             self.async_db_ready.set_result(True)
 
             def shutdown(event):
@@ -309,6 +337,9 @@ class Recorder(threading.Thread):
                 self.queue.put(None)
                 self.join()
 
+            self.hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STOP, self._async_stop_periodic_tasks
+            )
             self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, shutdown)
 
             if self.hass.state == CoreState.running:
@@ -345,9 +376,9 @@ class Recorder(threading.Thread):
             )
 
         self.event_session = self.get_session()
-        # Use a session for the event read loop
-        # with a commit every time the event time
-        # has changed. This reduces the disk io.
+        # Use a session for the event read loop and
+        # collect the rows so they are written in bulk
+        # every commit interval. This reduces the disk io.
         while True:
             event = self.queue.get()
             if event is None:
@@ -355,23 +386,39 @@ class Recorder(threading.Thread):
                 self._close_connection()
                 return
             if isinstance(event, PurgeTask):
+                # Write the pending rows first so the purge
+                # keeps the attributes that they share
+                self._commit_event_session_or_retry()
                 # Schedule a new purge task if this one didn't finish
-                if not purge.purge_old_data(self, event.keep_days, event.repack):
+                # so the events queued meanwhile are saved first
+                if not purge.purge_old_data(self, event.keep_days):
                     self.queue.put(PurgeTask(event.keep_days, event.repack))
+                elif event.repack:
+                    self.queue.put(RepackTask(purge.REPACK_TABLES))
+                self._state_attributes_ids.clear()
+                continue
+            if isinstance(event, RepackTask):
+                self._commit_event_session_or_retry()
+                tables = purge.repack_database(self, event.tables)
+                if tables:
+                    self.queue.put(RepackTask(tables))
+                continue
+            if isinstance(event, StatisticsTask):
+                # Write the pending rows first so the
+                # states of the period are compiled
+                self._commit_event_session_or_retry()
+                statistics.compile_statistics(self, event.start, event.entity_ids)
                 continue
             if isinstance(event, WaitTask):
                 self._queue_watch.set()
                 continue
+            if isinstance(event, CommitTask):
+                self._commit_event_session_or_retry()
+                continue
+            if isinstance(event, KeepAliveTask):
+                self._send_keep_alive()
+                continue
             if event.event_type == EVENT_TIME_CHANGED:
-                self._keepalive_count += 1
-                if self._keepalive_count >= KEEPALIVE_TIME:
-                    self._keepalive_count = 0
-                    self._send_keep_alive()
-                if self.commit_interval:
-                    self._timechanges_seen += 1
-                    if self._timechanges_seen >= self.commit_interval:
-                        self._timechanges_seen = 0
-                        self._commit_event_session_or_retry()
                 continue
             if event.event_type in self.exclude_t:
                 continue
@@ -382,29 +429,38 @@ class Recorder(threading.Thread):
                     continue
 
             try:
-                dbevent = Events.from_event(event)
                 if event.event_type == EVENT_STATE_CHANGED:
-                    dbevent.event_data = "{}"
-                self.event_session.add(dbevent)
+                    event_row = Events.row_from_event(event, event_data="{}")
+                else:
+                    event_row = Events.row_from_event(event)
             except (TypeError, ValueError):
                 _LOGGER.warning("Event is not JSON serializable: %s", event)
+                continue
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
                 _LOGGER.exception("Error adding event: %s", err)
+                continue
 
-            if dbevent and event.event_type == EVENT_STATE_CHANGED:
+            event_id = event_row["event_id"] = self._next_event_id
+            self._next_event_id += 1
+            self._pending_events.append(event_row)
+
+            if event.event_type == EVENT_STATE_CHANGED:
                 try:
-                    dbstate = States.from_event(event)
-                    has_new_state = event.data.get("new_state")
-                    if dbstate.entity_id in self._old_states:
-                        dbstate.old_state = self._old_states.pop(dbstate.entity_id)
-                    if not has_new_state:
-                        dbstate.state = None
-                    dbstate.event = dbevent
-                    self.event_session.add(dbstate)
-                    if has_new_state:
-                        self._old_states[dbstate.entity_id] = dbstate
-                        self._pending_expunge.append(dbstate)
+                    state_row = States.row_from_event(event)
+                    entity_id = state_row["entity_id"]
+                    state_id = state_row["state_id"] = self._next_state_id
+                    self._next_state_id += 1
+                    state_row["event_id"] = event_id
+                    self._set_attributes_id(state_row)
+                    # Link to the previous state from memory instead of
+                    # letting the ORM resolve the old_state relationship
+                    state_row["old_state_id"] = self._old_state_ids.pop(entity_id, None)
+                    if event.data.get("new_state"):
+                        self._old_state_ids[entity_id] = state_id
+                    else:
+                        state_row["state"] = None
+                    self._pending_states.append(state_row)
                 except (TypeError, ValueError):
                     _LOGGER.warning(
                         "State is not JSON serializable: %s",
@@ -419,6 +475,58 @@ class Recorder(threading.Thread):
             if not self.commit_interval:
                 self._commit_event_session_or_retry()
 
+    @callback
+    def _async_setup_periodic_tasks(self):
+        """Schedule the periodic commit, keep alive and statistics."""
+        self._keep_alive_listener = async_track_time_interval(
+            self.hass, self._async_keep_alive, timedelta(seconds=KEEPALIVE_TIME)
+        )
+        self._statistics_listener = async_track_utc_time_change(
+            self.hass, self._async_five_minute, minute="/5", second=10
+        )
+
+        # If they do not have a commit interval
+        # we commit after every event instead
+        if self.commit_interval:
+            self._commit_listener = async_track_time_interval(
+                self.hass, self._async_commit, timedelta(seconds=self.commit_interval)
+            )
+
+    @callback
+    def _async_stop_periodic_tasks(self, event):
+        """Stop the periodic commit, keep alive and statistics."""
+        if self._keep_alive_listener is not None:
+            self._keep_alive_listener()
+            self._keep_alive_listener = None
+
+        if self._statistics_listener is not None:
+            self._statistics_listener()
+            self._statistics_listener = None
+
+        if self._commit_listener is not None:
+            self._commit_listener()
+            self._commit_listener = None
+
+    @callback
+    def _async_keep_alive(self, now):
+        """Queue a keep alive of the database connection."""
+        self.queue.put(KeepAliveTask())
+
+    @callback
+    def _async_five_minute(self, now):
+        """Queue the compiling of the statistics of the last 5 minutes."""
+        start = now.replace(minute=now.minute - now.minute % 5, second=0, microsecond=0)
+        # Only the entities that still exist keep their last value
+        entity_ids = frozenset(
+            self.hass.states.async_entity_ids(statistics.STATISTICS_DOMAINS)
+        )
+        self.queue.put(StatisticsTask(start - timedelta(minutes=5), entity_ids))
+
+    @callback
+    def _async_commit(self, now):
+        """Queue a commit of the event session."""
+        self.queue.put(CommitTask())
+
     def _send_keep_alive(self):
         try:
             _LOGGER.debug("Sending keepalive")
@@ -461,6 +569,7 @@ class Recorder(threading.Thread):
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
                 _LOGGER.exception("Error saving events: %s", err)
+                self._discard_pending_rows()
                 return
 
         _LOGGER.error(
@@ -470,6 +579,8 @@ class Recorder(threading.Thread):
         self._reopen_event_session()
 
     def _reopen_event_session(self):
+        self._discard_pending_rows()
+
         try:
             self.event_session.rollback()
         except Exception as err:  # pylint: disable=broad-except
@@ -490,19 +601,141 @@ class Recorder(threading.Thread):
 
     def _commit_event_session(self):
         try:
-            self.event_session.flush()
-            for dbstate in self._pending_expunge:
-                # Expunge the state so its not expired
-                # until we use it later for dbstate.old_state
-                if dbstate in self.event_session:
-                    self.event_session.expunge(dbstate)
-            self._pending_expunge = []
+            if self._pending_attributes_rows:
+                self._resolve_pending_attributes()
+            # Passing a list of rows makes SQLAlchemy Core
+            # use a single executemany for each table
+            if self._pending_events:
+                self.event_session.execute(
+                    Events.__table__.insert(), self._pending_events
+                )
+            if self._pending_state_attributes:
+                self.event_session.execute(
+                    StateAttributes.__table__.insert(),
+                    self._pending_state_attributes,
+                )
+            if self._pending_states:
+                self.event_session.execute(
+                    States.__table__.insert(), self._pending_states
+                )
+            if self._pending_events or self._pending_states:
+                self._advance_id_sequences(self.event_session)
             self.event_session.commit()
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
             raise
 
+        self._pending_events = []
+        self._pending_states = []
+        self._pending_state_attributes = []
+
+    def _advance_id_sequences(self, session):
+        """Move the PostgreSQL sequences past the ids assigned in memory.
+
+        The rows are inserted with explicit ids which do not advance the
+        serial sequences, so the rows inserted without an id would collide.
+        """
+        if self.engine.dialect.name != "postgresql":
+            return
+        session.execute(
+            select(
+                [
+                    func.setval(
+                        func.pg_get_serial_sequence(table.__tablename__, column),
+                        next_id,
+                        False,
+                    )
+                    for table, column, next_id in (
+                        (Events, "event_id", self._next_event_id),
+                        (States, "state_id", self._next_state_id),
+                        (
+                            StateAttributes,
+                            "attributes_id",
+                            self._next_attributes_id,
+                        ),
+                    )
+                ]
+            )
+        )
+
+    def _discard_pending_rows(self):
+        """Drop the rows that could not be saved."""
+        if self._pending_events or self._pending_states:
+            _LOGGER.warning(
+                "Dropping %d events and %d states that could not be saved",
+                len(self._pending_events),
+                len(self._pending_states),
+            )
+        self._pending_events = []
+        self._pending_states = []
+        self._pending_state_attributes = []
+        self._pending_attributes_rows = {}
+        # The old states and attributes may have been part of the dropped rows
+        self._old_state_ids = {}
+        self._state_attributes_ids.clear()
+
+    def _set_attributes_id(self, state_row):
+        """Link a state row to the row of its attributes.
+
+        The attributes missing from the cache are looked up in bulk when
+        the pending rows are committed.
+        """
+        shared_attrs = state_row["attributes"]
+        state_row["attributes"] = None
+        attributes_ids = self._state_attributes_ids
+        attributes_id = attributes_ids.get(shared_attrs)
+        if attributes_id is not None:
+            attributes_ids.move_to_end(shared_attrs)
+            state_row["attributes_id"] = attributes_id
+            return
+
+        state_row["attributes_id"] = None
+        self._pending_attributes_rows.setdefault(shared_attrs, []).append(state_row)
+
+    def _resolve_pending_attributes(self):
+        """Find or add the attributes rows of the pending state rows."""
+        pending = self._pending_attributes_rows
+        hashes = {
+            shared_attrs: StateAttributes.hash_shared_attrs(shared_attrs)
+            for shared_attrs in pending
+        }
+        unique_hashes = list(set(hashes.values()))
+
+        found = {}
+        for start in range(0, len(unique_hashes), STATE_ATTRIBUTES_HASHES_PER_QUERY):
+            for attributes_id, shared_attrs in self.event_session.query(
+                StateAttributes.attributes_id, StateAttributes.shared_attrs
+            ).filter(
+                StateAttributes.hash.in_(
+                    unique_hashes[start : start + STATE_ATTRIBUTES_HASHES_PER_QUERY]
+                )
+            ):
+                if shared_attrs in pending:
+                    found.setdefault(shared_attrs, attributes_id)
+
+        attributes_ids = self._state_attributes_ids
+        for shared_attrs, state_rows in pending.items():
+            attributes_id = found.get(shared_attrs)
+            if attributes_id is None:
+                attributes_id = self._next_attributes_id
+                self._next_attributes_id += 1
+                self._pending_state_attributes.append(
+                    {
+                        "attributes_id": attributes_id,
+                        "hash": hashes[shared_attrs],
+                        "shared_attrs": shared_attrs,
+                    }
+                )
+            for state_row in state_rows:
+                state_row["attributes_id"] = attributes_id
+
+            attributes_ids[shared_attrs] = attributes_id
+            if len(attributes_ids) > STATE_ATTRIBUTES_CACHE_SIZE:
+                attributes_ids.popitem(last=False)
+
+        self._pending_attributes_rows = {}
+
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
@@ -593,6 +826,19 @@ class Recorder(threading.Thread):
     def _setup_run(self):
         """Log the start of the current run."""
         with session_scope(session=self.get_session()) as session:
+            # The recorder is the only writer of events and states so the
+            # ids of new rows can be assigned here before they are inserted
+            self._next_event_id = (
+                session.query(func.max(Events.event_id)).scalar() or 0
+            ) + 1
+            self._next_state_id = (
+                session.query(func.max(States.state_id)).scalar() or 0
+            ) + 1
+            self._next_attributes_id = (
+                session.query(func.max(StateAttributes.attributes_id)).scalar() or 0
+            ) + 1
+            self._advance_id_sequences(session)
+
             for run in session.query(RecorderRuns).filter_by(end=None):
                 run.closed_incorrect = True
                 run.end = self.recording_start
@@ -277,6 +277,17 @@ def _apply_update(engine, new_version, old_version):
         _drop_index(engine, "states", "ix_states_entity_id")
         _create_index(engine, "events", "ix_events_event_type_time_fired")
         _drop_index(engine, "events", "ix_events_event_type")
+    elif new_version == 10:
+        # Attributes are now stored once in the state_attributes table
+        # which is created with the other missing tables. Existing rows
+        # keep their attributes and will age out with the purge.
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 11:
+        # The statistics tables are created with the other missing tables
+        pass
+    elif new_version == 12:
+        _create_index(engine, "states", "ix_states_old_state_id")
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
@@ -1,17 +1,22 @@
 """Models for SQLAlchemy."""
+from datetime import timedelta
 import json
 import logging
+import zlib
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
     String,
     Text,
     distinct,
+    func,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -25,7 +30,7 @@ import homeassistant.util.dt as dt_util
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 9
+SCHEMA_VERSION = 12
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,9 +38,14 @@ DB_TIMEZONE = "+00:00"
 
 TABLE_EVENTS = "events"
 TABLE_STATES = "states"
+TABLE_STATE_ATTRIBUTES = "state_attributes"
 TABLE_RECORDER_RUNS = "recorder_runs"
 TABLE_SCHEMA_CHANGES = "schema_changes"
+TABLE_STATISTICS = "statistics"
+TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
 
+# Tables that exist in every schema version, newer tables are created
+# when the database is opened and may not exist yet when it is checked
 ALL_TABLES = [TABLE_EVENTS, TABLE_STATES, TABLE_RECORDER_RUNS, TABLE_SCHEMA_CHANGES]
 
 
@@ -62,15 +72,22 @@ class Events(Base):  # type: ignore
     @staticmethod
     def from_event(event):
         """Create an event database object from a native event."""
-        return Events(
-            event_type=event.event_type,
-            event_data=json.dumps(event.data, cls=JSONEncoder),
-            origin=str(event.origin),
-            time_fired=event.time_fired,
-            context_id=event.context.id,
-            context_user_id=event.context.user_id,
-            context_parent_id=event.context.parent_id,
-        )
+        return Events(**Events.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event, event_data=None):
+        """Create the column values of an event row from a native event."""
+        if event_data is None:
+            event_data = json.dumps(event.data, cls=JSONEncoder)
+        return {
+            "event_type": event.event_type,
+            "event_data": event_data,
+            "origin": str(event.origin),
+            "time_fired": event.time_fired,
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to a natve HA Event."""
@@ -102,6 +119,9 @@ class States(Base):  # type: ignore
     entity_id = Column(String(255))
     state = Column(String(255))
     attributes = Column(Text)
+    attributes_id = Column(
+        Integer, ForeignKey("state_attributes.attributes_id"), index=True
+    )
     event_id = Column(Integer, ForeignKey("events.event_id"), index=True)
     last_changed = Column(DateTime(timezone=True), default=dt_util.utcnow)
     last_updated = Column(DateTime(timezone=True), default=dt_util.utcnow, index=True)
@@ -109,44 +129,60 @@ class States(Base):  # type: ignore
     old_state_id = Column(Integer, ForeignKey("states.state_id"))
     event = relationship("Events", uselist=False)
     old_state = relationship("States", remote_side=[state_id])
+    state_attributes = relationship("StateAttributes", uselist=False, lazy="joined")
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
         # (get_states in history.py)
         Index("ix_states_entity_id_last_updated", "entity_id", "last_updated"),
+        # Used for unlinking the purged states from their next state
+        Index("ix_states_old_state_id", "old_state_id"),
     )
 
     @staticmethod
     def from_event(event):
         """Create object from a state_changed event."""
+        return States(**States.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event):
+        """Create the column values of a state row from a state_changed event."""
         entity_id = event.data["entity_id"]
         state = event.data.get("new_state")
 
-        dbstate = States(entity_id=entity_id)
-
         # State got deleted
         if state is None:
-            dbstate.state = ""
-            dbstate.domain = split_entity_id(entity_id)[0]
-            dbstate.attributes = "{}"
-            dbstate.last_changed = event.time_fired
-            dbstate.last_updated = event.time_fired
-        else:
-            dbstate.domain = state.domain
-            dbstate.state = state.state
-            dbstate.attributes = json.dumps(dict(state.attributes), cls=JSONEncoder)
-            dbstate.last_changed = state.last_changed
-            dbstate.last_updated = state.last_updated
-
-        return dbstate
+            return {
+                "entity_id": entity_id,
+                "domain": split_entity_id(entity_id)[0],
+                "state": "",
+                "attributes": "{}",
+                "last_changed": event.time_fired,
+                "last_updated": event.time_fired,
+            }
+
+        return {
+            "entity_id": entity_id,
+            "domain": state.domain,
+            "state": state.state,
+            "attributes": json.dumps(dict(state.attributes), cls=JSONEncoder),
+            "last_changed": state.last_changed,
+            "last_updated": state.last_updated,
+        }
 
     def to_native(self, validate_entity_id=True):
         """Convert to an HA state object."""
+        attributes = self.attributes
+        if attributes is None:
+            # Attributes are shared between states since schema version 10
+            attributes = (
+                self.state_attributes.shared_attrs if self.state_attributes else "{}"
+            )
         try:
             return State(
                 self.entity_id,
                 self.state,
-                json.loads(self.attributes),
+                json.loads(attributes),
                 process_timestamp(self.last_changed),
                 process_timestamp(self.last_updated),
                 # Join the events table on event_id to get the context instead
@@ -160,6 +196,58 @@ class States(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):  # type: ignore
+    """Attributes shared by the states that have the same attributes."""
+
+    __tablename__ = TABLE_STATE_ATTRIBUTES
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the hash used to look up serialized attributes."""
+        return zlib.crc32(shared_attrs.encode("utf-8"))
+
+
+# The serialized attributes of a state, shared or from before schema version 10.
+# Queries using it need an outer join on StateAttributes.
+STATE_ATTRIBUTES = func.coalesce(States.attributes, StateAttributes.shared_attrs)
+STATE_ATTRIBUTES_JOIN = States.attributes_id == StateAttributes.attributes_id
+
+
+class StatisticsBase:
+    """Rollup of the numeric states of an entity over a period."""
+
+    id = Column(Integer, primary_key=True)
+    created = Column(DateTime(timezone=True), default=dt_util.utcnow)
+    domain = Column(String(64))
+    entity_id = Column(String(255))
+    start = Column(DateTime(timezone=True), index=True)
+    mean = Column(Float)
+    min = Column(Float)
+    max = Column(Float)
+    last = Column(Float)
+
+
+class Statistics(Base, StatisticsBase):  # type: ignore
+    """Hourly rollups, kept after the states are purged."""
+
+    __tablename__ = TABLE_STATISTICS
+    __table_args__ = (Index("ix_statistics_entity_id_start", "entity_id", "start"),)
+    duration = timedelta(hours=1)
+
+
+class StatisticsShortTerm(Base, StatisticsBase):  # type: ignore
+    """5-minute rollups, purged with the states."""
+
+    __tablename__ = TABLE_STATISTICS_SHORT_TERM
+    __table_args__ = (
+        Index("ix_statistics_short_term_entity_id_start", "entity_id", "start"),
+    )
+    duration = timedelta(minutes=5)
+
+
 class RecorderRuns(Base):  # type: ignore
     """Representation of recorder run."""
 
@@ -3,84 +3,98 @@ from datetime import timedelta
 import logging
 import time
 
+from sqlalchemy import exists, text
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
-from .util import execute, session_scope
+from .models import (
+    TABLE_EVENTS,
+    TABLE_RECORDER_RUNS,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_STATES,
+    TABLE_STATISTICS_SHORT_TERM,
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    StatisticsShortTerm,
+)
+from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Stay below the default limit of bound variables of SQLite
+MAX_ROWS_TO_PURGE = 998
 
-def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
-    """Purge events and states older than purge_days ago.
+# Pages freed by each step of the incremental vacuum of SQLite
+SQLITE_VACUUM_PAGES = 1000
+SQLITE_AUTO_VACUUM_INCREMENTAL = 2
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+# Tables repacked one at a time on the engines that repack per table
+REPACK_TABLES = (
+    TABLE_STATES,
+    TABLE_EVENTS,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_STATISTICS_SHORT_TERM,
+    TABLE_RECORDER_RUNS,
+)
+
+
+def purge_old_data(instance, purge_days: int) -> bool:
+    """Purge a batch of events and states older than purge_days ago.
+
+    Deletes at most MAX_ROWS_TO_PURGE states and events at a time, based on
+    the oldest records. Returns False when there may be more to purge so it
+    can be resumed after the events that were queued meanwhile are saved.
     """
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
     _LOGGER.debug("Purging states and events before target %s", purge_before)
 
     try:
         with session_scope(session=instance.get_session()) as session:
-            # Purge a max of 1 hour, based on the oldest states or events record
-            batch_purge_before = purge_before
-
-            query = session.query(States).order_by(States.last_updated.asc()).limit(1)
-            states = execute(query, to_native=True, validate_entity_ids=False)
-            if states:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    states[0].last_updated + timedelta(hours=1),
-                )
-
-            query = session.query(Events).order_by(Events.time_fired.asc()).limit(1)
-            events = execute(query, to_native=True)
-            if events:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    events[0].time_fired + timedelta(hours=1),
-                )
-
-            _LOGGER.debug("Purging states and events before %s", batch_purge_before)
+            state_ids = _select_state_ids_to_purge(session, purge_before)
+            if state_ids:
+                _purge_state_ids(session, state_ids)
+                _forget_purged_old_states(instance, state_ids)
+
+            event_ids = _select_event_ids_to_purge(session, purge_before)
+            if event_ids:
+                _purge_event_ids(session, event_ids)
+
+            # If states or events were purged there
+            # may be more, return false as we are not done yet.
+            if state_ids or event_ids:
+                _LOGGER.debug("Purging hasn't fully completed yet")
+                return False
 
+            # Recorder runs is small, no need to batch run it
             deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < batch_purge_before)
+                session.query(RecorderRuns)
+                .filter(RecorderRuns.start < purge_before)
                 .delete(synchronize_session=False)
             )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
+            _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
+            # The hourly statistics are kept after the states are purged
             deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < batch_purge_before)
+                session.query(StatisticsShortTerm)
+                .filter(StatisticsShortTerm.start < purge_before)
                 .delete(synchronize_session=False)
             )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+            _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
 
-            # If states or events purging isn't processing the purge_before yet,
-            # return false, as we are not done yet.
-            if batch_purge_before != purge_before:
-                _LOGGER.debug("Purging hasn't fully completed yet")
-                return False
-
-            # Recorder runs is small, no need to batch run it
+            # Remove the shared attributes that no state uses anymore
             deleted_rows = (
-                session.query(RecorderRuns)
-                .filter(RecorderRuns.start < purge_before)
+                session.query(StateAttributes)
+                .filter(
+                    ~exists().where(
+                        States.attributes_id == StateAttributes.attributes_id
+                    )
+                )
                 .delete(synchronize_session=False)
             )
-            _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
-
-        if repack:
-            # Execute sqlite or postgresql vacuum command to free up space on disk
-            if instance.engine.driver in ("pysqlite", "postgresql"):
-                _LOGGER.debug("Vacuuming SQL DB to free space")
-                instance.engine.execute("VACUUM")
-            # Optimize mysql / mariadb tables to free up space on disk
-            elif instance.engine.driver in ("mysqldb", "pymysql"):
-                _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+            _LOGGER.debug("Deleted %s state_attributes", deleted_rows)
 
     except OperationalError as err:
         # Retry when one of the following MySQL errors occurred:
@@ -100,3 +114,116 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
     return True
+
+
+def _select_state_ids_to_purge(session, purge_before):
+    """Return the ids of the oldest states to purge."""
+    return [
+        state.state_id
+        for state in session.query(States.state_id)
+        .filter(States.last_updated < purge_before)
+        .order_by(States.last_updated)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+
+
+def _select_event_ids_to_purge(session, purge_before):
+    """Return the ids of the oldest events to purge."""
+    return [
+        event.event_id
+        for event in session.query(Events.event_id)
+        .filter(Events.time_fired < purge_before)
+        .order_by(Events.time_fired)
+        .limit(MAX_ROWS_TO_PURGE)
+    ]
+
+
+def _purge_state_ids(session, state_ids):
+    """Delete the states, unlinking the newer states that refer to them."""
+    session.query(States).filter(States.old_state_id.in_(state_ids)).update(
+        {States.old_state_id: None}, synchronize_session=False
+    )
+    deleted_rows = (
+        session.query(States)
+        .filter(States.state_id.in_(state_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s states", deleted_rows)
+
+
+def _forget_purged_old_states(instance, state_ids):
+    """Stop using the purged states as the old state of the next ones."""
+    purged = set(state_ids)
+    old_state_ids = instance._old_state_ids  # pylint: disable=protected-access
+    for entity_id, state_id in list(old_state_ids.items()):
+        if state_id in purged:
+            del old_state_ids[entity_id]
+
+
+def _purge_event_ids(session, event_ids):
+    """Delete the events, unlinking the states that refer to them."""
+    session.query(States).filter(States.event_id.in_(event_ids)).update(
+        {States.event_id: None}, synchronize_session=False
+    )
+    deleted_rows = (
+        session.query(Events)
+        .filter(Events.event_id.in_(event_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s events", deleted_rows)
+
+
+def repack_database(instance, tables):
+    """Free up the space left by the purge, one step at a time.
+
+    Returns the tables that still need to be repacked.
+    """
+    dialect = instance.engine.dialect.name
+    try:
+        if dialect == "sqlite":
+            # SQLite frees the pages of the whole database
+            if _sqlite_vacuum_step(instance):
+                return []
+            return tables
+
+        table, remaining = tables[0], tables[1:]
+        if dialect == "postgresql":
+            _LOGGER.debug("Vacuuming table %s to free space", table)
+            with instance.engine.connect().execution_options(
+                isolation_level="AUTOCOMMIT"
+            ) as connection:
+                connection.execute(text(f"VACUUM {table}"))
+        elif dialect == "mysql":
+            _LOGGER.debug("Optimizing table %s to free space", table)
+            instance.engine.execute(text(f"OPTIMIZE TABLE {table}"))
+        else:
+            return []
+        return remaining
+
+    except (SQLAlchemyError, instance.engine.dialect.dbapi.Error) as err:
+        _LOGGER.warning("Error repacking database: %s", err)
+    return []
+
+
+def _sqlite_vacuum_step(instance) -> bool:
+    """Run a step of the incremental vacuum, return True when done."""
+    connection = instance.engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("PRAGMA auto_vacuum")
+        if cursor.fetchone()[0] != SQLITE_AUTO_VACUUM_INCREMENTAL:
+            # Switching to incremental auto vacuum needs a full vacuum once,
+            # the next repacks only free the pages that the purge released.
+            _LOGGER.debug("Vacuuming SQL DB to free space")
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            cursor.execute("VACUUM")
+            return True
+
+        _LOGGER.debug("Incrementally vacuuming SQL DB to free space")
+        # The pages are only freed while the result is fetched
+        cursor.execute(f"PRAGMA incremental_vacuum({SQLITE_VACUUM_PAGES})")
+        cursor.fetchall()
+        cursor.execute("PRAGMA freelist_count")
+        return cursor.fetchone()[0] == 0
+    finally:
+        connection.close()
@@ -0,0 +1,193 @@
+"""Rollups of numeric states kept as long-term statistics."""
+from collections import defaultdict
+from itertools import groupby
+import logging
+import math
+
+from homeassistant.core import split_entity_id
+
+from .models import States, Statistics, StatisticsShortTerm, process_timestamp
+from .util import session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTICS_DOMAINS = ("sensor",)
+
+
+def compile_statistics(instance, start, entity_ids=None):
+    """Compile the 5-minute rollups of the period beginning at start.
+
+    The last value of an entity without changes during the period is only
+    kept when the entity is in entity_ids, if given. The hourly rollups are
+    compiled as well when the period ends an hour.
+    """
+    end = start + StatisticsShortTerm.duration
+    _LOGGER.debug("Compiling statistics for %s-%s", start, end)
+
+    with session_scope(session=instance.get_session()) as session:
+        if (
+            session.query(StatisticsShortTerm.id)
+            .filter(StatisticsShortTerm.start == start)
+            .first()
+        ):
+            _LOGGER.debug("Statistics already compiled for %s", start)
+            return
+
+        # Entities that did not change during the period
+        # keep the last value of the previous period
+        previous_values = dict(
+            session.query(StatisticsShortTerm.entity_id, StatisticsShortTerm.last)
+            .filter(StatisticsShortTerm.start == start - StatisticsShortTerm.duration)
+            .filter(StatisticsShortTerm.last.isnot(None))
+        )
+
+        query = (
+            session.query(
+                States.domain, States.entity_id, States.state, States.last_updated
+            )
+            .filter(States.domain.in_(STATISTICS_DOMAINS))
+            .filter((States.last_updated >= start) & (States.last_updated < end))
+            .order_by(States.entity_id, States.last_updated)
+        )
+
+        rows = []
+        for entity_id, group in groupby(query, lambda state: state.entity_id):
+            group = list(group)
+            row = _rollup(
+                start,
+                end,
+                previous_values.pop(entity_id, None),
+                [
+                    (process_timestamp(state.last_updated), _float_or_none(state.state))
+                    for state in group
+                ],
+            )
+            if row is not None:
+                row.update(domain=group[0].domain, entity_id=entity_id, start=start)
+                rows.append(row)
+
+        for entity_id, value in previous_values.items():
+            if entity_ids is not None and entity_id not in entity_ids:
+                continue
+            rows.append(
+                {
+                    "domain": split_entity_id(entity_id)[0],
+                    "entity_id": entity_id,
+                    "start": start,
+                    "mean": value,
+                    "min": value,
+                    "max": value,
+                    "last": value,
+                }
+            )
+
+        if rows:
+            session.execute(StatisticsShortTerm.__table__.insert(), rows)
+
+        if end.minute == 0:
+            _compile_hourly_statistics(session, end - Statistics.duration)
+
+
+def _compile_hourly_statistics(session, start):
+    """Compile the hourly rollups from the 5-minute rollups of the hour."""
+    end = start + Statistics.duration
+    query = (
+        session.query(StatisticsShortTerm)
+        .filter(
+            (StatisticsShortTerm.start >= start) & (StatisticsShortTerm.start < end)
+        )
+        .order_by(StatisticsShortTerm.entity_id, StatisticsShortTerm.start)
+    )
+
+    rows = []
+    for entity_id, group in groupby(query, lambda stat: stat.entity_id):
+        group = list(group)
+        means = [stat.mean for stat in group if stat.mean is not None]
+        mins = [stat.min for stat in group if stat.min is not None]
+        maxes = [stat.max for stat in group if stat.max is not None]
+        if not means:
+            continue
+        rows.append(
+            {
+                "domain": group[0].domain,
+                "entity_id": entity_id,
+                "start": start,
+                "mean": sum(means) / len(means),
+                "min": min(mins),
+                "max": max(maxes),
+                "last": group[-1].last,
+            }
+        )
+
+    if rows:
+        session.execute(Statistics.__table__.insert(), rows)
+
+
+def _rollup(start, end, value, changes):
+    """Return the time weighted rollup of a value and its changes."""
+    weighted_sum = 0.0
+    duration = 0.0
+    minimum = maximum = value
+    time = start
+
+    for when, new_value in changes:
+        if value is not None:
+            seconds = (when - time).total_seconds()
+            weighted_sum += value * seconds
+            duration += seconds
+        if new_value is not None:
+            minimum = new_value if minimum is None else min(minimum, new_value)
+            maximum = new_value if maximum is None else max(maximum, new_value)
+        time = when
+        value = new_value
+
+    if value is not None:
+        seconds = (end - time).total_seconds()
+        weighted_sum += value * seconds
+        duration += seconds
+
+    if minimum is None:
+        return None
+
+    return {
+        "mean": weighted_sum / duration if duration else minimum,
+        "min": minimum,
+        "max": maximum,
+        "last": value,
+    }
+
+
+def _float_or_none(state):
+    """Return the numeric value of a state or None."""
+    try:
+        value = float(state)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def statistics_during_period(hass, start_time, end_time, entity_ids=None, filters=None):
+    """Return the hourly rollups during UTC period start_time - end_time."""
+    with session_scope(hass=hass) as session:
+        return statistics_during_period_with_session(
+            session, start_time, end_time, entity_ids, filters
+        )
+
+
+def statistics_during_period_with_session(
+    session, start_time, end_time, entity_ids=None, filters=None
+):
+    """Return the hourly rollups during a period using an existing session."""
+    query = session.query(Statistics).filter(
+        (Statistics.start >= start_time) & (Statistics.start < end_time)
+    )
+    if entity_ids is not None:
+        query = query.filter(Statistics.entity_id.in_(entity_ids))
+    elif filters is not None:
+        query = filters.apply(query, Statistics)
+
+    result = defaultdict(list)
+    for stat in query.order_by(Statistics.entity_id, Statistics.start):
+        session.expunge(stat)
+        result[stat.entity_id].append(stat)
+    return result
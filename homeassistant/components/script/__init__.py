@@ -24,6 +24,8 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.config_validation import make_entity_service_schema
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.reference_index import async_get_reference_index
+from homeassistant.helpers.reload import async_reload_changed_entities
 from homeassistant.helpers.script import (
     ATTR_CUR,
     ATTR_MAX,
@@ -91,16 +93,7 @@ def is_on(hass, entity_id):
 @callback
 def scripts_with_entity(hass: HomeAssistant, entity_id: str) -> List[str]:
     """Return all scripts that reference the entity."""
-    if DOMAIN not in hass.data:
-        return []
-
-    component = hass.data[DOMAIN]
-
-    return [
-        script_entity.entity_id
-        for script_entity in component.entities
-        if entity_id in script_entity.script.referenced_entities
-    ]
+    return async_get_reference_index(hass, DOMAIN).async_referencing_entity(entity_id)
 
 
 @callback
@@ -122,16 +115,7 @@ def entities_in_script(hass: HomeAssistant, entity_id: str) -> List[str]:
 @callback
 def scripts_with_device(hass: HomeAssistant, device_id: str) -> List[str]:
     """Return all scripts that reference the device."""
-    if DOMAIN not in hass.data:
-        return []
-
-    component = hass.data[DOMAIN]
-
-    return [
-        script_entity.entity_id
-        for script_entity in component.entities
-        if device_id in script_entity.script.referenced_devices
-    ]
+    return async_get_reference_index(hass, DOMAIN).async_referencing_device(device_id)
 
 
 @callback
@@ -158,7 +142,7 @@ async def async_setup(hass, config):
 
     async def reload_service(service):
         """Call a service to reload scripts."""
-        conf = await component.async_prepare_reload()
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
 
@@ -216,12 +200,14 @@ async def _async_process_config(hass, config, component):
             variables=service.data, context=service.context
         )
 
-    script_entities = [
-        ScriptEntity(hass, object_id, cfg)
-        for object_id, cfg in config.get(DOMAIN, {}).items()
-    ]
+    async def async_create_script(script_config):
+        """Create a script entity from its config."""
+        return ScriptEntity(hass, *script_config)
 
-    await component.async_add_entities(script_entities)
+    # The scripts whose config did not change keep their entity and service
+    script_entities = await async_reload_changed_entities(
+        component, config.get(DOMAIN, {}).items(), async_create_script
+    )
 
     # Register services for all entities that were created successfully.
     for script_entity in script_entities:
@@ -331,8 +317,17 @@ class ScriptEntity(ToggleEntity):
         """Turn script off."""
         await self.script.async_stop()
 
+    async def async_added_to_hass(self):
+        """Index the entities and devices referenced by the script."""
+        async_get_reference_index(self.hass, DOMAIN).async_add(
+            self.entity_id,
+            self.script.referenced_entities,
+            self.script.referenced_devices,
+        )
+
     async def async_will_remove_from_hass(self):
         """Stop script and remove service when it will be removed from Home Assistant."""
+        async_get_reference_index(self.hass, DOMAIN).async_remove(self.entity_id)
         await self.script.async_stop()
 
         # remove service
@@ -5,6 +5,7 @@ import statistics
 
 import voluptuous as vol
 
+from homeassistant.components.history.recent import async_get_recent_history
 from homeassistant.components.recorder.models import States
 from homeassistant.components.recorder.util import execute, session_scope
 from homeassistant.components.sensor import PLATFORM_SCHEMA
@@ -110,6 +111,26 @@ class StatisticsSensor(Entity):
     async def async_added_to_hass(self):
         """Register callbacks."""
 
+        @callback
+        def async_stats_sensor_startup(_):
+            """Add listener and get recorded state."""
+            _LOGGER.debug("Startup for %s", self.entity_id)
+
+            if "recorder" in self.hass.config.components:
+                # Only use the database if it's configured, the listener is
+                # added once the recorded states are in the queue
+                self.hass.async_create_task(self._async_initialize_from_database())
+            else:
+                self._async_track_source()
+
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_START, async_stats_sensor_startup
+        )
+
+    @callback
+    def _async_track_source(self):
+        """Add the states of the source to the queue as they change."""
+
         @callback
         def async_stats_sensor_state_listener(event):
             """Handle the sensor state changes."""
@@ -125,23 +146,10 @@ class StatisticsSensor(Entity):
 
             self.async_schedule_update_ha_state(True)
 
-        @callback
-        def async_stats_sensor_startup(_):
-            """Add listener and get recorded state."""
-            _LOGGER.debug("Startup for %s", self.entity_id)
-
-            self.async_on_remove(
-                async_track_state_change_event(
-                    self.hass, [self._entity_id], async_stats_sensor_state_listener
-                )
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass, [self._entity_id], async_stats_sensor_state_listener
             )
-
-            if "recorder" in self.hass.config.components:
-                # Only use the database if it's configured
-                self.hass.async_create_task(self._async_initialize_from_database())
-
-        self.hass.bus.async_listen_once(
-            EVENT_HOMEASSISTANT_START, async_stats_sensor_startup
         )
 
     def _add_state_to_queue(self, new_state):
@@ -313,7 +321,47 @@ class StatisticsSensor(Entity):
             )
 
     async def _async_initialize_from_database(self):
-        """Initialize the list of states from the database.
+        """Initialize the list of states from the recent history.
+
+        The recent history of the source is kept in memory, seeded from the
+        database once for all the sensors of the source.
+        """
+
+        _LOGGER.debug("%s: initializing values from the database", self.entity_id)
+
+        recent = async_get_recent_history(self.hass)
+        untrack = await recent.async_track(
+            self._entity_id, max_age=self._max_age, max_items=self._sampling_size
+        )
+
+        records_older_then = None
+        if self._max_age is not None:
+            records_older_then = dt_util.utcnow() - self._max_age
+
+        try:
+            states = recent.async_get_last_states(
+                self._entity_id, self._sampling_size, start_time=records_older_then
+            )
+            if states is None:
+                states = await self.hass.async_add_executor_job(
+                    self._get_states_from_database, records_older_then
+                )
+        finally:
+            untrack()
+
+        for state in states:
+            self._add_state_to_queue(state)
+
+        # Registered after the initial read so the states updated
+        # while seeding are not added to the queue twice
+        self._async_track_source()
+
+        self.async_schedule_update_ha_state(True)
+
+        _LOGGER.debug("%s: initializing from database completed", self.entity_id)
+
+    def _get_states_from_database(self, records_older_then):
+        """Return the list of states from the database.
 
         The query will get the list of states in DESCENDING order so that we
         can limit the result to self._sample_size. Afterwards reverse the
@@ -322,16 +370,12 @@ class StatisticsSensor(Entity):
         If MaxAge is provided then query will restrict to entries younger then
         current datetime - MaxAge.
         """
-
-        _LOGGER.debug("%s: initializing values from the database", self.entity_id)
-
         with session_scope(hass=self.hass) as session:
             query = session.query(States).filter(
                 States.entity_id == self._entity_id.lower()
             )
 
-            if self._max_age is not None:
-                records_older_then = dt_util.utcnow() - self._max_age
+            if records_older_then is not None:
                 _LOGGER.debug(
                     "%s: retrieve records not older then %s",
                     self.entity_id,
@@ -346,9 +390,4 @@ class StatisticsSensor(Entity):
             )
             states = execute(query, to_native=True, validate_entity_ids=False)
 
-        for state in reversed(states):
-            self._add_state_to_queue(state)
-
-        self.async_schedule_update_ha_state(True)
-
-        _LOGGER.debug("%s: initializing from database completed", self.entity_id)
+        return list(reversed(states))
@@ -2,7 +2,7 @@
 import asyncio
 from collections import deque
 import io
-from typing import Any, Callable, List
+from typing import Any, Callable, List, Optional
 
 from aiohttp import web
 import attr
@@ -34,6 +34,9 @@ class Segment:
     sequence: int = attr.ib()
     segment: io.BytesIO = attr.ib()
     duration: float = attr.ib()
+    # Sections of a fragmented mp4 located once the segment is complete
+    init: Optional[memoryview] = attr.ib(default=None)
+    m4s: Optional[memoryview] = attr.ib(default=None)
 
 
 class StreamOutput:
@@ -74,6 +77,11 @@ class StreamOutput:
         """Return Callable which takes a sequence number and returns container options."""
         return None
 
+    @property
+    def fragmented(self) -> bool:
+        """Return True if the segments are fragmented mp4s."""
+        return False
+
     @property
     def segments(self) -> List[int]:
         """Return current sequence from segments."""
@@ -1,5 +1,6 @@
 """Utilities to help convert mp4s to fmp4s."""
 import io
+from typing import Optional, Tuple
 
 
 def find_box(segment: io.BytesIO, target_type: bytes, box_start: int = 0) -> int:
@@ -38,6 +39,23 @@ def get_m4s(segment: io.BytesIO, sequence: int) -> bytes:
     return segment.read(mfra_location - moof_location)
 
 
+def get_fmp4_views(
+    segment: io.BytesIO,
+) -> Tuple[Optional[memoryview], Optional[memoryview]]:
+    """Get read-only views of the init and m4s sections of a fragmented mp4.
+
+    The views share a single copy of the segment, which can still be written
+    to or closed. Returns None for both when the mp4 is not fragmented.
+    """
+    moof_location = next(find_box(segment, b"moof"), None)
+    mfra_location = next(find_box(segment, b"mfra"), None)
+    if moof_location is None or mfra_location is None:
+        return None, None
+
+    view = memoryview(segment.getvalue())
+    return view[:moof_location], view[moof_location:mfra_location]
+
+
 def get_codec_string(segment: io.BytesIO) -> str:
     """Get RFC 6381 codec string."""
     codecs = []
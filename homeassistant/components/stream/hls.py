@@ -123,7 +123,10 @@ class HlsInitView(StreamView):
         if not segments:
             return web.HTTPNotFound()
         headers = {"Content-Type": "video/mp4"}
-        return web.Response(body=get_init(segments[0].segment), headers=headers)
+        init = segments[0].init
+        if init is None:
+            init = get_init(segments[0].segment)
+        return web.Response(body=init, headers=headers)
 
 
 class HlsSegmentView(StreamView):
@@ -140,10 +143,10 @@ class HlsSegmentView(StreamView):
         if not segment:
             return web.HTTPNotFound()
         headers = {"Content-Type": "video/iso.segment"}
-        return web.Response(
-            body=get_m4s(segment.segment, int(sequence)),
-            headers=headers,
-        )
+        m4s = segment.m4s
+        if m4s is None:
+            m4s = get_m4s(segment.segment, int(sequence))
+        return web.Response(body=m4s, headers=headers)
 
 
 @PROVIDERS.register("hls")
@@ -179,3 +182,8 @@ class HlsStreamOutput(StreamOutput):
             "avoid_negative_ts": "make_non_negative",
             "fragment_index": str(sequence),
         }
+
+    @property
+    def fragmented(self) -> bool:
+        """Return True if the segments are fragmented mp4s."""
+        return True
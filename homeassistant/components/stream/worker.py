@@ -8,6 +8,7 @@ import av
 
 from .const import MAX_TIMESTAMP_GAP, MIN_SEGMENT_DURATION, PACKETS_TO_WAIT_FOR_AUDIO
 from .core import Segment, StreamBuffer
+from .fmp4utils import get_fmp4_views
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -257,14 +258,16 @@ def _stream_worker_internal(hass, stream, quit_event):
                 # Save segment to outputs
                 for fmt, (buffer, _) in outputs.items():
                     buffer.output.close()
-                    if stream.outputs.get(fmt):
+                    stream_output = stream.outputs.get(fmt)
+                    if stream_output:
+                        views = (
+                            get_fmp4_views(buffer.segment)
+                            if stream_output.fragmented
+                            else ()
+                        )
                         hass.loop.call_soon_threadsafe(
-                            stream.outputs[fmt].put,
-                            Segment(
-                                sequence,
-                                buffer.segment,
-                                segment_duration,
-                            ),
+                            stream_output.put,
+                            Segment(sequence, buffer.segment, segment_duration, *views),
                         )
 
                 # Reinitialize
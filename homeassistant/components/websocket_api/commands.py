@@ -18,6 +18,11 @@ from homeassistant.helpers import config_validation as cv, entity
 from homeassistant.helpers.event import TrackTemplate, async_track_template_result
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.template import Template
+from homeassistant.helpers.template_profiler import (
+    async_disable_template_profiler,
+    async_enable_template_profiler,
+    async_get_template_profiler,
+)
 from homeassistant.loader import IntegrationNotFound, async_get_integration
 
 from . import const, decorators, messages
@@ -43,6 +48,7 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_template_profiler)
 
 
 def pong_message(iden):
@@ -184,7 +190,7 @@ def handle_get_states(hass, connection, msg):
             if entity_perm(state.entity_id, "read")
         ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+    connection.send_message(messages.states_result_message(msg["id"], states))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -405,3 +411,33 @@ async def handle_test_condition(hass, connection, msg):
     connection.send_result(
         msg["id"], {"result": check_condition(hass, msg.get("variables"))}
     )
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "template/profiler",
+        vol.Optional("enable"): bool,
+        vol.Optional("limit", default=20): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+@decorators.require_admin
+def handle_template_profiler(hass, connection, msg):
+    """Handle template profiler command.
+
+    Enables or disables the profiler when asked and returns the statistics
+    of the slowest templates.
+    """
+    if msg.get("enable") is True:
+        async_enable_template_profiler(hass)
+    elif msg.get("enable") is False:
+        async_disable_template_profiler(hass)
+
+    profiler = async_get_template_profiler(hass)
+    connection.send_result(
+        msg["id"],
+        {
+            "enabled": profiler is not None,
+            "templates": profiler.async_report(msg["limit"]) if profiler else [],
+        },
+    )
@@ -2,11 +2,11 @@
 
 from functools import lru_cache
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 import voluptuous as vol
 
-from homeassistant.core import Event
+from homeassistant.core import Event, State
 from homeassistant.helpers import config_validation as cv
 from homeassistant.util.json import (
     find_paths_unserializable_data,
@@ -27,6 +27,12 @@ MINIMAL_MESSAGE_SCHEMA = vol.Schema(
 # Base schema to extend by message handlers
 BASE_COMMAND_MESSAGE_SCHEMA = vol.Schema({vol.Required("id"): cv.positive_int})
 
+# Placeholders of the parts spliced into serialized messages
+IDEN_TEMPLATE = "__IDEN__"
+IDEN_JSON_TEMPLATE = '"__IDEN__"'
+RESULT_TEMPLATE = "__RESULT__"
+RESULT_JSON_TEMPLATE = '"__RESULT__"'
+
 
 def result_message(iden: int, result: Any = None) -> Dict:
     """Return a success result message."""
@@ -48,17 +54,43 @@ def event_message(iden: int, event: Any) -> Dict:
     return {"id": iden, "type": "event", "event": event}
 
 
-@lru_cache(maxsize=128)
 def cached_event_message(iden: int, event: Event) -> str:
     """Return an event message.
 
-    Serialize to json once per message.
+    Serialize to json once per event.
 
     Since we can have many clients connected that are
     all getting many of the same events (mostly state changed)
-    we can avoid serializing the same data for each connection.
+    we can avoid serializing the same data for each connection,
+    whatever the id of their subscription.
+    """
+    return _cached_event_message(event).replace(IDEN_JSON_TEMPLATE, str(iden), 1)
+
+
+@lru_cache(maxsize=128)
+def _cached_event_message(event: Event) -> str:
+    """Return an event message with a placeholder for the id.
+
+    The id is the first key of the message, so the placeholder
+    is replaced before any data of the event.
     """
-    return message_to_json(event_message(iden, event))
+    return message_to_json(event_message(IDEN_TEMPLATE, event))  # type: ignore
+
+
+def states_result_message(iden: int, states: List[State]) -> str:
+    """Return a result message with a list of states.
+
+    Reuses the json that is cached on each state.
+    """
+    try:
+        states_json = f"[{', '.join(state.as_json() for state in states)}]"
+    except (ValueError, TypeError):
+        # Log the bad data and return an error message
+        return message_to_json(result_message(iden, states))
+
+    return message_to_json(result_message(iden, RESULT_TEMPLATE)).replace(
+        RESULT_JSON_TEMPLATE, states_json, 1
+    )
 
 
 def message_to_json(message: Any) -> str:
@@ -1,7 +1,9 @@
 """Entity to track connections to websocket API."""
 
+from homeassistant.const import TIME_MILLISECONDS
 from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.template_profiler import async_get_template_profiler
 
 from .const import (
     DATA_CONNECTIONS,
@@ -14,9 +16,7 @@ from .const import (
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the API streams platform."""
-    entity = APICount()
-
-    async_add_entities([entity])
+    async_add_entities([APICount(), TemplateRenderTime()])
 
 
 class APICount(Entity):
@@ -58,3 +58,50 @@ class APICount(Entity):
     def _update_count(self):
         self.count = self.hass.data.get(DATA_CONNECTIONS, 0)
         self.async_write_ha_state()
+
+
+class TemplateRenderTime(Entity):
+    """Entity to represent the time spent rendering the profiled templates."""
+
+    def __init__(self):
+        """Initialize the template render time."""
+        self.render_time = None
+        self.slowest_templates = []
+        self._last_total_time = 0.0
+
+    @property
+    def name(self):
+        """Return name of entity."""
+        return "Template render time"
+
+    @property
+    def state(self):
+        """Return the render time since the last update."""
+        return self.render_time
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return TIME_MILLISECONDS
+
+    @property
+    def device_state_attributes(self):
+        """Return the slowest templates."""
+        return {"slowest_templates": self.slowest_templates}
+
+    async def async_update(self):
+        """Update the render time from the template profiler."""
+        profiler = async_get_template_profiler(self.hass)
+        if profiler is None:
+            self.render_time = None
+            self.slowest_templates = []
+            self._last_total_time = 0.0
+            return
+
+        total_time = sum(stats.total_time for stats in profiler.stats.values()) * 1000
+        self.render_time = round(max(total_time - self._last_total_time, 0.0), 3)
+        self._last_total_time = total_time
+        self.slowest_templates = [
+            {key: stats[key] for key in ("template", "total_time", "p95_time")}
+            for stats in profiler.async_report(5)
+        ]
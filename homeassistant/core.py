@@ -9,6 +9,7 @@ import datetime
 import enum
 import functools
 from ipaddress import ip_address
+import json
 import logging
 import os
 import pathlib
@@ -28,6 +29,7 @@ from typing import (
     Mapping,
     Optional,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -69,6 +71,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import location, network
 from homeassistant.util.async_ import fire_coroutine_threadsafe, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
@@ -148,6 +151,51 @@ def is_callback(func: Callable[..., Any]) -> bool:
     return getattr(func, "_hass_callback", False) is True
 
 
+class HassJobType(enum.Enum):
+    """Represent a job type."""
+
+    Coroutinefunction = 1
+    Callback = 2
+    Executor = 3
+
+
+class HassJob:
+    """Represent a job to be run later.
+
+    We check the callable type in advance
+    so we can avoid checking it every time
+    we run the job.
+    """
+
+    __slots__ = ("job_type", "target")
+
+    def __init__(self, target: Callable):
+        """Create a job object."""
+        if asyncio.iscoroutine(target):
+            raise ValueError("Coroutine not allowed to be passed to HassJob")
+
+        self.target = target
+        self.job_type = _get_callable_job_type(target)
+
+    def __repr__(self) -> str:
+        """Return the job."""
+        return f"<Job {self.job_type} {self.target}>"
+
+
+def _get_callable_job_type(target: Callable) -> HassJobType:
+    """Determine the job type from the callable."""
+    # Check for partials to properly determine if coroutine function
+    check_target = target
+    while isinstance(check_target, functools.partial):
+        check_target = check_target.func
+
+    if asyncio.iscoroutinefunction(check_target):
+        return HassJobType.Coroutinefunction
+    if is_callback(check_target):
+        return HassJobType.Callback
+    return HassJobType.Executor
+
+
 class CoreState(enum.Enum):
     """Represent the current state of Home Assistant."""
 
@@ -327,6 +375,33 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_add_hass_job(
+        self, hassjob: HassJob, *args: Any
+    ) -> Optional[asyncio.Future]:
+        """Add a HassJob from within the event loop.
+
+        This method must be run in the event loop.
+        hassjob: HassJob to call.
+        args: parameters for method to call.
+        """
+        task: Optional[asyncio.Future] = None
+
+        if hassjob.job_type == HassJobType.Coroutinefunction:
+            task = self.loop.create_task(hassjob.target(*args))
+        elif hassjob.job_type == HassJobType.Callback:
+            self.loop.call_soon(hassjob.target, *args)
+        else:
+            task = self.loop.run_in_executor(  # type: ignore
+                None, hassjob.target, *args
+            )
+
+        # If a task is scheduled
+        if self._track_task and task is not None:
+            self._pending_tasks.append(task)
+
+        return task
+
     @callback
     def async_create_task(self, target: Coroutine) -> asyncio.tasks.Task:
         """Create a task from within the eventloop.
@@ -385,6 +460,20 @@ class HomeAssistant:
         else:
             self.async_add_job(target, *args)
 
+    @callback
+    def async_run_hass_job(self, hassjob: HassJob, *args: Any) -> None:
+        """Run a HassJob from within the event loop.
+
+        This method must be run in the event loop.
+
+        hassjob: HassJob
+        args: parameters for method to call.
+        """
+        if hassjob.job_type == HassJobType.Callback:
+            hassjob.target(*args)
+        else:
+            self.async_add_hass_job(hassjob, *args)
+
     def block_till_done(self) -> None:
         """Block until all pending work is done."""
         asyncio.run_coroutine_threadsafe(
@@ -591,7 +680,13 @@ class EventBus:
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
-        self._listeners: Dict[str, List[Callable]] = {}
+        self._listeners: Dict[str, List[HassJob]] = {}
+        # Pre-merged MATCH_ALL + event type listeners, rebuilt lazily
+        # after a listener for the event type (or MATCH_ALL) changes
+        self._dispatch: Dict[str, Tuple[HassJob, ...]] = {}
+        # State changed listeners indexed by entity_id and by domain
+        self._entity_listeners: Dict[str, List[HassJob]] = {}
+        self._domain_listeners: Dict[str, List[HassJob]] = {}
         self._hass = hass
 
     @callback
@@ -600,7 +695,33 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(self._listeners[key]) for key in self._listeners}
+        listeners = {key: len(self._listeners[key]) for key in self._listeners}
+
+        # A listener indexed by several entity ids or domains counts once
+        indexed = {
+            id(job)
+            for index in (self._entity_listeners, self._domain_listeners)
+            for jobs in index.values()
+            for job in jobs
+        }
+        if indexed:
+            listeners[EVENT_STATE_CHANGED] = listeners.get(
+                EVENT_STATE_CHANGED, 0
+            ) + len(indexed)
+
+        return listeners
+
+    @callback
+    def async_has_listeners(self, event_type: str) -> bool:
+        """Return if something listens for an event type explicitly.
+
+        This method must be run in the event loop.
+        """
+        if event_type in self._listeners:
+            return True
+        return event_type == EVENT_STATE_CHANGED and bool(
+            self._entity_listeners or self._domain_listeners
+        )
 
     @property
     def listeners(self) -> Dict[str, int]:
@@ -629,6 +750,66 @@ class EventBus:
     ) -> None:
         """Fire an event.
 
+        Listeners decorated with @callback are run inline, all other
+        listeners are scheduled.
+
+        This method must be run in the event loop.
+        """
+        dispatch = self._dispatch.get(event_type)
+        if dispatch is None:
+            dispatch = self._async_build_dispatch(event_type)
+
+        event = Event(event_type, event_data, origin, None, context)
+
+        if event_type != EVENT_TIME_CHANGED:
+            _LOGGER.debug("Bus:Handling %s", event)
+
+        for job in dispatch:
+            if job.job_type == HassJobType.Callback:
+                try:
+                    job.target(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error running job: %s", job)
+            else:
+                self._hass.async_add_hass_job(job, event)
+
+        if event_type == EVENT_STATE_CHANGED and (
+            self._entity_listeners or self._domain_listeners
+        ):
+            self._async_dispatch_state_changed(event)
+
+    @callback
+    def _async_dispatch_state_changed(self, event: Event) -> None:
+        """Dispatch a state changed event to the entity and domain listeners.
+
+        This method must be run in the event loop.
+        """
+        entity_id = event.data.get("entity_id")
+        if not isinstance(entity_id, str):
+            return
+
+        jobs: List[HassJob] = []
+        if entity_id in self._entity_listeners:
+            jobs.extend(self._entity_listeners[entity_id])
+        if self._domain_listeners:
+            domain = split_entity_id(entity_id)[0]
+            if domain in self._domain_listeners:
+                jobs.extend(self._domain_listeners[domain])
+            if MATCH_ALL in self._domain_listeners:
+                jobs.extend(self._domain_listeners[MATCH_ALL])
+
+        for job in jobs:
+            try:
+                self._hass.async_run_hass_job(job, event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while processing state changed for %s", entity_id
+                )
+
+    @callback
+    def _async_build_dispatch(self, event_type: str) -> Tuple[HassJob, ...]:
+        """Build and cache the listeners to dispatch an event type to.
+
         This method must be run in the event loop.
         """
         listeners = self._listeners.get(event_type, [])
@@ -638,16 +819,19 @@ class EventBus:
         if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
             listeners = match_all_listeners + listeners
 
-        event = Event(event_type, event_data, origin, None, context)
-
-        if event_type != EVENT_TIME_CHANGED:
-            _LOGGER.debug("Bus:Handling %s", event)
+        dispatch = self._dispatch[event_type] = tuple(listeners)
+        return dispatch
 
-        if not listeners:
-            return
+    @callback
+    def _async_invalidate_dispatch(self, event_type: str) -> None:
+        """Drop cached dispatch tuples affected by a listener change.
 
-        for func in listeners:
-            self._hass.async_add_job(func, event)
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            self._dispatch.clear()
+        else:
+            self._dispatch.pop(event_type, None)
 
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
@@ -674,14 +858,77 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        if event_type in self._listeners:
-            self._listeners[event_type].append(listener)
-        else:
-            self._listeners[event_type] = [listener]
+        return self._async_listen_job(event_type, HassJob(listener))
+
+    @callback
+    def _async_listen_job(self, event_type: str, hassjob: HassJob) -> CALLBACK_TYPE:
+        """Listen for events of a specific type with a HassJob.
+
+        This method must be run in the event loop.
+        """
+        self._listeners.setdefault(event_type, []).append(hassjob)
+        self._async_invalidate_dispatch(event_type)
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_listener(event_type, hassjob)
+
+        return remove_listener
+
+    @callback
+    def async_listen_entity_state_changed(
+        self, entity_ids: Iterable[str], listener: Callable[[Event], Any]
+    ) -> CALLBACK_TYPE:
+        """Listen for state changed events of specific entity ids.
+
+        Listeners are looked up by the entity_id of the event, so firing a
+        state change only costs the listeners interested in that entity.
+
+        This method must be run in the event loop.
+        """
+        return self._async_listen_indexed(
+            self._entity_listeners, entity_ids, HassJob(listener)
+        )
 
+    @callback
+    def async_listen_domain_state_changed(
+        self, domains: Iterable[str], listener: Callable[[Event], Any]
+    ) -> CALLBACK_TYPE:
+        """Listen for state changed events of entities in specific domains.
+
+        To listen to state changes of all domains specify the constant
+        ``MATCH_ALL`` as domain.
+
+        This method must be run in the event loop.
+        """
+        return self._async_listen_indexed(
+            self._domain_listeners, domains, HassJob(listener)
+        )
+
+    @callback
+    def _async_listen_indexed(
+        self, index: Dict[str, List[HassJob]], keys: Iterable[str], hassjob: HassJob
+    ) -> CALLBACK_TYPE:
+        """Add a HassJob to an index of state changed listeners.
+
+        This method must be run in the event loop.
+        """
+        keys = [key.lower() for key in keys]
+
+        for key in keys:
+            index.setdefault(key, []).append(hassjob)
+
+        @callback
         def remove_listener() -> None:
             """Remove the listener."""
-            self._async_remove_listener(event_type, listener)
+            for key in keys:
+                try:
+                    index[key].remove(hassjob)
+
+                    if not index[key]:
+                        del index[key]
+                except (KeyError, ValueError):
+                    _LOGGER.warning("Unable to remove unknown job listener %s", hassjob)
 
         return remove_listener
 
@@ -714,6 +961,8 @@ class EventBus:
 
         This method must be run in the event loop.
         """
+        job: Optional[HassJob] = None
+        listener_job = HassJob(listener)
 
         @callback
         def onetime_listener(event: Event) -> None:
@@ -726,19 +975,21 @@ class EventBus:
             # multiple times as well.
             # This will make sure the second time it does nothing.
             setattr(onetime_listener, "run", True)
-            self._async_remove_listener(event_type, onetime_listener)
-            self._hass.async_run_job(listener, event)
+            assert job is not None
+            self._async_remove_listener(event_type, job)
+            self._hass.async_run_hass_job(listener_job, event)
 
-        return self.async_listen(event_type, onetime_listener)
+        job = HassJob(onetime_listener)
+        return self._async_listen_job(event_type, job)
 
     @callback
-    def _async_remove_listener(self, event_type: str, listener: Callable) -> None:
+    def _async_remove_listener(self, event_type: str, hassjob: HassJob) -> None:
         """Remove a listener of a specific event_type.
 
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(listener)
+            self._listeners[event_type].remove(hassjob)
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
@@ -746,7 +997,9 @@ class EventBus:
         except (KeyError, ValueError):
             # KeyError is key event_type listener did not exist
             # ValueError if listener did not exist within event_type
-            _LOGGER.warning("Unable to remove unknown listener %s", listener)
+            _LOGGER.warning("Unable to remove unknown job listener %s", hassjob)
+        else:
+            self._async_invalidate_dispatch(event_type)
 
 
 class State:
@@ -771,6 +1024,7 @@ class State:
         "context",
         "domain",
         "object_id",
+        "_as_json",
     ]
 
     def __init__(
@@ -805,6 +1059,7 @@ class State:
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
+        self._as_json: Optional[str] = None
 
     @property
     def name(self) -> str:
@@ -830,6 +1085,18 @@ class State:
             "context": self.context.as_dict(),
         }
 
+    def as_json(self) -> str:
+        """Return the JSON representation of the State.
+
+        Async friendly.
+
+        The JSON is serialized once and shared by everything that sends
+        the state, states are not changed once they are created.
+        """
+        if self._as_json is None:
+            self._as_json = json.dumps(self.as_dict(), cls=JSONEncoder, allow_nan=False)
+        return self._as_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -1643,7 +1910,12 @@ def _async_create_timer(hass: HomeAssistant) -> None:
         """Fire next time event."""
         now = dt_util.utcnow()
 
-        hass.bus.async_fire(EVENT_TIME_CHANGED, {ATTR_NOW: now}, context=timer_context)
+        # Time based helpers schedule their own timers, only fire the
+        # event if something explicitly listens for it.
+        if hass.bus.async_has_listeners(EVENT_TIME_CHANGED):
+            hass.bus.async_fire(
+                EVENT_TIME_CHANGED, {ATTR_NOW: now}, context=timer_context
+            )
 
         # If we are more than a second late, a tick was missed
         late = monotonic() - target
@@ -32,6 +32,8 @@ CONNECTION_NETWORK_MAC = "mac"
 CONNECTION_UPNP = "upnp"
 CONNECTION_ZIGBEE = "zigbee"
 
+IDX_AREA = "area_id"
+IDX_CONFIG_ENTRY = "config_entry"
 IDX_CONNECTIONS = "connections"
 IDX_IDENTIFIERS = "identifiers"
 REGISTERED_DEVICE = "registered"
@@ -103,7 +105,7 @@ class DeviceRegistry:
 
     devices: Dict[str, DeviceEntry]
     deleted_devices: Dict[str, DeletedDeviceEntry]
-    _devices_index: Dict[str, Dict[str, Dict[str, str]]]
+    _devices_index: Dict[str, Dict[str, Dict[Any, Any]]]
 
     def __init__(self, hass: HomeAssistantType) -> None:
         """Initialize the device registry."""
@@ -176,19 +178,32 @@ class DeviceRegistry:
 
         _remove_device_from_index(devices_index, device)
 
-    def _update_device(self, old_device: DeviceEntry, new_device: DeviceEntry) -> None:
+    def _update_device(
+        self,
+        old_device: Union[DeviceEntry, DeletedDeviceEntry],
+        new_device: Union[DeviceEntry, DeletedDeviceEntry],
+    ) -> None:
         """Update a device and the index."""
-        self.devices[new_device.id] = new_device
+        if isinstance(new_device, DeletedDeviceEntry):
+            devices_index = self._devices_index[DELETED_DEVICE]
+            self.deleted_devices[new_device.id] = new_device
+        else:
+            devices_index = self._devices_index[REGISTERED_DEVICE]
+            self.devices[new_device.id] = new_device
 
-        devices_index = self._devices_index[REGISTERED_DEVICE]
         _remove_device_from_index(devices_index, old_device)
         _add_device_to_index(devices_index, new_device)
 
     def _clear_index(self):
         """Clear the index."""
         self._devices_index = {
-            REGISTERED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
-            DELETED_DEVICE: {IDX_IDENTIFIERS: {}, IDX_CONNECTIONS: {}},
+            index: {
+                IDX_IDENTIFIERS: {},
+                IDX_CONNECTIONS: {},
+                IDX_CONFIG_ENTRY: {},
+                IDX_AREA: {},
+            }
+            for index in (REGISTERED_DEVICE, DELETED_DEVICE)
         }
 
     def _rebuild_index(self):
@@ -494,30 +509,37 @@ class DeviceRegistry:
     @callback
     def async_clear_config_entry(self, config_entry_id: str) -> None:
         """Clear config entry from registry entries."""
-        for device in list(self.devices.values()):
-            self._async_update_device(device.id, remove_config_entry_id=config_entry_id)
-        for deleted_device in list(self.deleted_devices.values()):
+        for device_id in list(
+            self._devices_index[REGISTERED_DEVICE][IDX_CONFIG_ENTRY].get(
+                config_entry_id, ()
+            )
+        ):
+            self._async_update_device(device_id, remove_config_entry_id=config_entry_id)
+        for device_id in list(
+            self._devices_index[DELETED_DEVICE][IDX_CONFIG_ENTRY].get(
+                config_entry_id, ()
+            )
+        ):
+            deleted_device = self.deleted_devices[device_id]
             config_entries = deleted_device.config_entries
-            if config_entry_id not in config_entries:
-                continue
             if config_entries == {config_entry_id}:
                 # Permanently remove the device from the device registry.
                 self._remove_device(deleted_device)
             else:
                 config_entries = config_entries - {config_entry_id}
-                # No need to reindex here since we currently
-                # do not have a lookup by config entry
-                self.deleted_devices[deleted_device.id] = attr.evolve(
-                    deleted_device, config_entries=config_entries
+                self._update_device(
+                    deleted_device,
+                    attr.evolve(deleted_device, config_entries=config_entries),
                 )
             self.async_schedule_save()
 
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self._async_update_device(dev_id, area_id=None)
+        for dev_id in list(
+            self._devices_index[REGISTERED_DEVICE][IDX_AREA].get(area_id, ())
+        ):
+            self._async_update_device(dev_id, area_id=None)
 
 
 @singleton(DATA_REGISTRY)
@@ -531,7 +553,13 @@ async def async_get_registry(hass: HomeAssistantType) -> DeviceRegistry:
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> List[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    # pylint: disable=protected-access
+    return [
+        registry.devices[device_id]
+        for device_id in registry._devices_index[REGISTERED_DEVICE][IDX_AREA].get(
+            area_id, ()
+        )
+    ]
 
 
 @callback
@@ -539,10 +567,12 @@ def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> List[DeviceEntry]:
     """Return entries that match a config entry."""
+    # pylint: disable=protected-access
     return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
+        registry.devices[device_id]
+        for device_id in registry._devices_index[REGISTERED_DEVICE][
+            IDX_CONFIG_ENTRY
+        ].get(config_entry_id, ())
     ]
 
 
@@ -636,6 +666,12 @@ def _add_device_to_index(
         devices_index[IDX_IDENTIFIERS][identifier] = device.id
     for connection in device.connections:
         devices_index[IDX_CONNECTIONS][connection] = device.id
+    for config_entry_id in device.config_entries:
+        devices_index[IDX_CONFIG_ENTRY].setdefault(config_entry_id, {})[
+            device.id
+        ] = None
+    if isinstance(device, DeviceEntry) and device.area_id is not None:
+        devices_index[IDX_AREA].setdefault(device.area_id, {})[device.id] = None
 
 
 def _remove_device_from_index(
@@ -648,3 +684,19 @@ def _remove_device_from_index(
     for connection in device.connections:
         if connection in devices_index[IDX_CONNECTIONS]:
             del devices_index[IDX_CONNECTIONS][connection]
+    for config_entry_id in device.config_entries:
+        _remove_device_from_group(
+            devices_index[IDX_CONFIG_ENTRY], config_entry_id, device.id
+        )
+    if isinstance(device, DeviceEntry) and device.area_id is not None:
+        _remove_device_from_group(devices_index[IDX_AREA], device.area_id, device.id)
+
+
+def _remove_device_from_group(group_index: dict, key: str, device_id: str) -> None:
+    """Remove a device from the devices indexed by a config entry or an area."""
+    device_ids = group_index.get(key)
+    if device_ids is None:
+        return
+    device_ids.pop(device_id, None)
+    if not device_ids:
+        del group_index[key]
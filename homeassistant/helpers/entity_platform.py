@@ -3,6 +3,7 @@ import asyncio
 from contextvars import ContextVar
 from datetime import datetime, timedelta
 from logging import Logger
+import random
 from types import ModuleType
 from typing import TYPE_CHECKING, Callable, Coroutine, Dict, Iterable, List, Optional
 
@@ -321,10 +322,44 @@ class EntityPlatform:
         ):
             return
 
-        self._async_unsub_polling = async_track_time_interval(
+        self._async_start_polling()
+
+    @callback
+    def _async_start_polling(self) -> None:
+        """Start polling the entities of the platform.
+
+        The platforms that update their entities in bulk start polling after
+        a random delay, so their updates do not all hit the executor at once.
+        """
+        if not self._has_bulk_update:
+            self._async_unsub_polling = async_track_time_interval(
+                self.hass,
+                self._update_entity_states,
+                self.scan_interval,
+            )
+            return
+
+        @callback
+        def async_first_poll(now: datetime) -> None:
+            """Poll the entities and keep polling them every scan interval."""
+            self._async_unsub_polling = async_track_time_interval(
+                self.hass,
+                self._update_entity_states,
+                self.scan_interval,
+            )
+            self.hass.async_create_task(self._update_entity_states(now))
+
+        self._async_unsub_polling = async_call_later(
             self.hass,
-            self._update_entity_states,
-            self.scan_interval,
+            random.uniform(0, self.scan_interval.total_seconds()),
+            async_first_poll,
+        )
+
+    @property
+    def _has_bulk_update(self) -> bool:
+        """Return if the platform updates all its polling entities at once."""
+        return hasattr(self.platform, "async_update_entities") or hasattr(
+            self.platform, "update_entities"
         )
 
     async def _async_add_entity(
@@ -582,6 +617,10 @@ class EntityPlatform:
             return
 
         async with self._process_updates:
+            if self._has_bulk_update:
+                await self._async_bulk_update_entity_states()
+                return
+
             tasks = []
             for entity in self.entities.values():
                 if not entity.should_poll:
@@ -591,6 +630,41 @@ class EntityPlatform:
             if tasks:
                 await asyncio.gather(*tasks)
 
+    async def _async_bulk_update_entity_states(self) -> None:
+        """Update all the polling entities with one call to the platform.
+
+        The platform defines async_update_entities(hass, entities) or
+        update_entities(hass, entities), which refreshes the data of the
+        entities without writing their states.
+
+        This method must be run in the event loop.
+        """
+        entities = [entity for entity in self.entities.values() if entity.should_poll]
+        if not entities:
+            return
+
+        try:
+            if hasattr(self.platform, "async_update_entities"):
+                await self.platform.async_update_entities(  # type: ignore
+                    self.hass, entities
+                )
+            else:
+                await self.hass.async_add_executor_job(
+                    self.platform.update_entities,  # type: ignore
+                    self.hass,
+                    entities,
+                )
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception(
+                "Update for %s %s fails", self.platform_name, self.domain
+            )
+            return
+
+        for entity in entities:
+            # Skip the entities removed while they were updated
+            if self.entities.get(entity.entity_id) is entity:
+                entity.async_write_ha_state()
+
 
 current_platform: ContextVar[Optional[EntityPlatform]] = ContextVar(
     "current_platform", default=None
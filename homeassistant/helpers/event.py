@@ -34,6 +34,7 @@ from homeassistant.const import (
 from homeassistant.core import (
     CALLBACK_TYPE,
     Event,
+    HassJob,
     HomeAssistant,
     State,
     callback,
@@ -44,23 +45,23 @@ from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.ratelimit import KeyedRateLimit
 from homeassistant.helpers.sun import get_astral_event_next
 from homeassistant.helpers.template import RenderInfo, Template, result_as_boolean
+from homeassistant.helpers.template_profiler import (
+    TRIGGER_ALL_STATES,
+    TRIGGER_DOMAIN,
+    TRIGGER_ENTITY,
+    TRIGGER_REFRESH,
+    async_get_template_profiler,
+)
 from homeassistant.helpers.typing import TemplateVarsType
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
-TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
-TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
-
-TRACK_STATE_ADDED_DOMAIN_CALLBACKS = "track_state_added_domain_callbacks"
-TRACK_STATE_ADDED_DOMAIN_LISTENER = "track_state_added_domain_listener"
-
-TRACK_STATE_REMOVED_DOMAIN_CALLBACKS = "track_state_removed_domain_callbacks"
-TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
-
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_TIME_PATTERN_SCHEDULE = "track_time_pattern_schedule"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -229,52 +230,13 @@ def async_track_state_change_event(
 
     In order to avoid having to iterate a long list
     of EVENT_STATE_CHANGED and fire and create a job
-    for each one, we keep a dict of entity ids that
-    care about the state change events so we can
+    for each one, the event bus keeps a dict of entity ids that
+    care about the state change events so it can
     do a fast dict lookup to route events.
     """
-
-    entity_callbacks = hass.data.setdefault(TRACK_STATE_CHANGE_CALLBACKS, {})
-
-    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            entity_id = event.data.get("entity_id")
-
-            if entity_id not in entity_callbacks:
-                return
-
-            for action in entity_callbacks[entity_id][:]:
-                try:
-                    hass.async_run_job(action, event)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception(
-                        "Error while processing state changed for %s", entity_id
-                    )
-
-        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED, _async_state_change_dispatcher
-        )
-
-    entity_ids = _async_string_to_lower_list(entity_ids)
-
-    for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(action)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_CHANGE_CALLBACKS,
-            TRACK_STATE_CHANGE_LISTENER,
-            entity_ids,
-            action,
-        )
-
-    return remove_listener
+    return hass.bus.async_listen_entity_state_changed(
+        _async_string_to_lower_list(entity_ids), action
+    )
 
 
 @callback
@@ -354,26 +316,6 @@ def async_track_entity_registry_updated_event(
     return remove_listener
 
 
-@callback
-def _async_dispatch_domain_event(
-    hass: HomeAssistant, event: Event, callbacks: Dict[str, List]
-) -> None:
-    domain = split_entity_id(event.data["entity_id"])[0]
-
-    if domain not in callbacks and MATCH_ALL not in callbacks:
-        return
-
-    listeners = callbacks.get(domain, []) + callbacks.get(MATCH_ALL, [])
-
-    for action in listeners:
-        try:
-            hass.async_run_job(action, event)
-        except Exception:  # pylint: disable=broad-except
-            _LOGGER.exception(
-                "Error while processing event %s for domain %s", event, domain
-            )
-
-
 @bind_hass
 def async_track_state_added_domain(
     hass: HomeAssistant,
@@ -381,40 +323,19 @@ def async_track_state_added_domain(
     action: Callable[[Event], Any],
 ) -> Callable[[], None]:
     """Track state change events when an entity is added to domains."""
-
-    domain_callbacks = hass.data.setdefault(TRACK_STATE_ADDED_DOMAIN_CALLBACKS, {})
-
-    if TRACK_STATE_ADDED_DOMAIN_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            if event.data.get("old_state") is not None:
-                return
-
-            _async_dispatch_domain_event(hass, event, domain_callbacks)
-
-        hass.data[TRACK_STATE_ADDED_DOMAIN_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED, _async_state_change_dispatcher
-        )
-
-    domains = _async_string_to_lower_list(domains)
-
-    for domain in domains:
-        domain_callbacks.setdefault(domain, []).append(action)
+    job = HassJob(action)
 
     @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_ADDED_DOMAIN_CALLBACKS,
-            TRACK_STATE_ADDED_DOMAIN_LISTENER,
-            domains,
-            action,
-        )
+    def _async_state_added(event: Event) -> None:
+        """Run the action if the entity was added."""
+        if event.data.get("old_state") is not None:
+            return
 
-    return remove_listener
+        hass.async_run_hass_job(job, event)
+
+    return hass.bus.async_listen_domain_state_changed(
+        _async_string_to_lower_list(domains), _async_state_added
+    )
 
 
 @bind_hass
@@ -424,40 +345,19 @@ def async_track_state_removed_domain(
     action: Callable[[Event], Any],
 ) -> Callable[[], None]:
     """Track state change events when an entity is removed from domains."""
-
-    domain_callbacks = hass.data.setdefault(TRACK_STATE_REMOVED_DOMAIN_CALLBACKS, {})
-
-    if TRACK_STATE_REMOVED_DOMAIN_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            if event.data.get("new_state") is not None:
-                return
-
-            _async_dispatch_domain_event(hass, event, domain_callbacks)
-
-        hass.data[TRACK_STATE_REMOVED_DOMAIN_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED, _async_state_change_dispatcher
-        )
-
-    domains = _async_string_to_lower_list(domains)
-
-    for domain in domains:
-        domain_callbacks.setdefault(domain, []).append(action)
+    job = HassJob(action)
 
     @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_REMOVED_DOMAIN_CALLBACKS,
-            TRACK_STATE_REMOVED_DOMAIN_LISTENER,
-            domains,
-            action,
-        )
+    def _async_state_removed(event: Event) -> None:
+        """Run the action if the entity was removed."""
+        if event.data.get("new_state") is not None:
+            return
 
-    return remove_listener
+        hass.async_run_hass_job(job, event)
+
+    return hass.bus.async_listen_domain_state_changed(
+        _async_string_to_lower_list(domains), _async_state_removed
+    )
 
 
 @callback
@@ -815,6 +715,12 @@ class _TrackTemplateResultInfo:
                 event,
             )
 
+        profiler = async_get_template_profiler(self.hass)
+        if profiler is not None:
+            profiler.async_record_trigger(
+                template.template, _rerender_trigger(event, self._info[template])
+            )
+
         self._rate_limit.async_triggered(template, now)
         self._info[template] = template.async_render_to_info(track_template_.variables)
 
@@ -1224,7 +1130,7 @@ def async_track_utc_time_change(
 
     # Make sure rolling back the clock doesn't prevent the timer from
     # triggering.
-    cancel_callback: Optional[asyncio.TimerHandle] = None
+    cancel_callback: Optional[CALLBACK_TYPE] = None
     calculate_next(next_time)
 
     @callback
@@ -1237,41 +1143,12 @@ def async_track_utc_time_change(
 
         calculate_next(now + timedelta(seconds=1))
 
-        cancel_callback = hass.loop.call_at(
-            -time.time()
-            + hass.loop.time()
-            + next_time.timestamp()
-            + MAX_TIME_TRACKING_ERROR,
-            pattern_time_change_listener,
+        cancel_callback = _async_track_utc_second(
+            hass, next_time, pattern_time_change_listener
         )
 
-    # We always get time.time() first to avoid time.time()
-    # ticking forward after fetching hass.loop.time()
-    # and callback being scheduled a few microseconds early.
-    #
-    # Since we loose additional time calling `hass.loop.time()`
-    # we add MAX_TIME_TRACKING_ERROR to ensure
-    # we always schedule the call within the time window between
-    # second and the next second.
-    #
-    # For example:
-    # If the clock ticks forward 30 microseconds when fectching
-    # `hass.loop.time()` and we want the event to fire at exactly
-    # 03:00:00.000000, the event would actually fire around
-    # 02:59:59.999970. To ensure we always fire sometime between
-    # 03:00:00.000000 and 03:00:00.999999 we add
-    # MAX_TIME_TRACKING_ERROR to make up for the time
-    # lost fetching the time. This ensures we do not fire the
-    # event before the next time pattern match which would result
-    # in the event being fired again since we would otherwise
-    # potentially fire early.
-    #
-    cancel_callback = hass.loop.call_at(
-        -time.time()
-        + hass.loop.time()
-        + next_time.timestamp()
-        + MAX_TIME_TRACKING_ERROR,
-        pattern_time_change_listener,
+    cancel_callback = _async_track_utc_second(
+        hass, next_time, pattern_time_change_listener
     )
 
     @callback
@@ -1279,11 +1156,87 @@ def async_track_utc_time_change(
         """Cancel the call_later."""
         nonlocal cancel_callback
         assert cancel_callback is not None
-        cancel_callback.cancel()
+        cancel_callback()
 
     return unsub_pattern_time_change_listener
 
 
+@callback
+def _async_track_utc_second(
+    hass: HomeAssistant, utc_second: datetime, action: Callable[[], None]
+) -> CALLBACK_TYPE:
+    """Run a callback at a whole UTC second.
+
+    All callbacks for the same second share a single loop timer, so
+    thousands of time patterns only schedule one timer per second.
+    """
+    schedule: Dict[float, Tuple[asyncio.TimerHandle, List[Callable[[], None]]]]
+    schedule = hass.data.setdefault(TRACK_TIME_PATTERN_SCHEDULE, {})
+    timestamp = utc_second.timestamp()
+
+    if timestamp not in schedule:
+
+        @callback
+        def run_second() -> None:
+            """Run all callbacks scheduled for this second."""
+            _, actions = schedule.pop(timestamp)
+
+            # Pop the actions one at a time so an action removed by an
+            # earlier one in the same second is not run.
+            actions.reverse()
+            while actions:
+                second_action = actions.pop()
+                try:
+                    second_action()
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error while processing time pattern")
+
+        # We always get time.time() first to avoid time.time()
+        # ticking forward after fetching hass.loop.time()
+        # and callback being scheduled a few microseconds early.
+        #
+        # Since we loose additional time calling `hass.loop.time()`
+        # we add MAX_TIME_TRACKING_ERROR to ensure
+        # we always schedule the call within the time window between
+        # second and the next second.
+        #
+        # For example:
+        # If the clock ticks forward 30 microseconds when fectching
+        # `hass.loop.time()` and we want the event to fire at exactly
+        # 03:00:00.000000, the event would actually fire around
+        # 02:59:59.999970. To ensure we always fire sometime between
+        # 03:00:00.000000 and 03:00:00.999999 we add
+        # MAX_TIME_TRACKING_ERROR to make up for the time
+        # lost fetching the time. This ensures we do not fire the
+        # event before the next time pattern match which would result
+        # in the event being fired again since we would otherwise
+        # potentially fire early.
+        #
+        handle = hass.loop.call_at(
+            -time.time() + hass.loop.time() + timestamp + MAX_TIME_TRACKING_ERROR,
+            run_second,
+        )
+        schedule[timestamp] = (handle, [])
+
+    handle, actions = schedule[timestamp]
+    actions.append(action)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove the callback from the second."""
+        try:
+            actions.remove(action)
+        except ValueError:
+            # Already ran
+            return
+
+        if not actions and schedule.get(timestamp, (None, None))[1] is actions:
+            handle.cancel()
+            del schedule[timestamp]
+
+    return remove_listener
+
+
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
 
 
@@ -1378,6 +1331,23 @@ def _event_triggers_rerender(event: Event, info: RenderInfo) -> bool:
     return bool(info.filter_lifecycle(entity_id))
 
 
+@callback
+def _rerender_trigger(event: Optional[Event], info: RenderInfo) -> str:
+    """Return what made a template render again for the profiler."""
+    if event is None:
+        return TRIGGER_REFRESH
+
+    entity_id = event.data.get(ATTR_ENTITY_ID)
+    if entity_id in info.entities:
+        return TRIGGER_ENTITY
+
+    domain = split_entity_id(entity_id)[0]
+    if domain in info.domains or domain in info.domains_lifecycle:
+        return TRIGGER_DOMAIN
+
+    return TRIGGER_ALL_STATES
+
+
 @callback
 def _rate_limit_for_event(
     event: Event, info: RenderInfo, track_template_: TrackTemplate
@@ -0,0 +1,76 @@
+"""Index of the entities and devices referenced by automations, scripts and scenes."""
+from typing import Dict, Iterable, List, Tuple
+
+from homeassistant.core import callback
+from homeassistant.helpers.typing import HomeAssistantType
+
+DATA_REFERENCE_INDEX = "reference_index"
+
+
+class ReferenceIndex:
+    """Map the entities and devices to the entities of a domain referencing them."""
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self._by_entity: Dict[str, Dict[str, None]] = {}
+        self._by_device: Dict[str, Dict[str, None]] = {}
+        self._references: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+
+    @callback
+    def async_add(
+        self,
+        referrer: str,
+        entity_ids: Iterable[str] = (),
+        device_ids: Iterable[str] = (),
+    ) -> None:
+        """Index the entities and devices referenced by an entity."""
+        self.async_remove(referrer)
+        references = (tuple(entity_ids), tuple(device_ids))
+        self._references[referrer] = references
+        for entity_id in references[0]:
+            self._by_entity.setdefault(entity_id, {})[referrer] = None
+        for device_id in references[1]:
+            self._by_device.setdefault(device_id, {})[referrer] = None
+
+    @callback
+    def async_remove(self, referrer: str) -> None:
+        """Drop the references of an entity from the index."""
+        references = self._references.pop(referrer, None)
+        if references is None:
+            return
+        for entity_id in references[0]:
+            _remove_from_group(self._by_entity, entity_id, referrer)
+        for device_id in references[1]:
+            _remove_from_group(self._by_device, device_id, referrer)
+
+    @callback
+    def async_referencing_entity(self, entity_id: str) -> List[str]:
+        """Return the entities referencing an entity."""
+        return list(self._by_entity.get(entity_id, ()))
+
+    @callback
+    def async_referencing_device(self, device_id: str) -> List[str]:
+        """Return the entities referencing a device."""
+        return list(self._by_device.get(device_id, ()))
+
+
+@callback
+def async_get_reference_index(hass: HomeAssistantType, domain: str) -> ReferenceIndex:
+    """Return the reference index of a domain, creating it when needed."""
+    indexes: Dict[str, ReferenceIndex] = hass.data.setdefault(DATA_REFERENCE_INDEX, {})
+    index = indexes.get(domain)
+    if index is None:
+        index = indexes[domain] = ReferenceIndex()
+    return index
+
+
+def _remove_from_group(
+    index: Dict[str, Dict[str, None]], key: str, referrer: str
+) -> None:
+    """Remove a referrer from the group of a key, dropping the empty group."""
+    group = index.get(key)
+    if group is None:
+        return
+    group.pop(referrer, None)
+    if not group:
+        del index[key]
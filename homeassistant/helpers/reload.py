@@ -1,21 +1,27 @@
 """Class to reload platforms."""
 
 import asyncio
+import json
 import logging
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
 
 from homeassistant import config as conf_util
 from homeassistant.const import SERVICE_RELOAD
 from homeassistant.core import Event, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_per_platform
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.entity_platform import EntityPlatform, async_get_platforms
+from homeassistant.helpers.script_variables import ScriptVariables
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
 
 _LOGGER = logging.getLogger(__name__)
 
+DATA_CONFIG_HASHES = "reload_config_hashes"
+
 
 async def async_reload_integration_platforms(
     hass: HomeAssistantType, integration_name: str, integration_platforms: Iterable
@@ -125,6 +131,96 @@ async def _async_reconfig_platform(
     await asyncio.gather(*tasks)
 
 
+@callback
+def async_hash_config(config: Any) -> Optional[int]:
+    """Return a hash of a validated configuration.
+
+    Returns None when the configuration can not be hashed.
+    """
+    try:
+        return hash(json.dumps(config, default=_json_default))
+    except (TypeError, ValueError):
+        return None
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the objects of a validated configuration."""
+    if isinstance(obj, ScriptVariables):
+        return obj.variables
+    return repr(obj)
+
+
+async def async_reload_changed_entities(
+    component: EntityComponent,
+    configs: Iterable[Any],
+    async_create_entity: Callable[[Any], Awaitable[Optional[Entity]]],
+) -> List[Entity]:
+    """Update the entities of a component to match their configurations.
+
+    The entities created from a configuration that did not change are kept
+    with their state and subscriptions. The other entities are removed and
+    async_create_entity creates the entities of the new configurations.
+
+    Returns the entities that were created.
+    """
+    hass = component.hass
+    component_hashes: Dict[str, Dict[str, Optional[int]]] = hass.data.setdefault(
+        DATA_CONFIG_HASHES, {}
+    )
+    hashes = component_hashes.get(component.domain, {})
+
+    unchanged: Dict[int, List[Entity]] = {}
+    for entity in component.entities:
+        config_hash = hashes.get(entity.entity_id)
+        if config_hash is not None:
+            unchanged.setdefault(config_hash, []).append(entity)
+
+    new_hashes: Dict[str, Optional[int]] = {}
+    new_configs = []
+    for config in configs:
+        config_hash = async_hash_config(config)
+        kept = unchanged.get(config_hash) if config_hash is not None else None
+        if kept:
+            new_hashes[kept.pop().entity_id] = config_hash
+        else:
+            new_configs.append((config, config_hash))
+
+    stale = [
+        entity.entity_id
+        for entity in component.entities
+        if entity.entity_id not in new_hashes
+    ]
+    if stale:
+        # Entities replaced by a new configuration free their entity id first
+        await asyncio.gather(
+            *[component.async_remove_entity(entity_id) for entity_id in stale]
+        )
+
+    created = []
+    for config, config_hash in new_configs:
+        entity = await async_create_entity(config)
+        if entity is not None:
+            created.append((entity, config_hash))
+
+    entities = [entity for entity, _ in created]
+    if entities:
+        await component.async_add_entities(entities)
+
+    for entity, config_hash in created:
+        if entity.entity_id is not None:
+            new_hashes[entity.entity_id] = config_hash
+    component_hashes[component.domain] = new_hashes
+
+    _LOGGER.debug(
+        "Reloaded %s: %d kept, %d removed, %d added",
+        component.domain,
+        len(new_hashes) - len(created),
+        len(stale),
+        len(entities),
+    )
+    return entities
+
+
 async def async_integration_yaml_config(
     hass: HomeAssistantType, integration_name: str
 ) -> Optional[Dict[Any, Any]]:
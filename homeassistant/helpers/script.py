@@ -342,6 +342,7 @@ class _ScriptRun:
         )
 
         self._variables["wait"] = {"remaining": delay, "completed": False}
+        done = asyncio.Event()
 
         wait_template = self._action[CONF_WAIT_TEMPLATE]
         wait_template.hass = self._hass
@@ -366,7 +367,6 @@ class _ScriptRun:
         )
 
         self._changed()
-        done = asyncio.Event()
         tasks = [
             self._hass.async_create_task(flag.wait()) for flag in (self._stop, done)
         ]
@@ -612,6 +612,7 @@ class _ScriptRun:
 
         variables = {**self._variables}
         self._variables["wait"] = {"remaining": delay, "trigger": None}
+        done = asyncio.Event()
 
         async def async_done(variables, context=None):
             self._variables["wait"] = {
@@ -637,7 +638,6 @@ class _ScriptRun:
             return
 
         self._changed()
-        done = asyncio.Event()
         tasks = [
             self._hass.async_create_task(flag.wait()) for flag in (self._stop, done)
         ]
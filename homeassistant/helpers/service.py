@@ -234,16 +234,12 @@ async def async_extract_entity_ids(
             hass.helpers.device_registry.async_get_registry(),
             hass.helpers.entity_registry.async_get_registry(),
         )
-        devices = [
-            device
+        extracted.update(
+            entry.entity_id
             for area_id in area_ids
             for device in hass.helpers.device_registry.async_entries_for_area(
                 dev_reg, area_id
             )
-        ]
-        extracted.update(
-            entry.entity_id
-            for device in devices
             for entry in hass.helpers.entity_registry.async_entries_for_device(
                 ent_reg, device.id
             )
@@ -388,13 +384,7 @@ async def entity_service_call(
             if target_all_entities:
                 entity_candidates.extend(platform.entities.values())
             else:
-                entity_candidates.extend(
-                    [
-                        entity
-                        for entity in platform.entities.values()
-                        if entity.entity_id in entity_ids
-                    ]
-                )
+                entity_candidates.extend(_get_targeted_entities(platform, entity_ids))
 
     elif target_all_entities:
         # If we target all entities, we will select all entities the user
@@ -411,10 +401,7 @@ async def entity_service_call(
     else:
         for platform in platforms:
             platform_entities = []
-            for entity in platform.entities.values():
-
-                if entity.entity_id not in entity_ids:
-                    continue
+            for entity in _get_targeted_entities(platform, entity_ids):
 
                 if not entity_perms(entity.entity_id, POLICY_CONTROL):
                     raise Unauthorized(
@@ -487,6 +474,22 @@ async def entity_service_call(
             future.result()  # pop exception if have
 
 
+def _get_targeted_entities(
+    platform: "EntityPlatform", entity_ids: Set[str]
+) -> List["Entity"]:
+    """Return the entities of a platform that a service call targets.
+
+    The entities are looked up by entity ID, so a call targeting a few
+    entities does not scan all the entities of the platform.
+    """
+    entities = platform.entities
+    if len(entity_ids) > len(entities):
+        return [
+            entity for entity in entities.values() if entity.entity_id in entity_ids
+        ]
+    return [entities[entity_id] for entity_id in entity_ids if entity_id in entities]
+
+
 async def _handle_entity_call(
     hass: HomeAssistantType,
     entity: "Entity",
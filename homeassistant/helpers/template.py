@@ -10,7 +10,8 @@ import math
 from operator import attrgetter
 import random
 import re
-from typing import Any, Generator, Iterable, List, Optional, Union
+import time
+from typing import Any, Generator, Iterable, List, Optional, Tuple, Union
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
@@ -33,6 +34,7 @@ from homeassistant.core import State, callback, split_entity_id, valid_entity_id
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import config_validation as cv, location as loc_helper
 from homeassistant.helpers.frame import report
+from homeassistant.helpers.template_profiler import DATA_TEMPLATE_PROFILER
 from homeassistant.helpers.typing import HomeAssistantType, TemplateVarsType
 from homeassistant.loader import bind_hass
 from homeassistant.util import convert, dt as dt_util, location as loc_util
@@ -201,10 +203,12 @@ class RenderInfo:
         self.domains_lifecycle = set()
         self.entities = set()
         self.rate_limit = None
+        # Set when the result can change without any state change
+        self.volatile = False
 
     def __repr__(self) -> str:
         """Representation of RenderInfo."""
-        return f"<RenderInfo {self.template} all_states={self.all_states} all_states_lifecycle={self.all_states_lifecycle} domains={self.domains} domains_lifecycle={self.domains_lifecycle} entities={self.entities} rate_limit={self.rate_limit}>"
+        return f"<RenderInfo {self.template} all_states={self.all_states} all_states_lifecycle={self.all_states_lifecycle} domains={self.domains} domains_lifecycle={self.domains_lifecycle} entities={self.entities} rate_limit={self.rate_limit} volatile={self.volatile}>"
 
     def _filter_domains_and_entities(self, entity_id: str) -> bool:
         """Template should re-render if the entity state changes when we match specific domains or entities."""
@@ -259,6 +263,18 @@ class RenderInfo:
         else:
             self.filter = _false
 
+    def _can_memoize(self) -> bool:
+        """Return if the result only depends on the states of the entities."""
+        return bool(
+            self.entities
+            and not self.domains
+            and not self.domains_lifecycle
+            and not self.all_states
+            and not self.all_states_lifecycle
+            and not self.volatile
+            and self.exception is None
+        )
+
 
 class Template:
     """Class to hold a template and manage caching and rendering."""
@@ -273,6 +289,10 @@ class Template:
         self._compiled = None
         self.hass = hass
         self.is_static = not is_template_string(template)
+        # The last render info and the states it was rendered from
+        self._memoized_render_info: Optional[
+            Tuple[RenderInfo, Tuple[Optional[State], ...]]
+        ] = None
 
     @property
     def _env(self):
@@ -329,7 +349,7 @@ class Template:
             kwargs.update(variables)
 
         try:
-            return compiled.render(kwargs).strip()
+            return self._render_compiled(compiled, kwargs).strip()
         except jinja2.TemplateError as err:
             raise TemplateError(err) from err
 
@@ -388,6 +408,17 @@ class Template:
         """Render the template and collect an entity filter."""
         assert self.hass and _RENDER_INFO not in self.hass.data
 
+        # Without variables the result only changes with the states it used
+        memoize = not variables and not kwargs
+        if memoize and self._memoized_render_info is not None:
+            memoized, states = self._memoized_render_info
+            get_state = self.hass.states.get
+            if all(
+                get_state(entity_id) is state
+                for entity_id, state in zip(memoized.entities, states)
+            ):
+                return memoized
+
         render_info = RenderInfo(self)
 
         # pylint: disable=protected-access
@@ -405,6 +436,18 @@ class Template:
             del self.hass.data[_RENDER_INFO]
 
         render_info._freeze()
+
+        if memoize and render_info._can_memoize():
+            self._memoized_render_info = (
+                render_info,
+                tuple(
+                    self.hass.states.get(entity_id)
+                    for entity_id in render_info.entities
+                ),
+            )
+        else:
+            self._memoized_render_info = None
+
         return render_info
 
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
@@ -428,7 +471,8 @@ class Template:
     ):
         """Render template with value exposed.
 
-        If valid JSON will expose value_json too.
+        If valid JSON will expose value_json too, unless value_json
+        is passed in the variables when the value is already parsed.
 
         This method must be run in the event loop.
         """
@@ -441,13 +485,14 @@ class Template:
         variables = dict(variables or {})
         variables["value"] = value
 
-        try:
-            variables["value_json"] = json.loads(value)
-        except (ValueError, TypeError):
-            pass
+        if "value_json" not in variables:
+            try:
+                variables["value_json"] = json.loads(value)
+            except (ValueError, TypeError):
+                pass
 
         try:
-            return self._compiled.render(variables).strip()
+            return self._render_compiled(self._compiled, variables).strip()
         except jinja2.TemplateError as ex:
             if error_value is _SENTINEL:
                 _LOGGER.error(
@@ -458,6 +503,23 @@ class Template:
                 )
             return value if error_value is _SENTINEL else error_value
 
+    def _render_compiled(self, compiled, variables):
+        """Render the compiled template, timing it when profiling."""
+        profiler = self.hass.data.get(DATA_TEMPLATE_PROFILER)
+        if profiler is None:
+            return compiled.render(variables)
+
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = compiled.render(variables)
+            failed = False
+            return result
+        finally:
+            profiler.async_record_render(
+                self.template, time.perf_counter() - start, failed
+            )
+
     def _ensure_compiled(self):
         """Bind a template to a specific hass instance."""
         self.ensure_valid()
@@ -466,9 +528,7 @@ class Template:
 
         env = self._env
 
-        self._compiled = jinja2.Template.from_code(
-            env, self._compiled_code, env.globals, None
-        )
+        self._compiled = env.template_from_code(self.template, self._compiled_code)
 
         return self._compiled
 
@@ -1213,6 +1273,10 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         super().__init__()
         self.hass = hass
         self.template_cache = weakref.WeakValueDictionary()
+        # The templates bound to this environment, shared by their source
+        self.template_objects: weakref.WeakValueDictionary = (
+            weakref.WeakValueDictionary()
+        )
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -1282,11 +1346,28 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
             return contextfunction(wrapper)
 
+        def volatile(func):
+            """Wrap function whose result can change without any state change."""
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                render_info = hass.data.get(_RENDER_INFO)
+                if render_info is not None:
+                    render_info.volatile = True
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        for name in ("now", "utcnow", "relative_time", "lipsum"):
+            self.globals[name] = volatile(self.globals[name])
+        self.filters["random"] = volatile(self.filters["random"])
+
         self.globals["expand"] = hassfunction(expand)
         self.filters["expand"] = contextfilter(self.globals["expand"])
-        self.globals["closest"] = hassfunction(closest)
-        self.filters["closest"] = contextfilter(hassfunction(closest_filter))
-        self.globals["distance"] = hassfunction(distance)
+        # The location of the closest entities depends on the configuration
+        self.globals["closest"] = volatile(hassfunction(closest))
+        self.filters["closest"] = volatile(contextfilter(hassfunction(closest_filter)))
+        self.globals["distance"] = volatile(hassfunction(distance))
         self.globals["is_state"] = hassfunction(is_state)
         self.globals["is_state_attr"] = hassfunction(is_state_attr)
         self.globals["state_attr"] = hassfunction(state_attr)
@@ -1326,5 +1407,19 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
 
         return cached
 
+    def template_from_code(self, source: str, code: Any) -> jinja2.Template:
+        """Return the template of a source bound to this environment.
+
+        The templates with the same source share the same template object.
+        """
+        cached = self.template_objects.get(source)
+
+        if cached is None:
+            cached = self.template_objects[source] = jinja2.Template.from_code(
+                self, code, self.globals, None
+            )
+
+        return cached
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)
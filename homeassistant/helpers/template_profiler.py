@@ -0,0 +1,110 @@
+"""Profile the renders of the templates to find the slow ones."""
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from homeassistant.core import callback
+from homeassistant.helpers.typing import HomeAssistantType
+
+DATA_TEMPLATE_PROFILER = "template.profiler"
+
+# Render times kept for each template to compute the percentiles
+RENDER_TIME_SAMPLES = 100
+
+TRIGGER_REFRESH = "refresh"
+TRIGGER_ENTITY = "entity"
+TRIGGER_DOMAIN = "domain"
+TRIGGER_ALL_STATES = "all_states"
+
+
+class TemplateStats:
+    """Statistics of the renders of a template."""
+
+    __slots__ = ("render_count", "error_count", "total_time", "samples", "triggers")
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.render_count = 0
+        self.error_count = 0
+        self.total_time = 0.0
+        self.samples: Deque[float] = deque(maxlen=RENDER_TIME_SAMPLES)
+        self.triggers: Dict[str, int] = {}
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics with the render times in milliseconds."""
+        samples = sorted(self.samples)
+        return {
+            "render_count": self.render_count,
+            "error_count": self.error_count,
+            "total_time": round(self.total_time * 1000, 3),
+            "median_time": round(_percentile(samples, 50) * 1000, 3),
+            "p95_time": round(_percentile(samples, 95) * 1000, 3),
+            "max_time": round(samples[-1] * 1000 if samples else 0.0, 3),
+            "triggers": dict(self.triggers),
+        }
+
+
+class TemplateProfiler:
+    """Collect the render times of the templates by source."""
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self.stats: Dict[str, TemplateStats] = {}
+
+    @callback
+    def async_record_render(self, template: str, duration: float, failed: bool) -> None:
+        """Record a render of a template."""
+        stats = self.stats.get(template)
+        if stats is None:
+            stats = self.stats[template] = TemplateStats()
+        stats.render_count += 1
+        stats.total_time += duration
+        stats.samples.append(duration)
+        if failed:
+            stats.error_count += 1
+
+    @callback
+    def async_record_trigger(self, template: str, trigger: str) -> None:
+        """Record what made a tracked template render again."""
+        stats = self.stats.get(template)
+        if stats is None:
+            stats = self.stats[template] = TemplateStats()
+        stats.triggers[trigger] = stats.triggers.get(trigger, 0) + 1
+
+    @callback
+    def async_report(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return the statistics of the templates, slowest overall first."""
+        slowest = sorted(
+            self.stats.items(), key=lambda item: item[1].total_time, reverse=True
+        )
+        return [
+            {"template": template, **stats.as_dict()}
+            for template, stats in slowest[:limit]
+        ]
+
+
+@callback
+def async_get_template_profiler(hass: HomeAssistantType) -> Optional[TemplateProfiler]:
+    """Return the template profiler if profiling is enabled."""
+    return hass.data.get(DATA_TEMPLATE_PROFILER)
+
+
+@callback
+def async_enable_template_profiler(hass: HomeAssistantType) -> TemplateProfiler:
+    """Start profiling the templates, keeping the statistics collected so far."""
+    profiler = hass.data.get(DATA_TEMPLATE_PROFILER)
+    if profiler is None:
+        profiler = hass.data[DATA_TEMPLATE_PROFILER] = TemplateProfiler()
+    return profiler
+
+
+@callback
+def async_disable_template_profiler(hass: HomeAssistantType) -> None:
+    """Stop profiling the templates and drop their statistics."""
+    hass.data.pop(DATA_TEMPLATE_PROFILER, None)
+
+
+def _percentile(samples: List[float], percent: int) -> float:
+    """Return the nearest-rank percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    return samples[max(0, -(-len(samples) * percent // 100) - 1)]
@@ -3,15 +3,23 @@ import argparse
 import asyncio
 import collections
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import logging
+import tempfile
 from timeit import default_timer as timer
 from typing import Callable, Dict, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_ENTITY_ID,
+    ATTR_NOW,
+    EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED,
+    MATCH_ALL,
+)
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import dt as dt_util
@@ -75,11 +83,49 @@ async def fire_events(hass):
 
     hass.bus.async_listen(event_name, listener)
 
+    start = timer()
+
     for _ in range(10 ** 6):
         hass.bus.async_fire(event_name)
 
+    await event.wait()
+
+    return timer() - start
+
+
+@benchmark
+async def fire_events_mixed_listeners(hass):
+    """Fire a million events to callback, coroutine and match all listeners."""
+    count = 0
+    event_name = "benchmark_event"
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10 ** 6:
+            event.set()
+
+    async def async_listener(_):
+        """Handle event in a task."""
+
+    @core.callback
+    def match_all_listener(_):
+        """Handle all events."""
+
+    hass.bus.async_listen(event_name, listener)
+    hass.bus.async_listen(MATCH_ALL, match_all_listener)
+    for idx in range(10):
+        hass.bus.async_listen(f"{event_name}_{idx}", async_listener)
+
     start = timer()
 
+    for _ in range(10 ** 6):
+        hass.bus.async_fire(event_name)
+
     await event.wait()
 
     return timer() - start
@@ -323,6 +369,278 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def websocket_state_changed_subscribers(hass):
+    """Serialize 10,000 state changed events for 50 websocket subscriptions."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.websocket_api.messages import cached_event_message
+
+    events = [
+        core.Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": "sensor.power",
+                "old_state": core.State("sensor.power", str(idx)),
+                "new_state": core.State(
+                    "sensor.power", str(idx + 1), {"unit_of_measurement": "W"}
+                ),
+            },
+        )
+        for idx in range(10 ** 4)
+    ]
+
+    start = timer()
+
+    for event in events:
+        for iden in range(50):
+            cached_event_message(iden, event)
+
+    return timer() - start
+
+
+@benchmark
+async def json_serialize_cached_states(hass):
+    """Serialize 1,000 states for 50 websocket get_states requests."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.websocket_api.messages import states_result_message
+
+    states = [
+        core.State(f"light.kitchen{idx}", "on", {"friendly_name": "Kitchen Lights"})
+        for idx in range(1000)
+    ]
+
+    start = timer()
+
+    for iden in range(50):
+        states_result_message(iden, states)
+
+    return timer() - start
+
+
+@benchmark
+async def group_nested_state_changes(hass):
+    """Update large and nested groups of 5,000 lights for 100,000 changes."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from homeassistant.components import group
+
+    hass.data[group.REG_KEY] = group.GroupIntegrationRegistry()
+    lights = [f"light.light{idx}" for idx in range(5000)]
+    for entity_id in lights:
+        hass.states.async_set(entity_id, "off")
+
+    def create_group(name, entity_ids):
+        entity = group.Group(hass, name, entity_ids=entity_ids)
+        entity.entity_id = f"group.{name}"
+        entity._reset_tracked_state()
+        entity._async_update_group_state()
+        hass.states.async_set(entity.entity_id, entity.state)
+        return entity
+
+    everything = create_group("everything", lights)
+    rooms = [
+        create_group(f"room{idx}", lights[idx * 500 : (idx + 1) * 500])
+        for idx in range(10)
+    ]
+    room_states = [
+        {state: core.State(room.entity_id, state) for state in ("on", "off")}
+        for room in rooms
+    ]
+    house = create_group("house", [room.entity_id for room in rooms])
+
+    # Turn each light on and off again
+    changes = [
+        (
+            core.State(lights[idx // 2 % 5000], "off" if idx % 2 else "on"),
+            rooms[idx // 2 % 5000 // 500],
+            room_states[idx // 2 % 5000 // 500],
+        )
+        for idx in range(10 ** 5)
+    ]
+
+    start = timer()
+
+    for light_state, room, states in changes:
+        everything._async_update_group_state(light_state)
+        room._async_update_group_state(light_state)
+        house._async_update_group_state(states[room.state])
+
+    return timer() - start
+
+
+@benchmark
+async def mqtt_subscription_matching(hass):
+    """Match 100,000 MQTT messages against 3,000 subscriptions."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import mqtt
+
+    matcher = mqtt.SubscriptionMatcher()
+    for idx in range(1000):
+        for topic in (
+            f"zigbee2mqtt/device{idx}",
+            f"tasmota/device{idx}/+/STATE",
+            f"homeassistant/device{idx}/#",
+        ):
+            matcher.add(mqtt.Subscription(topic, None))
+
+    topics = [f"tasmota/device{idx % 1000}/tele/STATE" for idx in range(10 ** 5)]
+
+    start = timer()
+
+    for topic in topics:
+        matcher.match(topic)
+
+    return timer() - start
+
+
+@benchmark
+async def mqtt_json_value_templates(hass):
+    """Render 12 value templates of a device for 10,000 JSON messages."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.mqtt.models import Message
+    from homeassistant.helpers.template import Template
+
+    keys = (
+        "temperature",
+        "humidity",
+        "pressure",
+        "battery",
+        "voltage",
+        "linkquality",
+        "illuminance",
+        "occupancy",
+        "tamper",
+        "battery_low",
+        "contact",
+        "state",
+    )
+    templates = [Template(f"{{{{ value_json.{key} }}}}", hass) for key in keys]
+    payload = json.dumps({key: idx for idx, key in enumerate(keys)})
+
+    start = timer()
+
+    for _ in range(10 ** 4):
+        json_cache: dict = {}
+        for template in templates:
+            msg = Message(
+                "zigbee2mqtt/sensor", payload, 0, False, None, None, json_cache
+            )
+            template.async_render_with_possible_json_value(
+                msg.payload, variables=msg.template_variables
+            )
+
+    return timer() - start
+
+
+@benchmark
+async def entity_service_call_targets(hass):
+    """Call a service 2,000 times on one of 5,000 entities or an area of 10."""
+    # pylint: disable=import-outside-toplevel, protected-access
+    from homeassistant.helpers import device_registry, entity_registry
+    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.entity_platform import EntityPlatform
+    from homeassistant.helpers.service import entity_service_call
+
+    class BenchEntity(Entity):
+        """Entity called by the service."""
+
+        should_poll = False
+
+    # The group integration expands the targeted entity IDs
+    config_dir = tempfile.TemporaryDirectory()
+    hass.config.config_dir = config_dir.name
+
+    dev_reg = device_registry.DeviceRegistry(hass)
+    dev_reg.devices = {}
+    dev_reg.deleted_devices = {}
+    ent_reg = entity_registry.EntityRegistry(hass)
+    ent_reg.entities = {}
+    hass.data[device_registry.DATA_REGISTRY] = dev_reg
+    hass.data[entity_registry.DATA_REGISTRY] = ent_reg
+
+    platforms = []
+    for platform_idx in range(10):
+        platform = EntityPlatform(
+            hass=hass,
+            logger=logging.getLogger(__name__),
+            domain="light",
+            platform_name=f"platform{platform_idx}",
+            platform=None,
+            scan_interval=timedelta(seconds=30),
+            entity_namespace=None,
+        )
+        platforms.append(platform)
+        for device_idx in range(100):
+            device = device_registry.DeviceEntry(
+                area_id=f"area{platform_idx}_{device_idx // 2}",
+                id=f"device{platform_idx}_{device_idx}",
+            )
+            dev_reg.devices[device.id] = device
+            for idx in range(5):
+                entity = BenchEntity()
+                entity.hass = hass
+                entity.entity_id = f"light.light{platform_idx}_{device_idx}_{idx}"
+                platform.entities[entity.entity_id] = entity
+                ent_reg.entities[entity.entity_id] = entity_registry.RegistryEntry(
+                    entity_id=entity.entity_id,
+                    unique_id=entity.entity_id,
+                    platform=platform.platform_name,
+                    device_id=device.id,
+                )
+
+    dev_reg._rebuild_index()
+    ent_reg._rebuild_index()
+
+    @core.callback
+    def turn_on(entity, call):
+        """Handle the service call of an entity."""
+
+    calls = [
+        core.ServiceCall(
+            "light", "turn_on", {ATTR_ENTITY_ID: [f"light.light{idx % 10}_{idx}_0"]}
+        )
+        for idx in range(100)
+    ] * 10
+    calls += [
+        core.ServiceCall(
+            "light", "turn_on", {ATTR_AREA_ID: [f"area{idx % 10}_{idx // 2}"]}
+        )
+        for idx in range(100)
+    ] * 10
+
+    start = timer()
+
+    for call in calls:
+        await entity_service_call(hass, platforms, turn_on, call)
+
+    runtime = timer() - start
+    config_dir.cleanup()
+    return runtime
+
+
+@benchmark
+async def template_render_to_info(hass):
+    """Render 1,000 templates of 100 sources 100 times with unchanged states."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.template import Template
+
+    for idx in range(100):
+        hass.states.async_set(f"sensor.temperature{idx}", idx)
+
+    sources = [
+        f"{{{{ (states('sensor.temperature{idx}') | float * 1.8 + 32) | round(1) }}}}"
+        for idx in range(100)
+    ]
+
+    start = timer()
+
+    templates = [Template(source, hass) for source in sources * 10]
+    for _ in range(100):
+        for template in templates:
+            template.async_render_to_info()
+
+    return timer() - start
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -95,6 +95,9 @@ async def test_loading_no_group_data_format(hass, hass_storage):
     system_token = list(system.refresh_tokens.values())[0]
     assert system_token.id == "system-token-id"
 
+    assert await store.async_get_refresh_token("user-token-id") is owner_token
+    assert await store.async_get_refresh_token("system-token-id") is system_token
+
 
 async def test_loading_all_access_group_data_format(hass, hass_storage):
     """Test we correctly load old data with single group."""
@@ -210,6 +213,22 @@ async def test_loading_empty_data(hass, hass_storage):
     assert len(users) == 0
 
 
+async def test_refresh_token_index(hass, hass_storage):
+    """Test the refresh tokens are found by id until removed."""
+    store = auth_store.AuthStore(hass)
+    user = await store.async_create_user("Test User")
+    token = await store.async_create_refresh_token(user, "http://localhost/")
+    other_token = await store.async_create_refresh_token(user, "http://localhost/")
+    assert await store.async_get_refresh_token(token.id) is token
+
+    await store.async_remove_refresh_token(token)
+    assert await store.async_get_refresh_token(token.id) is None
+    assert token.id not in user.refresh_tokens
+
+    await store.async_remove_user(user)
+    assert await store.async_get_refresh_token(other_token.id) is None
+
+
 async def test_system_groups_store_id_and_name(hass, hass_storage):
     """Test that for system groups we store the ID and name.
 
@@ -542,6 +542,66 @@ async def test_reload_config_service(hass, calls, hass_admin_user, hass_read_onl
     assert calls[1].data.get("event") == "test_event2"
 
 
+async def test_reload_config_keeps_unchanged_automations(hass, calls):
+    """Test reloading only replaces the automations whose config changed."""
+    automations = [
+        {
+            "alias": alias,
+            "trigger": {"platform": "event", "event_type": f"{alias}_event"},
+            "action": {"service": "test.automation"},
+        }
+        for alias in ("hello", "bye")
+    ]
+    assert await async_setup_component(
+        hass, automation.DOMAIN, {automation.DOMAIN: automations}
+    )
+    component = hass.data[automation.DOMAIN]
+    hello = component.get_entity("automation.hello")
+    bye = component.get_entity("automation.bye")
+    await hass.services.async_call(
+        automation.DOMAIN,
+        SERVICE_TURN_OFF,
+        {ATTR_ENTITY_ID: "automation.hello"},
+        blocking=True,
+    )
+
+    changed = {
+        **automations[1],
+        "action": {
+            "service": "test.automation",
+            "data": {"entity_id": "automation.hello"},
+        },
+    }
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value={automation.DOMAIN: [automations[0], changed]},
+    ):
+        await hass.services.async_call(automation.DOMAIN, SERVICE_RELOAD, blocking=True)
+        await hass.async_block_till_done()
+
+    assert component.get_entity("automation.hello") is hello
+    assert hass.states.get("automation.hello").state == STATE_OFF
+    assert component.get_entity("automation.bye") is not bye
+    assert automation.automations_with_entity(hass, "automation.hello") == [
+        "automation.bye"
+    ]
+    assert hass.bus.async_listeners().get("bye_event") == 1
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value={automation.DOMAIN: [automations[1]]},
+    ):
+        await hass.services.async_call(automation.DOMAIN, SERVICE_RELOAD, blocking=True)
+        await hass.async_block_till_done()
+
+    assert hass.states.get("automation.hello") is None
+    assert hass.bus.async_listeners().get("hello_event") is None
+    assert hass.states.get("automation.bye") is not None
+    assert automation.automations_with_entity(hass, "automation.hello") == []
+
+
 async def test_reload_config_when_invalid_config(hass, calls):
     """Test the reload config service handling invalid config."""
     with assert_setup_component(1, automation.DOMAIN):
@@ -618,7 +678,9 @@ async def test_reload_config_handles_load_fails(hass, calls):
     assert len(calls) == 2
 
 
-@pytest.mark.parametrize("service", ["turn_off_stop", "turn_off_no_stop", "reload"])
+@pytest.mark.parametrize(
+    "service", ["turn_off_stop", "turn_off_no_stop", "reload", "reload_unchanged"]
+)
 async def test_automation_stops(hass, calls, service):
     """Test that turning off / reloading stops any running actions as appropriate."""
     entity_id = "automation.hello"
@@ -664,10 +726,18 @@ async def test_automation_stops(hass, calls, service):
             blocking=True,
         )
     else:
+        new_config = config
+        if service == "reload":
+            new_config = {
+                automation.DOMAIN: {
+                    **config[automation.DOMAIN],
+                    "trigger": {"platform": "event", "event_type": "new_event"},
+                }
+            }
         with patch(
             "homeassistant.config.load_yaml_config_file",
             autospec=True,
-            return_value=config,
+            return_value=new_config,
         ):
             await hass.services.async_call(
                 automation.DOMAIN, SERVICE_RELOAD, blocking=True
@@ -676,7 +746,9 @@ async def test_automation_stops(hass, calls, service):
     hass.states.async_set(test_entity, "goodbye")
     await hass.async_block_till_done()
 
-    assert len(calls) == (1 if service == "turn_off_no_stop" else 0)
+    assert len(calls) == (
+        1 if service in ("turn_off_no_stop", "reload_unchanged") else 0
+    )
 
 
 async def test_automation_restore_state(hass):
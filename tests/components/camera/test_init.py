@@ -110,6 +110,62 @@ async def test_get_image_fails(hass, image_mock_url):
         await camera.async_get_image(hass, "camera.demo_camera")
 
 
+async def test_get_image_shares_fetch(hass, image_mock_url):
+    """Test concurrent requests share the fetch of an image."""
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        return_value=b"Test",
+    ) as mock_camera_image:
+        images = await asyncio.gather(
+            camera.async_get_image(hass, "camera.demo_camera"),
+            camera.async_get_image(hass, "camera.demo_camera"),
+        )
+        assert [image.content for image in images] == [b"Test", b"Test"]
+        assert mock_camera_image.call_count == 1
+
+        # Without streams the next request fetches a new image
+        await camera.async_get_image(hass, "camera.demo_camera")
+        assert mock_camera_image.call_count == 2
+
+
+async def test_get_image_from_stream_frame(hass, image_mock_url):
+    """Test requests are served the latest frame of a running stream."""
+    demo_camera = hass.data[DOMAIN].get_entity("camera.demo_camera")
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        side_effect=[b"Frame", b"Other"],
+    ) as mock_camera_image:
+        with demo_camera.frame_broadcaster.subscribe(10) as next_frame:
+            assert await next_frame() == b"Frame"
+            image = await camera.async_get_image(hass, "camera.demo_camera")
+
+        assert image.content == b"Frame"
+        assert mock_camera_image.call_count == 1
+
+
+async def test_frame_broadcaster_fan_out(hass, image_mock_url):
+    """Test the frames are fetched once for all streams."""
+    demo_camera = hass.data[DOMAIN].get_entity("camera.demo_camera")
+    broadcaster = demo_camera.frame_broadcaster
+
+    with patch(
+        "homeassistant.components.demo.camera.DemoCamera.async_camera_image",
+        side_effect=[b"1", b"2", b"3", None],
+    ) as mock_camera_image:
+        with broadcaster.subscribe(0.01) as fast, broadcaster.subscribe(1) as slow:
+            assert await fast() == b"1"
+            assert await slow() == b"1"
+            assert await fast() == b"2"
+            assert await fast() == b"3"
+            # The slow stream only gets the latest frame
+            assert await slow() == b"3"
+            assert await fast() is None
+            assert await slow() is None
+
+    assert mock_camera_image.call_count == 4
+
+
 async def test_snapshot_service(hass, mock_camera):
     """Test snapshot service."""
     mopen = mock_open()
@@ -13,6 +13,7 @@ from homeassistant.components.filter.sensor import (
     TimeSMAFilter,
     TimeThrottleFilter,
 )
+from homeassistant.components.history.recent import BEGINNING, async_get_recent_history
 from homeassistant.const import SERVICE_RELOAD
 import homeassistant.core as ha
 from homeassistant.setup import async_setup_component, setup_component
@@ -113,38 +114,32 @@ class TestFilterSensor(unittest.TestCase):
         t_3 = dt_util.utcnow() - timedelta(minutes=4)
 
         if missing:
-            fake_states = {}
+            fake_states = []
         else:
-            fake_states = {
-                "sensor.test_monitored": [
-                    ha.State("sensor.test_monitored", 18.0, last_changed=t_0),
-                    ha.State("sensor.test_monitored", "unknown", last_changed=t_1),
-                    ha.State("sensor.test_monitored", 19.0, last_changed=t_2),
-                    ha.State("sensor.test_monitored", 18.2, last_changed=t_3),
-                ]
-            }
+            fake_states = [
+                ha.State("sensor.test_monitored", 18.0, last_updated=t_3),
+                ha.State("sensor.test_monitored", "unknown", last_updated=t_2),
+                ha.State("sensor.test_monitored", 19.0, last_updated=t_1),
+                ha.State("sensor.test_monitored", 18.2, last_updated=t_0),
+            ]
 
         with patch(
-            "homeassistant.components.history.state_changes_during_period",
-            return_value=fake_states,
+            "homeassistant.components.history.recent._get_recorded_states",
+            return_value=(fake_states, BEGINNING),
         ):
-            with patch(
-                "homeassistant.components.history.get_last_state_changes",
-                return_value=fake_states,
-            ):
-                with assert_setup_component(1, "sensor"):
-                    assert setup_component(self.hass, "sensor", config)
-                    self.hass.block_till_done()
-
-                for value in self.values:
-                    self.hass.states.set(config["sensor"]["entity_id"], value.state)
-                    self.hass.block_till_done()
-
-                state = self.hass.states.get("sensor.test")
-                if missing:
-                    assert "18.05" == state.state
-                else:
-                    assert "17.05" == state.state
+            with assert_setup_component(1, "sensor"):
+                assert setup_component(self.hass, "sensor", config)
+                self.hass.block_till_done()
+
+            for value in self.values:
+                self.hass.states.set(config["sensor"]["entity_id"], value.state)
+                self.hass.block_till_done()
+
+            state = self.hass.states.get("sensor.test")
+            if missing:
+                assert "18.05" == state.state
+            else:
+                assert "17.05" == state.state
 
     def test_chain_history_missing(self):
         """Test if filter chaining works when recorder is enabled but the source is not recorded."""
@@ -166,28 +161,26 @@ class TestFilterSensor(unittest.TestCase):
         t_1 = dt_util.utcnow() - timedelta(minutes=2)
         t_2 = dt_util.utcnow() - timedelta(minutes=3)
 
-        fake_states = {
-            "sensor.test_monitored": [
-                ha.State("sensor.test_monitored", 18.0, last_changed=t_0),
-                ha.State("sensor.test_monitored", 19.0, last_changed=t_1),
-                ha.State("sensor.test_monitored", 18.2, last_changed=t_2),
-            ]
-        }
+        fake_states = [
+            ha.State("sensor.test_monitored", 18.2, last_updated=t_2),
+            ha.State("sensor.test_monitored", 19.0, last_updated=t_1),
+            ha.State("sensor.test_monitored", 18.0, last_updated=t_0),
+        ]
         with patch(
-            "homeassistant.components.history.state_changes_during_period",
-            return_value=fake_states,
+            "homeassistant.components.history.recent._get_recorded_states",
+            return_value=(fake_states, BEGINNING),
         ):
-            with patch(
-                "homeassistant.components.history.get_last_state_changes",
-                return_value=fake_states,
-            ):
-                with assert_setup_component(1, "sensor"):
-                    assert setup_component(self.hass, "sensor", config)
-                    self.hass.block_till_done()
-
+            with assert_setup_component(1, "sensor"):
+                assert setup_component(self.hass, "sensor", config)
                 self.hass.block_till_done()
-                state = self.hass.states.get("sensor.test")
-                assert "18.0" == state.state
+
+            self.hass.block_till_done()
+            state = self.hass.states.get("sensor.test")
+            assert "18.0" == state.state
+
+        # The recent history is only kept for the initial read
+        recent = async_get_recent_history(self.hass)
+        assert recent.async_get_last_states("sensor.test_monitored") is None
 
     def test_outlier(self):
         """Test if outlier filter works."""
@@ -17,7 +17,6 @@ from homeassistant.const import (
     STATE_UNKNOWN,
 )
 from homeassistant.core import CoreState
-from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 from homeassistant.setup import async_setup_component, setup_component
 
 from tests.async_mock import patch
@@ -148,6 +147,33 @@ class TestComponentsGroup(unittest.TestCase):
         group_state = self.hass.states.get(test_group.entity_id)
         assert STATE_ON == group_state.state
 
+    def test_allgroup_counts_repeated_member_updates_once(self):
+        """Group with all: true, a member updated twice is counted once."""
+        self.hass.states.set("light.Bowl", STATE_OFF)
+        self.hass.states.set("light.Ceiling", STATE_OFF)
+        test_group = group.Group.create_group(
+            self.hass, "init_group", ["light.Bowl", "light.Ceiling"], False, mode=True
+        )
+
+        self.hass.states.set("light.Bowl", STATE_ON)
+        self.hass.states.set("light.Bowl", STATE_ON, {"brightness": 100})
+        self.hass.block_till_done()
+
+        group_state = self.hass.states.get(test_group.entity_id)
+        assert STATE_OFF == group_state.state
+
+        self.hass.states.set("light.Ceiling", STATE_ON)
+        self.hass.block_till_done()
+
+        group_state = self.hass.states.get(test_group.entity_id)
+        assert STATE_ON == group_state.state
+
+        self.hass.states.set("light.Bowl", STATE_OFF)
+        self.hass.block_till_done()
+
+        group_state = self.hass.states.get(test_group.entity_id)
+        assert STATE_OFF == group_state.state
+
     def test_expand_entity_ids(self):
         """Test expand_entity_ids method."""
         self.hass.states.set("light.Bowl", STATE_ON)
@@ -372,11 +398,8 @@ async def test_reloading_groups(hass):
         "group.second_group",
         "group.test_group",
     ]
-    assert hass.bus.async_listeners()["state_changed"] == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["hello.world"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.two"]) == 1
+    # One state changed listener for each group with entities
+    assert hass.bus.async_listeners()["state_changed"] == 3
 
     with patch(
         "homeassistant.config.load_yaml_config_file",
@@ -391,10 +414,7 @@ async def test_reloading_groups(hass):
         "group.all_tests",
         "group.hello",
     ]
-    assert hass.bus.async_listeners()["state_changed"] == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.two"]) == 1
+    assert hass.bus.async_listeners()["state_changed"] == 2
 
 
 async def test_modify_group(hass):
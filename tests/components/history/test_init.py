@@ -6,7 +6,8 @@ import json
 import unittest
 
 from homeassistant.components import history, recorder
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.models import Statistics, process_timestamp
+from homeassistant.const import HTTP_BAD_REQUEST
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.setup import async_setup_component, setup_component
@@ -663,6 +664,53 @@ class TestComponentHistory(unittest.TestCase):
         assert len(hist[entity_id]) == 3
         assert states == hist[entity_id]
 
+    def test_get_significant_states_max_points(self):
+        """Test significant states are downsampled to max_points."""
+        self.test_setup()
+        start = dt_util.utcnow() - timedelta(minutes=10)
+        sensor_states = []
+        switch_states = []
+        for minute, value in enumerate((5, 1, 9, 3, 4, 8, 2, 6), 1):
+            with patch(
+                "homeassistant.components.recorder.dt_util.utcnow",
+                return_value=start + timedelta(minutes=minute),
+            ):
+                self.hass.states.set("sensor.power", value)
+                self.hass.states.set("switch.fan", "on" if minute % 2 else "off")
+                wait_recording_done(self.hass)
+            sensor_states.append(self.hass.states.get("sensor.power"))
+            switch_states.append(self.hass.states.get("switch.fan"))
+
+        hist = history.get_significant_states(
+            self.hass,
+            start,
+            start + timedelta(minutes=9),
+            include_start_time_state=False,
+            max_points=4,
+        )
+
+        # Each half keeps the lowest and highest value
+        assert hist["sensor.power"] == [
+            sensor_states[1],
+            sensor_states[2],
+            sensor_states[5],
+            sensor_states[6],
+        ]
+        # The states that are not numeric keep the last state of each half
+        assert hist["switch.fan"] == [switch_states[3], switch_states[7]]
+
+        hist = history.get_significant_states(
+            self.hass,
+            start,
+            start + timedelta(minutes=9),
+            include_start_time_state=False,
+            max_points=1,
+        )
+
+        # A single point keeps the last state
+        assert hist["sensor.power"] == [sensor_states[7]]
+        assert hist["switch.fan"] == [switch_states[7]]
+
     def check_significant_states(self, zero, four, states, config):
         """Check if significant states are retrieved."""
         filters = history.Filters()
@@ -970,3 +1018,134 @@ async def test_entity_ids_limit_via_api(hass, hass_client):
     assert len(response_json) == 2
     assert response_json[0][0]["entity_id"] == "light.kitchen"
     assert response_json[1][0]["entity_id"] == "light.cow"
+
+
+async def test_fetch_period_api_serves_statistics(hass, hass_client):
+    """Test the fetch period view serves statistics from before the states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    instance = hass.data[recorder.DATA_INSTANCE]
+    await hass.async_add_job(instance.block_till_done)
+
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        days=30
+    )
+
+    def _add_statistics():
+        with recorder.session_scope(hass=hass) as session:
+            for hours, mean in ((0, 10.5), (1, 12.5)):
+                session.add(
+                    Statistics(
+                        domain="sensor",
+                        entity_id="sensor.power",
+                        start=start + timedelta(hours=hours),
+                        mean=mean,
+                        min=mean,
+                        max=mean,
+                        last=mean,
+                    )
+                )
+
+    await hass.async_add_executor_job(_add_statistics)
+    hass.states.async_set("sensor.power", "14", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_add_job(instance.block_till_done)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}",
+        params={"filter_entity_id": "sensor.power"},
+    )
+    assert response.status == 200
+    response_json = await response.json()
+    assert [(state["state"], state["attributes"]) for state in response_json[0]] == [
+        ("10.5", {"unit_of_measurement": "W"}),
+        ("12.5", {"unit_of_measurement": "W"}),
+    ]
+    assert dt_util.parse_datetime(response_json[0][0]["last_changed"]) == start
+
+
+@patch("homeassistant.components.history.STREAM_CHUNK_STATES", 2)
+async def test_fetch_period_api_streams_all_entities(hass, hass_client):
+    """Test the history of all entities is streamed like the buffered one."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    instance = hass.data[recorder.DATA_INSTANCE]
+    await hass.async_add_job(instance.block_till_done)
+
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_add_job(instance.block_till_done)
+
+    start = dt_util.utcnow()
+    for state in ("1", "2", "3", "4", "5"):
+        hass.states.async_set("sensor.power", state, {"unit_of_measurement": "W"})
+        hass.states.async_set("switch.fan", "on" if int(state) % 2 else "off")
+        await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_add_job(instance.block_till_done)
+
+    client = await hass_client()
+    for params in ({}, {"minimal_response": ""}):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}", params=params
+        )
+        assert response.status == 200
+        streamed = await response.json()
+
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}",
+            params={
+                **params,
+                "filter_entity_id": "light.kitchen,sensor.power,switch.fan",
+            },
+        )
+        assert response.status == 200
+        buffered = await response.json()
+
+        assert len(streamed) == 3
+        assert sorted(streamed, key=lambda states: states[0]["entity_id"]) == buffered
+        assert [state["state"] for state in buffered[1]] == ["1", "2", "3", "4", "5"]
+
+
+async def test_fetch_period_api_streams_empty_history(hass, hass_client):
+    """Test streaming the history of a period without states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    response = await client.get("/api/history/period")
+    assert response.status == 200
+    assert await response.text() == "[]"
+
+
+async def test_fetch_period_api_with_max_points(hass, hass_client):
+    """Test the fetch period view downsamples to max_points."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    instance = hass.data[recorder.DATA_INSTANCE]
+    await hass.async_add_job(instance.block_till_done)
+
+    start = dt_util.utcnow()
+    for value in range(20):
+        hass.states.async_set("sensor.power", value)
+        await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_add_job(instance.block_till_done)
+
+    client = await hass_client()
+    for params in ({}, {"filter_entity_id": "sensor.power"}):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}",
+            params={**params, "max_points": "2"},
+        )
+        assert response.status == 200
+        response_json = await response.json()
+        assert [state["state"] for state in response_json[0]] == ["0", "19"]
+
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}", params={"max_points": "none"}
+    )
+    assert response.status == HTTP_BAD_REQUEST
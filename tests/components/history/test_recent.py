@@ -0,0 +1,155 @@
+"""The tests for the recent history of the entities."""
+# pylint: disable=protected-access
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.components import history
+from homeassistant.components.history.recent import BEGINNING, async_get_recent_history
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.setup import setup_component
+from homeassistant.util.async_ import run_callback_threadsafe
+import homeassistant.util.dt as dt_util
+
+from tests.async_mock import patch
+from tests.common import get_test_home_assistant, init_recorder_component
+from tests.components.recorder.common import wait_recording_done
+
+
+@pytest.fixture
+def hass_recorder():
+    """Home Assistant instance with a running recorder."""
+    hass = get_test_home_assistant()
+    init_recorder_component(hass)
+    assert setup_component(hass, history.DOMAIN, {})
+    hass.start()
+    wait_recording_done(hass)
+    yield hass
+    hass.stop()
+
+
+def _changes(states):
+    """Return the values and the times of the state changes."""
+    return [(state.state, state.last_changed) for state in states]
+
+
+def test_seed_from_recorder(hass_recorder):
+    """Test the recent history is seeded with the recorded states."""
+    hass = hass_recorder
+    hass.states.set("sensor.test", "1")
+    wait_recording_done(hass)
+    start = dt_util.utcnow()
+    hass.states.set("sensor.test", "2")
+    hass.states.set("sensor.test", "2", {"attr": "value"})
+    hass.states.set("sensor.test", "3")
+    wait_recording_done(hass)
+
+    recent = async_get_recent_history(hass)
+    asyncio.run_coroutine_threadsafe(
+        recent.async_track("sensor.test", max_age=timedelta(hours=1)), hass.loop
+    ).result()
+
+    states = run_callback_threadsafe(
+        hass.loop, recent.async_state_changes_during_period, "sensor.test", start
+    ).result()
+    recorded = history.state_changes_during_period(hass, start, entity_id="sensor.test")
+    assert _changes(states) == _changes(recorded["sensor.test"])
+    assert [state.state for state in states] == ["1", "2", "3"]
+
+    states = run_callback_threadsafe(
+        hass.loop, recent.async_get_last_states, "sensor.test", 3
+    ).result()
+    assert [(state.state, dict(state.attributes)) for state in states] == [
+        ("2", {}),
+        ("2", {"attr": "value"}),
+        ("3", {}),
+    ]
+
+
+async def test_record_state_changes(hass):
+    """Test the state changes of the tracked entities are kept."""
+    hass.states.async_set("sensor.other", "1")
+    recent = async_get_recent_history(hass)
+    before_tracking = dt_util.utcnow() - timedelta(seconds=1)
+    await recent.async_track("sensor.test", max_age=timedelta(hours=1))
+    start = dt_util.utcnow()
+
+    hass.states.async_set("sensor.test", "1")
+    hass.states.async_set("sensor.test", "1", {"attr": "value"})
+    hass.states.async_set("sensor.test", "2")
+    hass.states.async_set("sensor.other", "2")
+
+    states = recent.async_get_last_states("sensor.test", start_time=start)
+    assert [state.state for state in states] == ["1", "1", "2"]
+
+    states = recent.async_get_last_states(
+        "sensor.test", 5, start_time=start, changes_only=True
+    )
+    assert [state.state for state in states] == ["1", "2"]
+
+    # The states before tracking the entity are not known
+    assert recent.async_get_last_states("sensor.test", 5) is None
+    assert (
+        recent.async_state_changes_during_period("sensor.test", before_tracking) is None
+    )
+    assert recent.async_get_last_states("sensor.other", start_time=start) is None
+
+
+async def test_evict_states(hass):
+    """Test the states no window needs are dropped."""
+    recent = async_get_recent_history(hass)
+    await recent.async_track("sensor.test", max_items=2)
+
+    for value in range(4):
+        hass.states.async_set("sensor.test", value)
+
+    states = recent.async_get_last_states("sensor.test", 2)
+    assert [state.state for state in states] == ["2", "3"]
+    assert recent.async_get_last_states("sensor.test", 3) is None
+    assert (
+        recent.async_state_changes_during_period("sensor.test", states[0].last_updated)
+        is not None
+    )
+
+
+async def test_untrack(hass):
+    """Test the states are dropped when the entity is not tracked anymore."""
+    recent = async_get_recent_history(hass)
+    listeners = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    untrack = await recent.async_track("sensor.test", max_items=2)
+    untrack_other = await recent.async_track("sensor.test", max_age=timedelta(hours=1))
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.test", "1")
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners + 1
+    # Only the state changes of the tracked entities are listened to
+    assert "sensor.test" in hass.bus._entity_listeners
+    assert "sensor.other" not in hass.bus._entity_listeners
+
+    untrack()
+    assert len(recent.async_get_last_states("sensor.test", start_time=start)) == 1
+
+    untrack_other()
+    assert recent.async_get_last_states("sensor.test", start_time=start) is None
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners
+    assert "sensor.test" not in hass.bus._entity_listeners
+
+
+async def test_shared_seed(hass):
+    """Test the entities tracked together share the seed of their states."""
+    hass.config.components.add("recorder")
+    recent = async_get_recent_history(hass)
+
+    with patch(
+        "homeassistant.components.history.recent._get_recorded_states",
+        return_value=([], BEGINNING),
+    ) as mock_recorded_states:
+        await asyncio.gather(
+            recent.async_track("sensor.test", max_items=10),
+            recent.async_track("sensor.test", max_items=5),
+        )
+        await recent.async_track("sensor.test", max_age=timedelta(days=1))
+
+    assert mock_recorded_states.call_count == 1
+    assert recent.async_get_last_states("sensor.test", 10) == []
@@ -311,5 +311,47 @@ async def test_reload(hass):
     assert hass.states.get("sensor.second_test")
 
 
+async def test_measure_from_recent_history(hass):
+    """Test the state changes are measured from the history kept in memory."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+
+    hass.state = ha.CoreState.not_running
+    hass.states.async_set("binary_sensor.test_id", "on")
+
+    await async_setup_component(
+        hass,
+        "sensor",
+        {
+            "sensor": {
+                "platform": "history_stats",
+                "entity_id": "binary_sensor.test_id",
+                "name": "test",
+                "state": "on",
+                "end": "{{ now() }}",
+                "duration": "01:00",
+                "type": "count",
+            },
+        },
+    )
+    await hass.async_block_till_done()
+    await hass.async_start()
+    await hass.async_block_till_done()
+
+    sensor = hass.data["sensor"].get_entity("sensor.test")
+    with patch(
+        "homeassistant.components.history.state_changes_during_period"
+    ) as mock_state_changes:
+        hass.states.async_set("binary_sensor.test_id", "off")
+        hass.states.async_set("binary_sensor.test_id", "on")
+        await hass.async_block_till_done()
+
+        # Measure again even when the period did not change
+        sensor._period = (datetime.now(), datetime.now())
+        await hass.async_add_executor_job(sensor.update)
+
+    assert not mock_state_changes.called
+    assert sensor.state == 2
+
+
 def _get_fixtures_base_path():
     return path.dirname(path.dirname(path.dirname(__file__)))
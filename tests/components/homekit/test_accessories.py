@@ -38,12 +38,12 @@ from homeassistant.const import (
     ATTR_BATTERY_LEVEL,
     ATTR_ENTITY_ID,
     ATTR_SERVICE,
+    EVENT_STATE_CHANGED,
     STATE_OFF,
     STATE_ON,
     STATE_UNAVAILABLE,
     __version__,
 )
-from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 import homeassistant.util.dt as dt_util
 
 from tests.async_mock import Mock, patch
@@ -86,6 +86,7 @@ async def test_accessory_cancels_track_state_change_on_stop(hass, hk_driver):
     """Ensure homekit state changed listeners are unsubscribed on reload."""
     entity_id = "sensor.accessory"
     hass.states.async_set(entity_id, None)
+    listeners = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
     acc = HomeAccessory(
         hass, hk_driver, "Home Accessory", entity_id, 2, {"platform": "isy994"}
     )
@@ -93,9 +94,9 @@ async def test_accessory_cancels_track_state_change_on_stop(hass, hk_driver):
         "homeassistant.components.homekit.accessories.HomeAccessory.async_update_state"
     ):
         await acc.run_handler()
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS][entity_id]) == 1
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners + 1
     acc.async_stop()
-    assert entity_id not in hass.data[TRACK_STATE_CHANGE_CALLBACKS]
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners
 
 
 async def test_home_accessory(hass, hk_driver):
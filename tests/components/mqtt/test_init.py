@@ -608,6 +608,194 @@ async def test_subscribe_same_topic(hass, mqtt_client_mock, mqtt_mock):
     mqtt_client_mock.subscribe.assert_called()
 
 
+async def test_subscribe_overlapping_topics_in_order(hass, mqtt_mock):
+    """Test the subscriptions matching a message are called in order."""
+    calls = []
+
+    for topic in ("test/#", "test/state", "test/+", "other/state", "#"):
+        await mqtt.async_subscribe(
+            hass, topic, lambda msg, topic=topic: calls.append(topic)
+        )
+
+    async_fire_mqtt_message(hass, "test/state", "online")
+    await hass.async_block_till_done()
+    assert calls == ["test/#", "test/state", "test/+", "#"]
+
+
+async def test_unsubscribe_keeps_other_subscriptions(hass, mqtt_mock):
+    """Test removing a subscription keeps the others on the same topic."""
+    calls_a = MagicMock()
+    calls_b = MagicMock()
+    unsub_a = await mqtt.async_subscribe(hass, "test/+", calls_a)
+    unsub_b = await mqtt.async_subscribe(hass, "test/+", calls_b)
+
+    unsub_a()
+    async_fire_mqtt_message(hass, "test/state", "online")
+    await hass.async_block_till_done()
+    assert not calls_a.called
+    assert calls_b.called
+
+    unsub_b()
+    calls_b.reset_mock()
+    async_fire_mqtt_message(hass, "test/state", "online")
+    await hass.async_block_till_done()
+    assert not calls_b.called
+
+
+def test_subscription_matcher():
+    """Test matching topics against the subscriptions."""
+    matcher = mqtt.SubscriptionMatcher()
+    subscriptions = [
+        mqtt.Subscription(topic, None)
+        for topic in ("a/b", "a/+", "a/#", "+/b", "$SYS/#", "a/b")
+    ]
+    for subscription in subscriptions:
+        matcher.add(subscription)
+
+    assert matcher.match("a/b") == subscriptions[:4] + subscriptions[5:]
+    assert matcher.match("a") == [subscriptions[2]]
+    assert matcher.match("a/c/d") == [subscriptions[2]]
+    assert matcher.match("$SYS/uptime") == [subscriptions[4]]
+    assert matcher.match("b/c") == []
+
+    assert matcher.remove(subscriptions[0])
+    assert not matcher.remove(subscriptions[5])
+    assert not matcher.remove(subscriptions[2])
+    assert matcher.match("a/b") == [subscriptions[1], subscriptions[3]]
+
+
+async def test_receive_messages_in_batches(hass, mqtt_mock, calls, record_calls):
+    """Test the messages received by paho are handled in batches."""
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+    await mqtt.async_subscribe(hass, "test-topic", record_calls, encoding=None)
+
+    # Received before the event loop gets to handle them
+    for payload in (b"first", b"second", b"\xff"):
+        mqtt_mock()._mqtt_on_message(
+            None, None, mqtt.Message("test-topic", payload, 0, False)
+        )
+    assert not calls
+
+    await hass.async_block_till_done()
+
+    assert [call[0].payload for call in calls] == [
+        "first",
+        b"first",
+        "second",
+        b"second",
+        b"\xff",
+    ]
+    assert calls[0][0].timestamp == calls[4][0].timestamp
+
+    stats = mqtt_mock().message_stats.as_dict()
+    assert stats["batches"] == 1
+    assert stats["messages"] == 3
+    assert stats["max_batch_size"] == 3
+    assert stats["max_latency"] >= stats["mean_latency"] >= 0
+
+
+async def test_failing_callback_does_not_drop_batch(
+    hass, mqtt_mock, calls, record_calls, caplog
+):
+    """Test a subscriber that raises does not drop the other messages."""
+
+    @callback
+    def failing_callback(msg):
+        raise ValueError("Bad subscriber")
+
+    await mqtt.async_subscribe(hass, "failing-topic", failing_callback)
+    await mqtt.async_subscribe(hass, "failing-topic", record_calls)
+    await mqtt.async_subscribe(hass, "test-topic", record_calls)
+
+    for topic in ("failing-topic", "test-topic", "failing-topic", "test-topic"):
+        mqtt_mock()._mqtt_on_message(
+            None, None, mqtt.Message(topic, topic.encode(), 0, False)
+        )
+    await hass.async_block_till_done()
+
+    assert [call[0].topic for call in calls] == [
+        "failing-topic",
+        "test-topic",
+        "failing-topic",
+        "test-topic",
+    ]
+    errors = [
+        record
+        for record in caplog.records
+        if record.getMessage().startswith("Exception in")
+    ]
+    assert len(errors) == 2
+
+
+async def test_decode_payload_once_per_encoding(hass, mqtt_mock):
+    """Test the payload is decoded once for the subscriptions."""
+    calls = []
+    await mqtt.async_subscribe(hass, "test-topic", calls.append)
+    await mqtt.async_subscribe(hass, "test-topic", calls.append)
+
+    payload = MagicMock()
+    payload.decode.return_value = "decoded"
+    mqtt_mock()._mqtt_handle_message(mqtt.Message("test-topic", payload, 0, False))
+    await hass.async_block_till_done()
+
+    assert [msg.payload for msg in calls] == ["decoded", "decoded"]
+    assert payload.decode.call_count == 1
+
+
+async def test_parse_json_payload_once(hass, mqtt_mock):
+    """Test the JSON payload is parsed once for the subscriptions."""
+    calls = []
+    await mqtt.async_subscribe(hass, "test/topic", calls.append)
+    await mqtt.async_subscribe(hass, "test/+", calls.append)
+    await mqtt.async_subscribe(hass, "test/topic", calls.append, encoding=None)
+
+    with patch(
+        "homeassistant.components.mqtt.models.json.loads", wraps=json.loads
+    ) as mock_loads:
+        async_fire_mqtt_message(hass, "test/topic", '{"temperature": 21.5}')
+        await hass.async_block_till_done()
+
+        assert calls[0].json == {"temperature": 21.5}
+        assert calls[1].json is calls[0].json
+        assert calls[2].json == {"temperature": 21.5}
+        assert calls[0].template_variables == {"value_json": calls[0].json}
+
+    # Once for the decoded payloads and once for the raw payload
+    assert mock_loads.call_count == 2
+
+
+async def test_message_invalid_json_payload(hass, mqtt_mock):
+    """Test the JSON of a payload that is not valid JSON."""
+    calls = []
+    await mqtt.async_subscribe(hass, "test-topic", calls.append)
+
+    async_fire_mqtt_message(hass, "test-topic", "ON")
+    await hass.async_block_till_done()
+
+    with pytest.raises(ValueError):
+        calls[0].json
+    assert calls[0].template_variables == {}
+
+
+async def test_mqtt_ws_message_stats(hass, hass_ws_client, mqtt_mock):
+    """Test MQTT websocket message statistics."""
+    mqtt_mock().message_stats.record_batch(2, 0.5)
+    mqtt_mock().message_stats.record_batch(4, 1.5)
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 5, "type": "mqtt/message_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "batches": 2,
+        "messages": 6,
+        "mean_batch_size": 3,
+        "max_batch_size": 4,
+        "mean_latency": 1,
+        "max_latency": 1.5,
+    }
+
+
 async def test_not_calling_unsubscribe_with_active_subscribers(
     hass, mqtt_client_mock, mqtt_mock
 ):
@@ -2,10 +2,7 @@
 
 from homeassistant.components import recorder
 from homeassistant.util import dt as dt_util
-
-from tests.common import fire_time_changed
-
-DB_COMMIT_INTERVAL = 50
+from homeassistant.util.async_ import run_callback_threadsafe
 
 
 def wait_recording_done(hass):
@@ -18,6 +15,8 @@ def wait_recording_done(hass):
 
 def trigger_db_commit(hass):
     """Force the recorder to commit."""
-    for _ in range(DB_COMMIT_INTERVAL):
-        # We only commit on time change
-        fire_time_changed(hass, dt_util.utcnow())
+    # Run in the event loop so events fired before are queued first
+    # pylint: disable=protected-access
+    run_callback_threadsafe(
+        hass.loop, hass.data[recorder.DATA_INSTANCE]._async_commit, dt_util.utcnow()
+    ).result()
@@ -4,6 +4,8 @@ from datetime import datetime, timedelta
 import unittest
 
 import pytest
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import OperationalError
 
 from homeassistant.components.recorder import (
@@ -15,7 +17,12 @@ from homeassistant.components.recorder import (
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import MATCH_ALL, STATE_LOCKED, STATE_UNLOCKED
 from homeassistant.core import Context, callback
@@ -24,9 +31,10 @@ from homeassistant.util import dt as dt_util
 
 from .common import wait_recording_done
 
-from tests.async_mock import patch
+from tests.async_mock import MagicMock, patch
 from tests.common import (
     async_fire_time_changed,
+    fire_time_changed,
     get_test_home_assistant,
     init_recorder_component,
 )
@@ -371,6 +379,23 @@ def test_auto_purge(hass_recorder):
     dt_util.set_default_time_zone(original_tz)
 
 
+def test_commit_interval(hass_recorder):
+    """Test the recorder commits on its commit interval."""
+    hass = hass_recorder()
+
+    hass.states.set("test.commit", "on", {})
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).filter_by(entity_id="test.commit"))
+        assert len(states) == 1
+
+
 def test_saving_sets_old_state(hass_recorder):
     """Test saving sets old state."""
     hass = hass_recorder()
@@ -397,6 +422,129 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_states_in_one_commit(hass_recorder):
+    """Test states saved in the same commit are linked to events and old states."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {})
+    hass.states.set("test.two", "on", {})
+    hass.states.set("test.one", "off", {})
+    hass.states.remove("test.two")
+    hass.states.set("test.two", "on", {})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 5
+
+        assert [state.entity_id for state in states] == [
+            "test.one",
+            "test.two",
+            "test.one",
+            "test.two",
+            "test.two",
+        ]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id is None
+        assert states[2].old_state_id == states[0].state_id
+        assert states[3].old_state_id == states[1].state_id
+        assert states[3].state is None
+        assert states[4].old_state_id is None
+
+        for state in states:
+            assert state.event.event_type == "state_changed"
+            assert state.event.event_data == "{}"
+
+
+def test_saving_states_shares_attributes(hass_recorder):
+    """Test states with the same attributes share one attributes row."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {"unit": "W"})
+    hass.states.set("test.two", "on", {"unit": "W"})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", {"unit": "W"})
+    hass.states.set("test.two", "off", {"unit": "kW"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert len(states) == 4
+        assert all(state.attributes is None for state in states)
+        assert states[0].attributes_id == states[1].attributes_id
+        assert states[0].attributes_id == states[2].attributes_id
+        assert states[0].attributes_id != states[3].attributes_id
+        assert session.query(StateAttributes).count() == 2
+
+        assert states[2].to_native().attributes == {"unit": "W"}
+        assert states[3].to_native().attributes == {"unit": "kW"}
+
+
+def test_saving_states_looks_up_attributes_in_bulk(hass_recorder):
+    """Test the attributes missing from the cache are looked up once per commit."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    hass.states.set("test.one", "on", {"unit": "W"})
+    hass.states.set("test.two", "on", {"unit": "kW"})
+    wait_recording_done(hass)
+
+    statements = []
+
+    def count_statements(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "state_attributes" in statement:
+            statements.append(statement)
+
+    # The attributes are not cached anymore, as after a restart
+    instance._state_attributes_ids.clear()
+    sqlalchemy_event.listen(instance.engine, "before_cursor_execute", count_statements)
+    for value in range(5):
+        hass.states.set("test.one", value, {"unit": "W"})
+        hass.states.set("test.two", value, {"unit": "kW"})
+        hass.states.set("test.three", value, {"unit": "Wh"})
+    wait_recording_done(hass)
+    sqlalchemy_event.remove(instance.engine, "before_cursor_execute", count_statements)
+
+    assert len(statements) == 1
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 3
+        states = {
+            (state.entity_id, state.state): state.to_native().attributes
+            for state in session.query(States)
+        }
+    assert states[("test.one", "4")] == {"unit": "W"}
+    assert states[("test.three", "0")] == {"unit": "Wh"}
+
+
+def test_saving_advances_postgresql_sequences(hass_recorder):
+    """Test the PostgreSQL sequences are moved past the ids assigned in memory."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    hass.states.set("test.one", "on", {"unit": "W"})
+    wait_recording_done(hass)
+
+    session = MagicMock()
+    instance._advance_id_sequences(session)
+    assert not session.execute.called
+
+    with patch.object(instance.engine.dialect, "name", "postgresql"):
+        instance._advance_id_sequences(session)
+    statement = session.execute.call_args[0][0].compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    for table, column, next_id in (
+        ("events", "event_id", instance._next_event_id),
+        ("states", "state_id", instance._next_state_id),
+        ("state_attributes", "attributes_id", instance._next_attributes_id),
+    ):
+        assert (
+            f"setval(pg_get_serial_sequence('{table}', '{column}'), {next_id}, false)"
+            in str(statement)
+        )
+    assert instance._next_state_id == 2
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
@@ -463,17 +611,18 @@ def test_saving_state_with_exception(hass, hass_recorder, caplog):
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in hass.data[DATA_INSTANCE].event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+    event_session = hass.data[DATA_INSTANCE].event_session
+    execute = event_session.execute
+
+    def _throw_if_inserting_states(clause, *args, **kwargs):
+        if getattr(clause, "table", None) is States.__table__:
+            raise OperationalError("insert the state", "fake params", "forced to fail")
+        return execute(clause, *args, **kwargs)
 
     with patch("time.sleep"), patch.object(
-        hass.data[DATA_INSTANCE].event_session,
-        "flush",
-        side_effect=_throw_if_state_in_session,
+        event_session,
+        "execute",
+        side_effect=_throw_if_inserting_states,
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
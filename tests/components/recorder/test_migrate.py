@@ -1,6 +1,6 @@
 """The tests for the Recorder component."""
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.pool import StaticPool
 
 from homeassistant.bootstrap import async_setup_component
@@ -59,6 +59,22 @@ async def test_schema_migrate(hass):
         assert setup_run.called
 
 
+async def test_schema_migrate_indexes_old_state_id(hass):
+    """Test the migration indexes the link to the previous state."""
+    with patch(
+        "homeassistant.components.recorder.create_engine", new=create_engine_test
+    ):
+        await async_setup_component(
+            hass, "recorder", {"recorder": {"db_url": "sqlite://"}}
+        )
+        await hass.async_block_till_done()
+        instance = hass.data[const.DATA_INSTANCE]
+        await hass.async_add_executor_job(instance.block_till_done)
+
+    indexes = inspect(instance.engine).get_indexes("states")
+    assert "ix_states_old_state_id" in {index["name"] for index in indexes}
+
+
 def test_invalid_update():
     """Test that an invalid new version raises an exception."""
     with pytest.raises(ValueError):
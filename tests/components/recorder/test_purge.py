@@ -5,14 +5,23 @@ import unittest
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
+from homeassistant.components.recorder.purge import (
+    REPACK_TABLES,
+    purge_old_data,
+    repack_database,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
 
 from .common import wait_recording_done
 
-from tests.async_mock import patch
+from tests.async_mock import call, patch
 from tests.common import get_test_home_assistant, init_recorder_component
 
 
@@ -126,6 +135,7 @@ class TestRecorderPurge(unittest.TestCase):
                     )
                 )
 
+    @patch("homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2)
     def test_purge_old_states(self):
         """Test deleting old states."""
         self._add_test_states()
@@ -135,18 +145,76 @@ class TestRecorderPurge(unittest.TestCase):
             assert states.count() == 6
 
             # run purge_old_data()
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4)
             assert not finished
             assert states.count() == 4
 
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4)
             assert not finished
             assert states.count() == 2
 
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4)
             assert finished
             assert states.count() == 2
 
+    def test_purge_forgets_purged_old_states(self):
+        """Test the purged states are not used as the old state of new ones."""
+        self._add_test_states()
+        instance = self.hass.data[DATA_INSTANCE]
+        with session_scope(hass=self.hass) as session:
+            state_ids = [
+                state.state_id
+                for state in session.query(States.state_id).order_by(
+                    States.last_updated
+                )
+            ]
+        instance._old_state_ids.update(
+            {"test.purged": state_ids[0], "test.kept": state_ids[-1]}
+        )
+
+        while not purge_old_data(instance, 4):
+            pass
+
+        assert "test.purged" not in instance._old_state_ids
+        assert instance._old_state_ids["test.kept"] == state_ids[-1]
+
+    def test_purge_old_state_attributes(self):
+        """Test deleting attributes that are no longer used by any state."""
+        now = datetime.now()
+        eleven_days_ago = now - timedelta(days=11)
+        wait_recording_done(self.hass)
+
+        with session_scope(hass=self.hass) as session:
+            for attributes_id, timestamp in ((1000, eleven_days_ago), (1001, now)):
+                session.add(
+                    StateAttributes(
+                        attributes_id=attributes_id,
+                        hash=attributes_id,
+                        shared_attrs=json.dumps({"test_attr": attributes_id}),
+                    )
+                )
+                session.add(
+                    States(
+                        entity_id="test.recorder2",
+                        domain="sensor",
+                        state="on",
+                        attributes_id=attributes_id,
+                        last_changed=timestamp,
+                        last_updated=timestamp,
+                        created=timestamp,
+                    )
+                )
+
+        with session_scope(hass=self.hass) as session:
+            while not purge_old_data(self.hass.data[DATA_INSTANCE], 4):
+                pass
+
+            attributes = session.query(StateAttributes.attributes_id).filter(
+                StateAttributes.attributes_id >= 1000
+            )
+            assert [row.attributes_id for row in attributes] == [1001]
+
+    @patch("homeassistant.components.recorder.purge.MAX_ROWS_TO_PURGE", 2)
     def test_purge_old_events(self):
         """Test deleting old events."""
         self._add_test_events()
@@ -156,16 +224,16 @@ class TestRecorderPurge(unittest.TestCase):
             assert events.count() == 6
 
             # run purge_old_data()
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4)
             assert not finished
             assert events.count() == 4
 
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4)
             assert not finished
             assert events.count() == 2
 
             # we should only have 2 events left
-            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4, repack=False)
+            finished = purge_old_data(self.hass.data[DATA_INSTANCE], 4)
             assert finished
             assert events.count() == 2
 
@@ -231,8 +299,26 @@ class TestRecorderPurge(unittest.TestCase):
                 self.hass.services.call("recorder", "purge", service_data=service_data)
                 self.hass.block_till_done()
                 self.hass.data[DATA_INSTANCE].block_till_done()
+                # The purge and the repack are resumed from the queue
+                wait_recording_done(self.hass)
                 wait_recording_done(self.hass)
                 assert (
-                    mock_logger.debug.mock_calls[5][1][0]
-                    == "Vacuuming SQL DB to free space"
+                    call("Vacuuming SQL DB to free space")
+                    in mock_logger.debug.mock_calls
                 )
+
+    def test_repack_database(self):
+        """Test the repack switches SQLite to incremental vacuum."""
+        instance = self.hass.data[DATA_INSTANCE]
+        wait_recording_done(self.hass)
+
+        with patch("homeassistant.components.recorder.purge._LOGGER") as mock_logger:
+            assert repack_database(instance, REPACK_TABLES) == []
+        assert call("Vacuuming SQL DB to free space") in mock_logger.debug.mock_calls
+
+        with patch("homeassistant.components.recorder.purge._LOGGER") as mock_logger:
+            assert repack_database(instance, REPACK_TABLES) == []
+        assert (
+            call("Incrementally vacuuming SQL DB to free space")
+            in mock_logger.debug.mock_calls
+        )
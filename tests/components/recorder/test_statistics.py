@@ -0,0 +1,163 @@
+"""The tests for the recorder statistics."""
+# pylint: disable=protected-access
+from datetime import datetime, timedelta
+
+import pytest
+
+from homeassistant.components.recorder import statistics
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import Statistics, StatisticsShortTerm
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.util import dt as dt_util
+from homeassistant.util.async_ import run_callback_threadsafe
+
+from .common import wait_recording_done
+
+from tests.async_mock import patch
+from tests.common import get_test_home_assistant, init_recorder_component
+
+
+@pytest.fixture
+def hass_recorder():
+    """Home Assistant fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+
+    def setup_recorder(config=None):
+        """Set up with params."""
+        init_recorder_component(hass, config)
+        hass.start()
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+        return hass
+
+    yield setup_recorder
+    hass.stop()
+
+
+def _set_state(hass, when, entity_id, state):
+    """Set a state that was updated at a point in time."""
+    with patch("homeassistant.core.dt_util.utcnow", return_value=when):
+        hass.states.set(entity_id, state, {"unit_of_measurement": "W"})
+    wait_recording_done(hass)
+
+
+def _short_term_statistics(hass, start):
+    """Return the 5-minute statistics of a period by entity_id."""
+    with session_scope(hass=hass) as session:
+        return {
+            stat.entity_id: (stat.mean, stat.min, stat.max, stat.last)
+            for stat in session.query(StatisticsShortTerm).filter(
+                StatisticsShortTerm.start == start
+            )
+        }
+
+
+def test_compile_statistics(hass_recorder):
+    """Test compiling the 5-minute statistics of numeric sensors."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    start = datetime(2020, 10, 1, 12, 0, tzinfo=dt_util.UTC)
+
+    _set_state(hass, start + timedelta(minutes=1), "sensor.power", "10")
+    _set_state(hass, start + timedelta(minutes=2), "sensor.power", "20")
+    _set_state(hass, start + timedelta(minutes=3), "sensor.text", "on")
+    _set_state(hass, start + timedelta(minutes=3), "light.kitchen", "5")
+
+    statistics.compile_statistics(instance, start)
+    # Compiling the same period again does nothing
+    statistics.compile_statistics(instance, start)
+
+    assert _short_term_statistics(hass, start) == {
+        # 10 during 1 minute and 20 during 3 minutes
+        "sensor.power": (17.5, 10.0, 20.0, 20.0),
+    }
+
+    # The last value is kept for the next period without changes
+    next_start = start + timedelta(minutes=5)
+    statistics.compile_statistics(instance, next_start)
+    assert _short_term_statistics(hass, next_start) == {
+        "sensor.power": (20.0, 20.0, 20.0, 20.0),
+    }
+
+
+def test_compile_statistics_of_removed_entity(hass_recorder):
+    """Test the last value of a removed entity is not kept forever."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    start = datetime(2020, 10, 1, 12, 0, tzinfo=dt_util.UTC)
+
+    _set_state(hass, start + timedelta(minutes=1), "sensor.power", "10")
+    _set_state(hass, start + timedelta(minutes=1), "sensor.removed", "5")
+    statistics.compile_statistics(instance, start)
+
+    next_start = start + timedelta(minutes=5)
+    statistics.compile_statistics(instance, next_start, {"sensor.power"})
+    assert _short_term_statistics(hass, next_start) == {
+        "sensor.power": (10.0, 10.0, 10.0, 10.0),
+    }
+
+    last_start = next_start + timedelta(minutes=5)
+    statistics.compile_statistics(instance, last_start, {"sensor.power"})
+    assert list(_short_term_statistics(hass, last_start)) == ["sensor.power"]
+
+
+def test_statistics_task_passes_existing_entities(hass_recorder):
+    """Test the statistics task only keeps the sensors that still exist."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    hass.states.set("sensor.power", "10")
+    hass.states.set("light.kitchen", "on")
+
+    with patch.object(instance, "queue") as mock_queue:
+        run_callback_threadsafe(
+            hass.loop,
+            instance._async_five_minute,
+            datetime(2020, 10, 1, 12, 7, tzinfo=dt_util.UTC),
+        ).result()
+
+    task = mock_queue.put.call_args[0][0]
+    assert task.start == datetime(2020, 10, 1, 12, 0, tzinfo=dt_util.UTC)
+    assert task.entity_ids == {"sensor.power"}
+
+
+def test_compile_hourly_statistics(hass_recorder):
+    """Test the hourly statistics are compiled after the last 5 minutes."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    start = datetime(2020, 10, 1, 12, 0, tzinfo=dt_util.UTC)
+
+    _set_state(hass, start, "sensor.power", "10")
+    _set_state(hass, start + timedelta(minutes=30), "sensor.power", "40")
+    _set_state(hass, start + timedelta(minutes=35), "sensor.power", "0")
+
+    for minutes in range(0, 60, 5):
+        statistics.compile_statistics(instance, start + timedelta(minutes=minutes))
+
+    stats = statistics.statistics_during_period(hass, start, start + timedelta(hours=1))
+    assert list(stats) == ["sensor.power"]
+    stat = stats["sensor.power"][0]
+    assert stat.mean == pytest.approx((10 * 6 + 40 + 0 * 5) / 12)
+    assert stat.min == 0
+    assert stat.max == 40
+    assert stat.last == 0
+
+
+def test_purge_keeps_hourly_statistics(hass_recorder):
+    """Test the purge removes the 5-minute statistics only."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        days=11
+    )
+
+    _set_state(hass, start, "sensor.power", "10")
+    for minutes in range(0, 60, 5):
+        statistics.compile_statistics(instance, start + timedelta(minutes=minutes))
+
+    while not purge_old_data(instance, 4):
+        pass
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StatisticsShortTerm).count() == 0
+        assert session.query(Statistics).count() == 1
@@ -8,6 +8,7 @@ import pytest
 
 from homeassistant import config as hass_config
 from homeassistant.components import recorder
+from homeassistant.components.history.recent import BEGINNING
 from homeassistant.components.statistics.sensor import DOMAIN, StatisticsSensor
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
@@ -15,6 +16,7 @@ from homeassistant.const import (
     STATE_UNKNOWN,
     TEMP_CELSIUS,
 )
+from homeassistant.core import State
 from homeassistant.setup import async_setup_component, setup_component
 from homeassistant.util import dt as dt_util
 
@@ -451,6 +453,45 @@ class TestStatisticsSensor(unittest.TestCase):
         )
 
 
+async def test_initialize_while_source_changes(hass):
+    """Test a state set while seeding from the database is only counted once."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    recorded = State(
+        "sensor.test_monitored",
+        "10",
+        last_updated=dt_util.utcnow() - timedelta(minutes=1),
+    )
+
+    def get_recorded_states(*args):
+        # The mocked job runs in the loop, like a state set while seeding
+        hass.states.async_set("sensor.test_monitored", 20)
+        return [recorded], BEGINNING
+
+    with patch(
+        "homeassistant.components.history.recent._get_recorded_states",
+        side_effect=get_recorded_states,
+    ):
+        await async_setup_component(
+            hass,
+            "sensor",
+            {
+                "sensor": {
+                    "platform": "statistics",
+                    "name": "test",
+                    "entity_id": "sensor.test_monitored",
+                    "sampling_size": 100,
+                }
+            },
+        )
+        await hass.async_block_till_done()
+        await hass.async_start()
+        await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert state.attributes["count"] == 2
+    assert state.state == "15.0"
+
+
 async def test_reload(hass):
     """Verify we can reload filter sensors."""
     await hass.async_add_executor_job(
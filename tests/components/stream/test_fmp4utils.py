@@ -0,0 +1,40 @@
+"""The tests for the fragmented mp4 utilities."""
+import io
+
+from homeassistant.components.stream.fmp4utils import get_fmp4_views, get_init, get_m4s
+
+
+def _box(box_type, payload=b""):
+    """Return a mp4 box."""
+    return (8 + len(payload)).to_bytes(4, byteorder="big") + box_type + payload
+
+
+def test_get_fmp4_views():
+    """Test the views of a fragmented mp4 match the copied sections."""
+    segment = io.BytesIO(
+        _box(b"ftyp", b"isom")
+        + _box(b"moov", _box(b"trak"))
+        + _box(b"moof", _box(b"mfhd", b"\x00" * 8))
+        + _box(b"mdat", b"frame data")
+        + _box(b"mfra")
+    )
+
+    init, m4s = get_fmp4_views(segment)
+
+    assert init.readonly
+    assert init == get_init(segment)
+    assert m4s == get_m4s(segment, 1)
+    assert m4s.obj is init.obj
+
+    # The segment is not locked by the views
+    init_section = bytes(init)
+    segment.truncate(0)
+    segment.close()
+    assert init == init_section
+
+
+def test_get_fmp4_views_not_fragmented():
+    """Test there are no views of a mp4 that is not fragmented."""
+    segment = io.BytesIO(_box(b"ftyp", b"isom") + _box(b"moov") + _box(b"mdat"))
+
+    assert get_fmp4_views(segment) == (None, None)
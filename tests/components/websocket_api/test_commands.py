@@ -806,3 +806,58 @@ async def test_test_condition(hass, websocket_client):
     assert msg["type"] == const.TYPE_RESULT
     assert msg["success"]
     assert msg["result"]["result"] is True
+
+
+async def test_template_profiler(hass, websocket_client):
+    """Test profiling the renders of the templates."""
+    hass.states.async_set("light.test", "on")
+
+    await websocket_client.send_json(
+        {"id": 5, "type": "template/profiler", "enable": True}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"] == {"enabled": True, "templates": []}
+
+    await websocket_client.send_json(
+        {
+            "id": 6,
+            "type": "render_template",
+            "template": "State is: {{ states('light.test') }}",
+        }
+    )
+    await websocket_client.receive_json()
+    await websocket_client.receive_json()
+
+    hass.states.async_set("light.test", "off")
+    await websocket_client.receive_json()
+
+    await websocket_client.send_json({"id": 7, "type": "template/profiler"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"]["enabled"]
+    stats = msg["result"]["templates"][0]
+    assert stats["template"] == "State is: {{ states('light.test') }}"
+    assert stats["render_count"] == 2
+    assert stats["error_count"] == 0
+    assert stats["triggers"] == {"refresh": 1, "entity": 1}
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "template/profiler", "enable": False}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["result"] == {"enabled": False, "templates": []}
+
+
+async def test_template_profiler_requires_admin(
+    hass, websocket_client, hass_admin_user
+):
+    """Test only the administrators can profile the templates."""
+    hass_admin_user.groups = []
+
+    await websocket_client.send_json(
+        {"id": 5, "type": "template/profiler", "enable": True}
+    )
+    msg = await websocket_client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
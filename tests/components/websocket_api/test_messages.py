@@ -1,8 +1,14 @@
 """Test Websocket API messages module."""
 
+import json
+
+from homeassistant.components.websocket_api.const import JSON_DUMP
 from homeassistant.components.websocket_api.messages import (
+    _cached_event_message,
     cached_event_message,
     message_to_json,
+    result_message,
+    states_result_message,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.core import callback
@@ -25,6 +31,8 @@ async def test_cached_event_message(hass):
 
     assert len(events) == 2
 
+    _cached_event_message.cache_clear()
+
     msg0 = cached_event_message(2, events[0])
     assert msg0 == cached_event_message(2, events[0])
 
@@ -33,18 +41,71 @@ async def test_cached_event_message(hass):
 
     assert msg0 != msg1
 
-    cache_info = cached_event_message.cache_info()
+    cache_info = _cached_event_message.cache_info()
     assert cache_info.hits == 2
     assert cache_info.misses == 2
     assert cache_info.currsize == 2
 
     cached_event_message(2, events[1])
-    cache_info = cached_event_message.cache_info()
+    cache_info = _cached_event_message.cache_info()
     assert cache_info.hits == 3
     assert cache_info.misses == 2
     assert cache_info.currsize == 2
 
 
+async def test_cached_event_message_shared_by_subscriptions(hass):
+    """Test that subscriptions with different ids share the cached event."""
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on", {"id": "__IDEN__"})
+    await hass.async_block_till_done()
+
+    _cached_event_message.cache_clear()
+
+    msg2 = cached_event_message(2, events[0])
+    msg12 = cached_event_message(12, events[0])
+
+    assert json.loads(msg2) == {
+        "id": 2,
+        "type": "event",
+        "event": json.loads(JSON_DUMP(events[0])),
+    }
+    assert json.loads(msg12)["id"] == 12
+    assert json.loads(msg12)["event"] == json.loads(msg2)["event"]
+
+    cache_info = _cached_event_message.cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 1
+
+
+async def test_states_result_message(hass):
+    """Test the states result message reuses the json of the states."""
+    hass.states.async_set("light.window", "on", {"brightness": 100})
+    hass.states.async_set("light.door", "off")
+    states = hass.states.async_all()
+
+    msg = states_result_message(5, states)
+
+    assert json.loads(msg) == json.loads(JSON_DUMP(result_message(5, states)))
+    assert all(state._as_json is not None for state in states)
+
+
+async def test_states_result_message_invalid_state(hass, caplog):
+    """Test the states result message with a state that is not valid json."""
+    hass.states.async_set("sensor.power", "on", {"power": float("nan")})
+
+    msg = states_result_message(5, hass.states.async_all())
+
+    assert json.loads(msg)["error"]["code"] == "unknown_error"
+    assert "Unable to serialize to JSON" in caplog.text
+
+
 async def test_message_to_json(caplog):
     """Test we can serialize websocket messages."""
 
@@ -3,6 +3,9 @@
 from homeassistant.bootstrap import async_setup_component
 from homeassistant.components.websocket_api.auth import TYPE_AUTH_REQUIRED
 from homeassistant.components.websocket_api.http import URL
+from homeassistant.const import STATE_UNKNOWN
+from homeassistant.helpers.template import Template
+from homeassistant.helpers.template_profiler import async_enable_template_profiler
 
 from .test_auth import test_auth_active_with_token
 
@@ -36,3 +39,24 @@ async def test_websocket_api(hass, aiohttp_client, hass_access_token, legacy_aut
 
     state = hass.states.get("sensor.connected_clients")
     assert state.state == "0"
+
+
+async def test_template_render_time(hass):
+    """Test the render time of the profiled templates."""
+    await async_setup_component(
+        hass, "sensor", {"sensor": {"platform": "websocket_api"}}
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.template_render_time")
+    assert state.state == STATE_UNKNOWN
+
+    async_enable_template_profiler(hass)
+    Template("{{ 1 + 1 }}", hass).async_render()
+    await hass.helpers.entity_component.async_update_entity(
+        "sensor.template_render_time"
+    )
+
+    state = hass.states.get("sensor.template_render_time")
+    assert float(state.state) >= 0
+    assert state.attributes["slowest_templates"][0]["template"] == "{{ 1 + 1 }}"
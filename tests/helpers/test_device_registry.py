@@ -370,6 +370,48 @@ async def test_deleted_device_removing_area_id(registry):
     assert entry_w_area != entry_wo_area
 
 
+async def test_entries_for_area_and_config_entry(registry):
+    """Test the devices of an area and a config entry follow their updates."""
+    entry1 = registry.async_get_or_create(
+        config_entry_id="123", identifiers={("bridgeid", "0123")}
+    )
+    entry2 = registry.async_get_or_create(
+        config_entry_id="456", identifiers={("bridgeid", "4567")}
+    )
+    registry.async_get_or_create(
+        config_entry_id="456", identifiers={("bridgeid", "0123")}
+    )
+    registry.async_update_device(entry1.id, area_id="kitchen")
+    registry.async_update_device(entry2.id, area_id="kitchen")
+
+    assert [
+        device.id
+        for device in device_registry.async_entries_for_area(registry, "kitchen")
+    ] == [entry1.id, entry2.id]
+    assert [
+        device.id
+        for device in device_registry.async_entries_for_config_entry(registry, "456")
+    ] == [entry1.id, entry2.id]
+
+    registry.async_update_device(entry1.id, area_id="bedroom")
+    registry.async_update_device(entry1.id, remove_config_entry_id="456")
+
+    assert device_registry.async_entries_for_area(registry, "kitchen") == [
+        registry.async_get(entry2.id)
+    ]
+    assert device_registry.async_entries_for_area(registry, "bedroom") == [
+        registry.async_get(entry1.id)
+    ]
+    assert device_registry.async_entries_for_config_entry(registry, "456") == [
+        registry.async_get(entry2.id)
+    ]
+
+    registry.async_remove_device(entry2.id)
+
+    assert device_registry.async_entries_for_area(registry, "kitchen") == []
+    assert device_registry.async_entries_for_config_entry(registry, "456") == []
+
+
 async def test_specifying_via_device_create(registry):
     """Test specifying a via_device and updating."""
     via = registry.async_get_or_create(
@@ -16,7 +16,7 @@ from homeassistant.helpers.entity_component import (
 )
 import homeassistant.util.dt as dt_util
 
-from tests.async_mock import Mock, patch
+from tests.async_mock import AsyncMock, Mock, patch
 from tests.common import (
     MockConfigEntry,
     MockEntity,
@@ -90,6 +90,84 @@ async def test_polling_updates_entities_with_exception(hass):
     assert len(update_err) == 1
 
 
+async def test_polling_bulk_updates_entities(hass):
+    """Test the platform updates all its polling entities at once."""
+    updates = []
+
+    def update_entities(hass, entities):
+        """Mock the update of all the entities."""
+        updates.append(entities)
+        for entity in entities:
+            entity._values["state"] = len(updates)
+
+    ent1 = MockEntity(should_poll=True, name="ent1")
+    ent2 = MockEntity(should_poll=True, name="ent2")
+    no_poll_ent = MockEntity(should_poll=False, name="ent3")
+
+    platform = MockPlatform(
+        async_setup_platform=AsyncMock(
+            side_effect=lambda hass, config, add_entities, discovery_info: add_entities(
+                [ent1, ent2, no_poll_ent]
+            )
+        )
+    )
+    platform.update_entities = update_entities
+    mock_entity_platform(hass, "test_domain.platform", platform)
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    with patch(
+        "homeassistant.helpers.entity_platform.random.uniform", return_value=5
+    ) as mock_uniform:
+        await component.async_setup({DOMAIN: {"platform": "platform"}})
+        await hass.async_block_till_done()
+    assert mock_uniform.call_args[0] == (0, 20)
+
+    # The first poll is delayed by the jitter of the platform
+    start = dt_util.utcnow()
+    async_fire_time_changed(hass, start + timedelta(seconds=4))
+    await hass.async_block_till_done()
+    assert updates == []
+
+    async_fire_time_changed(hass, start + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert updates == [[ent1, ent2]]
+    assert hass.states.get("test_domain.ent1").state == "1"
+    assert hass.states.get("test_domain.ent2").state == "1"
+
+    async_fire_time_changed(hass, start + timedelta(seconds=27))
+    await hass.async_block_till_done()
+    assert len(updates) == 2
+    assert hass.states.get("test_domain.ent2").state == "2"
+
+
+async def test_polling_bulk_updates_entities_with_exception(hass, caplog):
+    """Test the failed update of a platform keeps the entity states."""
+    ent = MockEntity(should_poll=True, name="ent", state="initial")
+    platform = MockPlatform(
+        async_setup_platform=AsyncMock(
+            side_effect=lambda hass, config, add_entities, discovery_info: add_entities(
+                [ent]
+            )
+        )
+    )
+    platform.async_update_entities = AsyncMock(
+        side_effect=AssertionError("Fake error update")
+    )
+    mock_entity_platform(hass, "test_domain.platform", platform)
+    component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
+
+    with patch("homeassistant.helpers.entity_platform.random.uniform", return_value=0):
+        await component.async_setup({DOMAIN: {"platform": "platform"}})
+        await hass.async_block_till_done()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    platform.async_update_entities.assert_called_once_with(hass, [ent])
+    assert hass.states.get("test_domain.ent").state == "initial"
+    assert "Update for platform test_domain fails" in caplog.text
+
+
 async def test_update_state_adds_entities(hass):
     """Test if updating poll entities cause an entity to be added works."""
     component = EntityComponent(_LOGGER, DOMAIN, hass)
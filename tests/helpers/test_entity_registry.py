@@ -330,6 +330,45 @@ async def test_removing_config_entry_id(hass, registry, update_events):
     assert update_events[1]["entity_id"] == entry.entity_id
 
 
+async def test_entries_for_device_and_config_entry(registry):
+    """Test the entities of a device and a config entry follow their updates."""
+    mock_config = MockConfigEntry(domain="light", entry_id="mock-id-1")
+    entry1 = registry.async_get_or_create(
+        "light", "hue", "1234", config_entry=mock_config, device_id="device-1"
+    )
+    entry2 = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=mock_config, device_id="device-1"
+    )
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [
+        entry1,
+        entry2,
+    ]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry1,
+        entry2,
+    ]
+
+    entry1 = registry.async_get_or_create("light", "hue", "1234", device_id="device-2")
+    entry2 = registry.async_update_entity(
+        entry2.entity_id, new_entity_id="light.renamed"
+    )
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == [entry2]
+    assert entity_registry.async_entries_for_device(registry, "device-2") == [entry1]
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry1,
+        entry2,
+    ]
+
+    registry.async_remove(entry2.entity_id)
+
+    assert entity_registry.async_entries_for_device(registry, "device-1") == []
+    assert entity_registry.async_entries_for_config_entry(registry, "mock-id-1") == [
+        entry1
+    ]
+
+
 async def test_migration(hass):
     """Test migration from old data to new."""
     mock_config = MockConfigEntry(domain="test-platform", entry_id="test-config-id")
@@ -14,6 +14,7 @@ from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    TRACK_TIME_PATTERN_SCHEDULE,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
@@ -2223,6 +2224,87 @@ async def test_async_track_time_change(hass):
     assert len(wildcard_runs) == 3
 
 
+async def test_time_patterns_share_loop_timer(hass):
+    """Test time patterns firing in the same second share a loop timer."""
+    runs = []
+
+    now = dt_util.utcnow()
+
+    time_that_will_not_match_right_away = datetime(
+        now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC
+    )
+
+    with patch(
+        "homeassistant.util.dt.utcnow", return_value=time_that_will_not_match_right_away
+    ):
+        unsubs = [
+            async_track_utc_time_change(
+                hass, callback(lambda x: runs.append(x)), minute="/5", second=0
+            )
+            for _ in range(10)
+        ]
+
+    schedule = hass.data[TRACK_TIME_PATTERN_SCHEDULE]
+    assert len(schedule) == 1
+    assert len(next(iter(schedule.values()))[1]) == 10
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert len(runs) == 10
+    assert len(schedule) == 1
+
+    for unsub in unsubs:
+        unsub()
+
+    assert schedule == {}
+
+
+async def test_time_pattern_removed_by_pattern_in_same_second(hass):
+    """Test a time pattern removed by another one firing in the same second."""
+    runs = []
+    unsubs = []
+
+    now = dt_util.utcnow()
+
+    time_that_will_not_match_right_away = datetime(
+        now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC
+    )
+
+    @callback
+    def remove_second(now):
+        runs.append("first")
+        unsubs[1]()
+
+    with patch(
+        "homeassistant.util.dt.utcnow", return_value=time_that_will_not_match_right_away
+    ):
+        unsubs.append(
+            async_track_utc_time_change(hass, remove_second, minute="/5", second=0)
+        )
+        unsubs.append(
+            async_track_utc_time_change(
+                hass, callback(lambda x: runs.append("second")), minute="/5", second=0
+            )
+        )
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert runs == ["first"]
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 5, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert runs == ["first", "first"]
+
+    unsubs[0]()
+    assert hass.data[TRACK_TIME_PATTERN_SCHEDULE] == {}
+
+
 async def test_periodic_task_minute(hass):
     """Test periodic tasks per minute."""
     specific_runs = []
@@ -0,0 +1,37 @@
+"""Test the index of the referenced entities and devices."""
+from homeassistant.helpers.reference_index import (
+    ReferenceIndex,
+    async_get_reference_index,
+)
+
+
+async def test_get_reference_index(hass):
+    """Test there is one index by domain."""
+    index = async_get_reference_index(hass, "automation")
+    assert async_get_reference_index(hass, "automation") is index
+    assert async_get_reference_index(hass, "script") is not index
+
+
+def test_reference_index():
+    """Test the references are indexed and removed by referrer."""
+    index = ReferenceIndex()
+    index.async_add("automation.first", ["light.kitchen", "light.hall"], ["device-1"])
+    index.async_add("automation.second", ["light.kitchen"])
+
+    assert index.async_referencing_entity("light.kitchen") == [
+        "automation.first",
+        "automation.second",
+    ]
+    assert index.async_referencing_entity("light.hall") == ["automation.first"]
+    assert index.async_referencing_device("device-1") == ["automation.first"]
+    assert index.async_referencing_entity("light.unknown") == []
+
+    # Adding the references again replaces the previous ones
+    index.async_add("automation.first", ["light.hall"])
+    assert index.async_referencing_entity("light.kitchen") == ["automation.second"]
+    assert index.async_referencing_device("device-1") == []
+
+    index.async_remove("automation.first")
+    index.async_remove("automation.unknown")
+    assert index.async_referencing_entity("light.hall") == []
+    assert index.async_referencing_entity("light.kitchen") == ["automation.second"]
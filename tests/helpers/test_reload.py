@@ -9,14 +9,19 @@ from homeassistant.const import SERVICE_RELOAD
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.reload import (
     async_get_platform,
+    async_hash_config,
     async_integration_yaml_config,
+    async_reload_changed_entities,
     async_reload_integration_platforms,
     async_setup_reload_service,
 )
+from homeassistant.helpers.script_variables import ScriptVariables
+from homeassistant.helpers.template import Template
 from homeassistant.loader import async_get_integration
 
 from tests.async_mock import AsyncMock, Mock, patch
 from tests.common import (
+    MockEntity,
     MockModule,
     MockPlatform,
     mock_entity_platform,
@@ -240,3 +245,55 @@ async def test_async_integration_missing_yaml_config(hass):
 
 def _get_fixtures_base_path():
     return path.dirname(path.dirname(__file__))
+
+
+def test_hash_config():
+    """Test the hash of a validated config only depends on its values."""
+
+    def make_config(value):
+        return {
+            "value_template": Template(value),
+            "variables": ScriptVariables({"value": Template(value)}),
+        }
+
+    assert async_hash_config(make_config("{{ 1 }}")) == async_hash_config(
+        make_config("{{ 1 }}")
+    )
+    assert async_hash_config(make_config("{{ 1 }}")) != async_hash_config(
+        make_config("{{ 2 }}")
+    )
+    assert async_hash_config({("not", "json"): 1}) is None
+
+
+async def test_reload_changed_entities(hass):
+    """Test only the entities whose config changed are replaced."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+    created = []
+
+    async def async_create_entity(config):
+        if config.get("skip"):
+            return None
+        created.append(config["name"])
+        return MockEntity(name=config["name"])
+
+    await async_reload_changed_entities(
+        component,
+        [{"name": "first"}, {"name": "second"}, {"name": "third"}],
+        async_create_entity,
+    )
+    assert created == ["first", "second", "third"]
+    first = component.get_entity(f"{DOMAIN}.first")
+
+    created.clear()
+    entities = await async_reload_changed_entities(
+        component,
+        [{"name": "first"}, {"name": "second", "new": True}, {"skip": True}],
+        async_create_entity,
+    )
+    assert created == ["second"]
+    assert [entity.entity_id for entity in entities] == [f"{DOMAIN}.second"]
+    assert component.get_entity(f"{DOMAIN}.first") is first
+    assert sorted(hass.states.async_entity_ids(DOMAIN)) == [
+        f"{DOMAIN}.first",
+        f"{DOMAIN}.second",
+    ]
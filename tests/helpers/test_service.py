@@ -560,6 +560,30 @@ async def test_call_no_context_target_specific(
     assert mock_handle_entity_call.mock_calls[0][1][1].entity_id == "light.kitchen"
 
 
+async def test_call_no_context_target_specific_platforms(
+    hass, mock_handle_entity_call, mock_entities
+):
+    """Check we look up the targeted entities of each platform."""
+    entities = list(mock_entities.values())
+    await service.entity_service_call(
+        hass,
+        [
+            Mock(entities={entity.entity_id: entity for entity in entities[:1]}),
+            Mock(entities={entity.entity_id: entity for entity in entities[1:]}),
+        ],
+        Mock(),
+        ha.ServiceCall(
+            "test_domain",
+            "test_service",
+            {"entity_id": ["light.kitchen", "light.bedroom", "light.non-existing"]},
+        ),
+    )
+
+    assert sorted(
+        call[1][1].entity_id for call in mock_handle_entity_call.mock_calls
+    ) == ["light.bedroom", "light.kitchen"]
+
+
 async def test_call_with_match_all(
     hass, mock_handle_entity_call, mock_entities, caplog
 ):
@@ -723,6 +723,19 @@ def test_render_with_possible_json_value_with_valid_json(hass):
     assert tpl.async_render_with_possible_json_value('{"hello": "world"}') == "world"
 
 
+def test_render_with_possible_json_value_with_parsed_json(hass):
+    """Render with possible JSON value with the JSON already parsed."""
+    tpl = template.Template("{{ value_json.hello }}", hass)
+    with patch("homeassistant.helpers.template.json.loads") as mock_loads:
+        assert (
+            tpl.async_render_with_possible_json_value(
+                '{"hello": "world"}', variables={"value_json": {"hello": "parsed"}}
+            )
+            == "parsed"
+        )
+    assert not mock_loads.called
+
+
 def test_render_with_possible_json_value_with_invalid_json(hass):
     """Render with possible JSON value with invalid JSON."""
     tpl = template.Template("{{ value_json }}", hass)
@@ -2608,3 +2621,47 @@ async def test_unavailable_states(hass):
         hass,
     )
     assert tpl.async_render() == "light.none, light.unavailable, light.unknown"
+
+
+def test_templates_share_compiled_template(hass):
+    """Test the templates with the same source share their compiled template."""
+    tpl = template.Template("{{ states('sensor.test') }}", hass)
+    other = template.Template("{{ states('sensor.test') }}", hass)
+    different = template.Template("{{ states('sensor.other') }}", hass)
+
+    tpl.async_render()
+    other.async_render()
+    different.async_render()
+
+    assert tpl._compiled is other._compiled
+    assert tpl._compiled is not different._compiled
+
+
+async def test_render_to_info_memoized(hass):
+    """Test the render info is reused until a state it used changes."""
+    hass.states.async_set("sensor.test", "1")
+    hass.states.async_set("sensor.other", "1")
+    tpl = template.Template("{{ states('sensor.test') }}", hass)
+
+    info = tpl.async_render_to_info()
+    assert_result_info(info, "1", {"sensor.test"})
+    hass.states.async_set("sensor.other", "2")
+    assert tpl.async_render_to_info() is info
+
+    hass.states.async_set("sensor.test", "2")
+    info = tpl.async_render_to_info()
+    assert_result_info(info, "2", {"sensor.test"})
+
+    # The render info depends on the variables
+    assert tpl.async_render_to_info({"var": 1}) is not info
+    assert tpl.async_render_to_info() is not info
+
+
+async def test_render_to_info_not_memoized_when_volatile(hass):
+    """Test the render info is not reused when it can change on its own."""
+    hass.states.async_set("sensor.test", "1")
+    tpl = template.Template("{{ states('sensor.test') }} {{ utcnow() }}", hass)
+
+    info = tpl.async_render_to_info()
+    assert info.volatile
+    assert tpl.async_render_to_info() is not info
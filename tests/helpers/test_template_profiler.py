@@ -0,0 +1,61 @@
+"""Test the template profiler."""
+import pytest
+
+from homeassistant.helpers import template
+from homeassistant.helpers.template_profiler import (
+    async_disable_template_profiler,
+    async_enable_template_profiler,
+    async_get_template_profiler,
+)
+
+
+async def test_profiler_disabled(hass):
+    """Test nothing is recorded when the profiler is disabled."""
+    assert async_get_template_profiler(hass) is None
+    assert template.Template("{{ 1 }}", hass).async_render() == "1"
+    assert async_get_template_profiler(hass) is None
+
+
+async def test_profiler_records_renders(hass):
+    """Test the renders and their errors are recorded by template."""
+    profiler = async_enable_template_profiler(hass)
+    assert async_get_template_profiler(hass) is profiler
+    assert async_enable_template_profiler(hass) is profiler
+
+    hass.states.async_set("sensor.test", "on")
+    tpl = template.Template("{{ states('sensor.test') }}", hass)
+    failing = template.Template("{{ 1 / 0 }}", hass)
+    for _ in range(3):
+        tpl.async_render()
+    with pytest.raises(ZeroDivisionError):
+        failing.async_render()
+
+    report = {stats["template"]: stats for stats in profiler.async_report()}
+    assert report[tpl.template]["render_count"] == 3
+    assert report[tpl.template]["error_count"] == 0
+    assert report[failing.template]["render_count"] == 1
+    assert report[failing.template]["error_count"] == 1
+    assert len(profiler.async_report(1)) == 1
+
+    async_disable_template_profiler(hass)
+    assert async_get_template_profiler(hass) is None
+
+
+async def test_profiler_report_order_and_percentiles(hass):
+    """Test the report is sorted by total time with the percentiles in ms."""
+    profiler = async_enable_template_profiler(hass)
+    for duration in range(1, 21):
+        profiler.async_record_render("slow", duration / 1000, False)
+    profiler.async_record_render("fast", 0.0005, False)
+    profiler.async_record_trigger("fast", "entity")
+    profiler.async_record_trigger("fast", "entity")
+
+    slow, fast = profiler.async_report()
+    assert slow["template"] == "slow"
+    assert slow["render_count"] == 20
+    assert slow["total_time"] == 210.0
+    assert slow["median_time"] == 10.0
+    assert slow["p95_time"] == 19.0
+    assert slow["max_time"] == 20.0
+    assert fast["template"] == "fast"
+    assert fast["triggers"] == {"entity": 2}
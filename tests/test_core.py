@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -34,6 +35,7 @@ from homeassistant.const import (
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import InvalidEntityFormatError, InvalidStateError
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -151,6 +153,65 @@ def test_async_run_job_delegates_non_async():
     assert len(hass.async_add_job.mock_calls) == 1
 
 
+def test_hassjob_job_type():
+    """Test HassJob pre-classifies the target."""
+
+    async def coro_job():
+        """Coroutine function job."""
+
+    def executor_job():
+        """Executor job."""
+
+    assert ha.HassJob(coro_job).job_type == ha.HassJobType.Coroutinefunction
+    assert (
+        ha.HassJob(functools.partial(coro_job)).job_type
+        == ha.HassJobType.Coroutinefunction
+    )
+    assert ha.HassJob(ha.callback(Mock())).job_type == ha.HassJobType.Callback
+    assert ha.HassJob(executor_job).job_type == ha.HassJobType.Executor
+
+
+def test_hassjob_forbids_coroutine():
+    """Test hassjob forbids coroutines."""
+
+    async def bla():
+        pass
+
+    coro = bla()
+
+    with pytest.raises(ValueError):
+        ha.HassJob(coro)
+
+    # To avoid warning about unawaited coro
+    coro.close()
+
+
+def test_async_run_hass_job_calls_callback():
+    """Test that the callback annotation is respected."""
+    hass = MagicMock()
+    calls = []
+
+    def job():
+        calls.append(1)
+
+    ha.HomeAssistant.async_run_hass_job(hass, ha.HassJob(ha.callback(job)))
+    assert len(calls) == 1
+    assert len(hass.async_add_hass_job.mock_calls) == 0
+
+
+def test_async_run_hass_job_delegates_non_async():
+    """Test that the callback annotation is respected."""
+    hass = MagicMock()
+    calls = []
+
+    def job():
+        calls.append(1)
+
+    ha.HomeAssistant.async_run_hass_job(hass, ha.HassJob(job))
+    assert len(calls) == 0
+    assert len(hass.async_add_hass_job.mock_calls) == 1
+
+
 def test_stage_shutdown():
     """Simulate a shutdown, test calling stuff."""
     hass = get_test_home_assistant()
@@ -454,6 +515,156 @@ class TestEventBus(unittest.TestCase):
         assert len(coroutine_calls) == 1
 
 
+async def test_eventbus_runs_callbacks_inline(hass):
+    """Test callback listeners are run while the event is fired."""
+    calls = []
+
+    @ha.callback
+    def callback_listener(event):
+        calls.append(event)
+
+    async def coroutine_listener(event):
+        calls.append(event)
+
+    hass.bus.async_listen("test_inline", callback_listener)
+    hass.bus.async_listen("test_inline", coroutine_listener)
+    hass.bus.async_fire("test_inline")
+    assert len(calls) == 1
+
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
+async def test_eventbus_callback_exception_is_logged(hass, caplog):
+    """Test a failing callback listener does not stop the dispatch."""
+    calls = []
+
+    @ha.callback
+    def bad_listener(event):
+        raise ValueError("boom")
+
+    @ha.callback
+    def good_listener(event):
+        calls.append(event)
+
+    hass.bus.async_listen("test_inline", bad_listener)
+    hass.bus.async_listen("test_inline", good_listener)
+    hass.bus.async_fire("test_inline")
+
+    assert len(calls) == 1
+    assert "Error running job" in caplog.text
+
+
+async def test_eventbus_dispatch_follows_listener_changes(hass):
+    """Test the cached dispatch is refreshed when listeners change."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        calls.append(("type", event.event_type))
+
+    @ha.callback
+    def match_all_listener(event):
+        calls.append(("all", event.event_type))
+
+    hass.bus.async_fire("test_dispatch")
+    unsub = hass.bus.async_listen("test_dispatch", listener)
+    hass.bus.async_fire("test_dispatch")
+    assert calls == [("type", "test_dispatch")]
+
+    unsub_all = hass.bus.async_listen(MATCH_ALL, match_all_listener)
+    hass.bus.async_fire("test_dispatch")
+    assert calls[1:] == [("all", "test_dispatch"), ("type", "test_dispatch")]
+
+    unsub()
+    unsub_all()
+    hass.bus.async_fire("test_dispatch")
+    assert len(calls) == 3
+
+
+async def test_eventbus_has_listeners(hass):
+    """Test checking if something listens for an event type."""
+    assert not hass.bus.async_has_listeners("test_event")
+    unsub = hass.bus.async_listen("test_event", lambda event: None)
+    assert hass.bus.async_has_listeners("test_event")
+    unsub()
+    assert not hass.bus.async_has_listeners("test_event")
+
+    # MATCH_ALL listeners do not listen for the event type explicitly
+    unsub = hass.bus.async_listen(MATCH_ALL, lambda event: None)
+    assert not hass.bus.async_has_listeners("test_event")
+    unsub()
+
+    unsub = hass.bus.async_listen_entity_state_changed(
+        ["light.kitchen"], lambda event: None
+    )
+    assert hass.bus.async_has_listeners(EVENT_STATE_CHANGED)
+    unsub()
+
+
+async def test_eventbus_entity_state_changed_listeners(hass):
+    """Test state changes are routed by entity_id and domain."""
+    entity_calls = []
+    domain_calls = []
+    all_domain_calls = []
+
+    @ha.callback
+    def entity_listener(event):
+        entity_calls.append(event)
+
+    @ha.callback
+    def domain_listener(event):
+        domain_calls.append(event)
+
+    @ha.callback
+    def all_domain_listener(event):
+        all_domain_calls.append(event)
+
+    listeners = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+    unsub_entity = hass.bus.async_listen_entity_state_changed(
+        ["light.Kitchen", "light.bowl"], entity_listener
+    )
+    unsub_domain = hass.bus.async_listen_domain_state_changed(
+        ["light"], domain_listener
+    )
+    unsub_all_domains = hass.bus.async_listen_domain_state_changed(
+        [MATCH_ALL], all_domain_listener
+    )
+
+    # The listener of several entity ids counts once
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners + 3
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.kitchen", "on")
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in entity_calls] == [
+        "light.kitchen",
+        "light.bowl",
+        "light.kitchen",
+    ]
+    assert entity_calls[2].data["new_state"] is None
+    assert [event.data["entity_id"] for event in domain_calls] == [
+        "light.kitchen",
+        "light.bowl",
+        "light.kitchen",
+    ]
+    assert len(all_domain_calls) == 4
+
+    unsub_entity()
+    unsub_domain()
+    unsub_all_domains()
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners
+
+    hass.states.async_set("light.kitchen", "off")
+    await hass.async_block_till_done()
+    assert len(entity_calls) == 3
+    assert len(domain_calls) == 3
+    assert len(all_domain_calls) == 4
+
+
 def test_state_init():
     """Test state.init."""
     with pytest.raises(InvalidEntityFormatError):
@@ -511,6 +722,26 @@ def test_state_dict_conversion_with_wrong_data():
     assert wrong_context.context.id == "123"
 
 
+def test_state_as_json():
+    """Test the JSON of a state is serialized once."""
+    state = ha.State("happy.happy", "on", {"brightness": 144})
+
+    with patch("homeassistant.core.json.dumps", wraps=json.dumps) as mock_dumps:
+        state_json = state.as_json()
+        assert state.as_json() is state_json
+
+    assert mock_dumps.call_count == 1
+    assert json.loads(state_json) == json.loads(json.dumps(state, cls=JSONEncoder))
+
+
+def test_state_as_json_invalid():
+    """Test the JSON of a state with values that are not valid JSON."""
+    state = ha.State("happy.happy", "on", {"brightness": float("nan")})
+
+    with pytest.raises(ValueError):
+        state.as_json()
+
+
 def test_state_repr():
     """Test state.repr."""
     assert (
@@ -997,6 +1228,7 @@ def test_create_timer(mock_monotonic, loop):
         return orig_callback(func)
 
     mock_monotonic.side_effect = 10.2, 10.8, 11.3
+    hass.bus.async_has_listeners.return_value = True
 
     with patch.object(ha, "callback", mock_callback), patch(
         "homeassistant.core.dt_util.utcnow",
@@ -1037,6 +1269,39 @@ def test_create_timer(mock_monotonic, loop):
     assert event_data[ATTR_NOW] == datetime(2018, 12, 31, 3, 4, 6, 100000)
 
 
+@patch("homeassistant.core.monotonic")
+def test_timer_skips_time_changed_without_listeners(mock_monotonic, loop):
+    """Test the timer does not fire time changed if nobody listens for it."""
+    hass = MagicMock()
+    funcs = []
+    orig_callback = ha.callback
+
+    def mock_callback(func):
+        funcs.append(func)
+        return orig_callback(func)
+
+    mock_monotonic.side_effect = 10.2, 10.8, 11.3
+    hass.bus.async_has_listeners.return_value = False
+
+    with patch.object(ha, "callback", mock_callback), patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 5, 333333),
+    ):
+        ha._async_create_timer(hass)
+
+    delay, callback, target = hass.loop.call_later.mock_calls[0][1]
+
+    with patch(
+        "homeassistant.core.dt_util.utcnow",
+        return_value=datetime(2018, 12, 31, 3, 4, 6, 100000),
+    ):
+        callback(target)
+
+    hass.bus.async_has_listeners.assert_called_with(EVENT_TIME_CHANGED)
+    assert len(hass.bus.async_fire.mock_calls) == 0
+    assert len(hass.loop.call_later.mock_calls) == 2
+
+
 @patch("homeassistant.core.monotonic")
 def test_timer_out_of_sync(mock_monotonic, loop):
     """Test create timer."""
@@ -1049,6 +1314,7 @@ def test_timer_out_of_sync(mock_monotonic, loop):
         return orig_callback(func)
 
     mock_monotonic.side_effect = 10.2, 13.3, 13.4
+    hass.bus.async_has_listeners.return_value = True
 
     with patch.object(ha, "callback", mock_callback), patch(
         "homeassistant.core.dt_util.utcnow",